@@ -0,0 +1,60 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Memory used per game by the game state, at different move counts.
+
+Run from the repository root with `python benchmark_memory.py`.
+"""
+
+import random
+import tracemalloc
+from loguru import logger
+from src.ogsapi.ogsgamedata import OGSGameData, OGSMoveList
+from src.ogsapi.ogsgameclock import OGSGameClock
+
+GAMES = 1000
+MOVE_COUNTS = (0, 50, 150, 300)
+
+def game_moves(count: int, rng: random.Random) -> list[list[int]]:
+  return [[rng.randrange(19), rng.randrange(19), rng.randrange(1000, 120000)] for _ in range(count)]
+
+def measure(create) -> float:
+  """Bytes allocated per game by create, while keeping every game alive"""
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  games = [create(game_id) for game_id in range(GAMES)]
+  used = tracemalloc.get_traced_memory()[0] - before
+  tracemalloc.stop()
+  del games
+  return used / GAMES
+
+def main() -> None:
+  logger.disable('src.ogsapi')
+  rng = random.Random(0)
+  print(f"{'moves':>6} {'game state':>12} {'moves only':>12} {'as lists':>12}")
+  for count in MOVE_COUNTS:
+    payload = game_moves(count, rng)
+
+    def create_game(game_id: int):
+      data = OGSGameData(game_id=game_id)
+      data.update({'moves': payload, 'width': 19, 'height': 19, 'phase': 'play'})
+      return data, OGSGameClock(system='fischer')
+
+    compact = measure(create_game)
+    moves = measure(lambda game_id: OGSMoveList(payload))
+    lists = measure(lambda game_id: [list(move) for move in payload])
+    print(f"{count:>6} {compact:>12.0f} {moves:>12.0f} {lists:>12.0f}")
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,279 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
+from loguru import logger
+from .client import OGSClient
+from .ogsbulk import OGSBulkResult
+from .ogsasyncsocket import AsyncOGSSocket
+from .ogstokenstore import OGSTokenStore
+
+class AsyncOGSClient:
+    """Asyncio client for the OGS REST API and SocketIO API.
+
+    REST calls are awaitable, but not native asyncio: they run the blocking calls of an
+    [OGSClient](#src.ogsapi.client.OGSClient) on a bounded thread pool, so the event loop is never blocked.
+    This keeps a single REST implementation, with the token refresh, rate limiting, retries and caching
+    of `OGSClient` applying to both clients, at the cost of one thread per concurrent call. Size
+    `max_workers` to the number of calls you want in flight. The realtime API runs natively on asyncio
+    through [AsyncOGSSocket](#src.ogsapi.ogsasyncsocket.AsyncOGSSocket).
+
+    Use [create()](#src.ogsapi.asyncclient.AsyncOGSClient.create) to build an authenticated client.
+
+    Examples:
+        >>> from ogsapi.asyncclient import AsyncOGSClient
+        >>> ogs = await AsyncOGSClient.create(client_id, client_secret, username, password)
+        >>> vitals = await ogs.user_vitals()
+        >>> await ogs.socket_connect(event_handler)
+        >>> game = await ogs.sock.game_connect(12345678)
+
+    Args:
+        client (OGSClient): The synchronous client to make REST calls with
+        max_workers (int, optional): Maximum number of concurrent REST calls. Defaults to 10.
+
+    Attributes:
+        client (OGSClient): The synchronous client REST calls are made with
+        credentials (OGSCredentials): Credentials object containing all credentials
+        sock (AsyncOGSSocket): Async SocketIO connection to OGS
+    """
+
+    def __init__(self, client: OGSClient, max_workers: int = 10):
+        self.client = client
+        self.credentials = client.credentials
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ogsapi-rest")
+
+    @classmethod
+    async def create(cls, client_id: str | None = None, client_secret: str | None = None,
+                     username: str | None = None, password: str | None = None, dev: bool = False,
+                     max_workers: int = 10, token_store: OGSTokenStore | None = None,
+                     lazy: bool = False) -> 'AsyncOGSClient':
+        """Create and authenticate an AsyncOGSClient without blocking the event loop.
+
+        Args:
+            client_id (str): Client ID from OGS
+            client_secret (str): Client Secret from OGS
+            username (str): Username of OGS account
+            password (str): Password of OGS account
+            dev (bool, optional): Use the development API. Defaults to False.
+            max_workers (int, optional): Maximum number of concurrent REST calls. Defaults to 10.
+            token_store (OGSTokenStore, optional): Store to persist tokens in. Defaults to None.
+            lazy (bool, optional): Only fetch the socket auth data and user ID when first needed. Defaults to False.
+
+        Returns:
+            client (AsyncOGSClient): The authenticated client
+        """
+        loop = asyncio.get_running_loop()
+        client = await loop.run_in_executor(
+            None, functools.partial(OGSClient, client_id, client_secret, username, password, dev=dev,
+                              token_store=token_store, lazy=lazy)
+        )
+        return cls(client, max_workers=max_workers)
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking client method on the executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _iterate(self, iterator: Iterator) -> AsyncIterator:
+        """Consume a blocking iterator on the executor"""
+        done = object()
+        while True:
+            item = await self._run(next, iterator, done)
+            if item is done:
+                return
+            yield item
+
+    async def close(self) -> None:
+        """Disconnect the socket if connected and release the executor and HTTP connections."""
+        if hasattr(self, 'sock'):
+            await self.socket_disconnect()
+        self._executor.shutdown(wait=False)
+        self.client.api.close()
+
+    async def __aenter__(self) -> 'AsyncOGSClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def is_authed(self) -> bool:
+        """Check if the user is authenticated to the REST API.
+
+        Returns:
+            is_authed (bool): Whether or not the user is authenticated
+        """
+        return self.client.is_authed()
+
+    # User Specific Resources: /me
+
+    async def user_vitals(self) -> dict:
+        """Get the user's vitals. Authed only. See [OGSClient.user_vitals()](#src.ogsapi.client.OGSClient.user_vitals)"""
+        return await self._run(self.client.user_vitals)
+
+    async def user_settings(self) -> dict:
+        """Get the user's settings. Authed only. See [OGSClient.user_settings()](#src.ogsapi.client.OGSClient.user_settings)"""
+        return await self._run(self.client.user_settings)
+
+    async def update_user_settings(self, **settings) -> dict:
+        """Update the user's settings. Authed only. See [OGSClient.update_user_settings()](#src.ogsapi.client.OGSClient.update_user_settings)"""
+        return await self._run(self.client.update_user_settings, **settings)
+
+    async def active_games(self, player_id: int | None = None) -> list[dict]:
+        """Get the user's active games. See [OGSClient.active_games()](#src.ogsapi.client.OGSClient.active_games)"""
+        return await self._run(self.client.active_games, player_id)
+
+    async def user_games(self, page: int = 1, page_size: int = 10) -> dict:
+        """Get the user's games. Authed only. See [OGSClient.user_games()](#src.ogsapi.client.OGSClient.user_games)"""
+        return await self._run(self.client.user_games, page, page_size)
+
+    async def iter_user_games(self, page_size: int = 50, max_items: int | None = None, prefetch: bool = True) -> AsyncIterator[dict]:
+        """Iterate over all of the user's games. Authed only. See [OGSClient.iter_user_games()](#src.ogsapi.client.OGSClient.iter_user_games)"""
+        games = await self._run(self.client.iter_user_games, page_size, max_items, prefetch)
+        async for game in self._iterate(games):
+            yield game
+
+    async def user_friends(self, username: str | None = None) -> dict:
+        """Get the user's friends. Authed only. See [OGSClient.user_friends()](#src.ogsapi.client.OGSClient.user_friends)"""
+        return await self._run(self.client.user_friends, username)
+
+    async def send_friend_request(self, username: str | int) -> dict:
+        """Send a friend request to a user. Authed only. See [OGSClient.send_friend_request()](#src.ogsapi.client.OGSClient.send_friend_request)"""
+        return await self._run(self.client.send_friend_request, username)
+
+    async def remove_friend(self, username: str | int) -> dict:
+        """Remove a friend. Authed only. See [OGSClient.remove_friend()](#src.ogsapi.client.OGSClient.remove_friend)"""
+        return await self._run(self.client.remove_friend, username)
+
+    # Players: /players
+
+    async def get_player(self, player_username: str) -> dict:
+        """Get a player by username. See [OGSClient.get_player()](#src.ogsapi.client.OGSClient.get_player)"""
+        return await self._run(self.client.get_player, player_username)
+
+    async def get_player_games(self, player_username: str | int) -> dict:
+        """Get a player's games by username. See [OGSClient.get_player_games()](#src.ogsapi.client.OGSClient.get_player_games)"""
+        return await self._run(self.client.get_player_games, player_username)
+
+    async def iter_player_games(self, player_username: str | int, page_size: int = 50, max_items: int | None = None,
+                                prefetch: bool = True) -> AsyncIterator[dict]:
+        """Iterate over all of a player's games. See [OGSClient.iter_player_games()](#src.ogsapi.client.OGSClient.iter_player_games)"""
+        games = await self._run(self.client.iter_player_games, player_username, page_size, max_items, prefetch)
+        async for game in self._iterate(games):
+            yield game
+
+    async def create_challenge(self, player_username: str | int | None = None, **game_settings) -> tuple[int, int]:
+        """Create a challenge. Authed only. See [OGSClient.create_challenge()](#src.ogsapi.client.OGSClient.create_challenge)"""
+        return await self._run(self.client.create_challenge, player_username, **game_settings)
+
+    # Challenges
+
+    async def received_challenges(self, since_id: int | None = None) -> list[dict]:
+        """Get all received challenges. Authed only. See [OGSClient.received_challenges()](#src.ogsapi.client.OGSClient.received_challenges)"""
+        return await self._run(self.client.received_challenges, since_id)
+
+    async def sent_challenges(self, since_id: int | None = None) -> list[dict]:
+        """Get all sent challenges. Authed only. See [OGSClient.sent_challenges()](#src.ogsapi.client.OGSClient.sent_challenges)"""
+        return await self._run(self.client.sent_challenges, since_id)
+
+    async def iter_received_challenges(self, since_id: int | None = None, page_size: int = 50,
+                                       max_items: int | None = None, prefetch: bool = True) -> AsyncIterator[dict]:
+        """Iterate over received challenges. Authed only. See [OGSClient.iter_received_challenges()](#src.ogsapi.client.OGSClient.iter_received_challenges)"""
+        challenges = await self._run(self.client.iter_received_challenges, since_id, page_size, max_items, prefetch)
+        async for challenge in self._iterate(challenges):
+            yield challenge
+
+    async def iter_sent_challenges(self, since_id: int | None = None, page_size: int = 50,
+                                   max_items: int | None = None, prefetch: bool = True) -> AsyncIterator[dict]:
+        """Iterate over sent challenges. Authed only. See [OGSClient.iter_sent_challenges()](#src.ogsapi.client.OGSClient.iter_sent_challenges)"""
+        challenges = await self._run(self.client.iter_sent_challenges, since_id, page_size, max_items, prefetch)
+        async for challenge in self._iterate(challenges):
+            yield challenge
+
+    async def iter_challenges(self, page_size: int = 50, max_items: int | None = None, prefetch: bool = True) -> AsyncIterator[dict]:
+        """Iterate over all sent and received challenges. Authed only. See [OGSClient.iter_challenges()](#src.ogsapi.client.OGSClient.iter_challenges)"""
+        challenges = await self._run(self.client.iter_challenges, page_size, max_items, prefetch)
+        async for challenge in self._iterate(challenges):
+            yield challenge
+
+    async def accept_challenge(self, challenge_id: str) -> dict:
+        """Accept a challenge. Authed only. See [OGSClient.accept_challenge()](#src.ogsapi.client.OGSClient.accept_challenge)"""
+        return await self._run(self.client.accept_challenge, challenge_id)
+
+    async def decline_challenge(self, challenge_id: str) -> dict:
+        """Decline a challenge. Authed only. See [OGSClient.decline_challenge()](#src.ogsapi.client.OGSClient.decline_challenge)"""
+        return await self._run(self.client.decline_challenge, challenge_id)
+
+    async def challenge_details(self, challenge_id: str) -> dict:
+        """Get details of a challenge. Authed only. See [OGSClient.challenge_details()](#src.ogsapi.client.OGSClient.challenge_details)"""
+        return await self._run(self.client.challenge_details, challenge_id)
+
+    # Games
+
+    async def game_details(self, game_id: str) -> dict:
+        """Get details of a game. See [OGSClient.game_details()](#src.ogsapi.client.OGSClient.game_details)"""
+        return await self._run(self.client.game_details, game_id)
+
+    async def game_reviews(self, game_id: str) -> dict:
+        """Get reviews of a game. See [OGSClient.game_reviews()](#src.ogsapi.client.OGSClient.game_reviews)"""
+        return await self._run(self.client.game_reviews, game_id)
+
+    async def game_png(self, game_id: str) -> bytes:
+        """Get PNG of a game. See [OGSClient.game_png()](#src.ogsapi.client.OGSClient.game_png)"""
+        return await self._run(self.client.game_png, game_id)
+
+    async def game_sgf(self, game_id: str) -> str:
+        """Get SGF of a game. See [OGSClient.game_sgf()](#src.ogsapi.client.OGSClient.game_sgf)"""
+        return await self._run(self.client.game_sgf, game_id)
+
+    async def bulk_game_details(self, game_ids: Iterable[str | int], max_workers: int = 8,
+                                ordered: bool = True) -> AsyncIterator[OGSBulkResult[dict]]:
+        """Get details of many games concurrently. See [OGSClient.bulk_game_details()](#src.ogsapi.client.OGSClient.bulk_game_details)"""
+        async for result in self._iterate(self.client.bulk_game_details(game_ids, max_workers, ordered)):
+            yield result
+
+    async def bulk_game_sgf(self, game_ids: Iterable[str | int], max_workers: int = 8,
+                            ordered: bool = True) -> AsyncIterator[OGSBulkResult[str]]:
+        """Get SGFs of many games concurrently. See [OGSClient.bulk_game_sgf()](#src.ogsapi.client.OGSClient.bulk_game_sgf)"""
+        async for result in self._iterate(self.client.bulk_game_sgf(game_ids, max_workers, ordered)):
+            yield result
+
+    async def bulk_game_png(self, game_ids: Iterable[str | int], max_workers: int = 8,
+                            ordered: bool = True) -> AsyncIterator[OGSBulkResult[bytes]]:
+        """Get PNGs of many games concurrently. See [OGSClient.bulk_game_png()](#src.ogsapi.client.OGSClient.bulk_game_png)"""
+        async for result in self._iterate(self.client.bulk_game_png(game_ids, max_workers, ordered)):
+            yield result
+
+    # Realtime API
+
+    async def socket_connect(self, callback_handler: Callable) -> None:
+        """Connect to the socket. Need credentials to be able to connect.
+
+        Args:
+            callback_handler (Callable): Callback function or coroutine function to send socket events to.
+        """
+        self.client.authed_endpoint()
+        await self._run(self.client.api.ensure_auth_data)
+
+        self.sock = AsyncOGSSocket(self.credentials)
+        self.sock.callback_handler = callback_handler
+        await self.sock.connect()
+
+    async def socket_disconnect(self) -> None:
+        """Disconnect from the socket."""
+        logger.info("Disconnecting async socket")
+        await self.sock.disconnect()
+        del self.sock
@@ -14,11 +14,18 @@
 
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
 from loguru import logger
-from typing import Callable, Any
+from typing import Callable, Any, Iterable, Iterator
 from .ogscredentials import OGSCredentials
 from .ogssocket import OGSSocket
 from .ogsrestapi import OGSRestAPI
+from .ogscache import OGSLRUCache, OGSResponseCache
+from .ogstokenstore import OGSTokenStore
+from .ogsbulk import OGSBulkResult, bulk_fetch
+from .ogsdispatcher import OGSEventDispatcher
+from .ogsrouter import OGSEventRouter
 from .ogs_api_exception import OGSApiException
 
 # Disable logging from ogsapi by default
@@ -77,15 +84,26 @@ class OGSClient:
         username (str): Username of OGS account
         password (str): Password of OGS account
         dev (bool, optional): Use the development API. Defaults to False.    
+        cache (OGSResponseCache, optional): Cache for responses of read-only endpoints. Defaults to None.
+        player_cache_size (int, optional): Maximum number of username to player ID mappings to keep. Defaults to 4096.
+        token_store (OGSTokenStore, optional): Store to persist tokens in, so a restarted process reuses
+            its access token instead of authenticating again. Defaults to None.
+        lazy (bool, optional): Only fetch the socket auth data and user ID when the socket or a user
+            specific endpoint first needs them. Defaults to False.
 
     Attributes:
         credentials (OGSCredentials): Credentials object containing all credentials
         api (OGSRestAPI): REST API connection to OGS
         sock (OGSSocket): SocketIO connection to OGS
+        player_ids (OGSLRUCache): Cache of usernames to player IDs, filled from any response containing players
 
     """
     def __init__(self, client_id: str | None = None, client_secret: str | None = None, 
-                 username: str | None = None, password: str | None = None, dev: bool = False):
+                 username: str | None = None, password: str | None = None, dev: bool = False,
+                 cache: OGSResponseCache | None = None, player_cache_size: int = 4096,
+                 token_store: OGSTokenStore | None = None, lazy: bool = False):
+
+        self.player_ids = OGSLRUCache(max_size=player_cache_size)
 
         # Only authenticate if all credentials are provided
         if client_id is not None and client_secret is not None and username is not None and password is not None:
@@ -95,9 +113,7 @@ class OGSClient:
             self.credentials = OGSCredentials()
             logger.warning("Not all credentials provided, not authenticating. You will not be able to access any user specific resources.")
 
-        self.api = OGSRestAPI(self.credentials,dev=dev)
-        if self.is_authed():
-            self.credentials.user_id = self.user_vitals()['id']
+        self.api = OGSRestAPI(self.credentials, dev=dev, cache=cache, token_store=token_store, lazy=lazy)
 
     def is_authed(self) -> bool:
         """Check if the user is authenticated to the REST API.
@@ -119,6 +135,8 @@ class OGSClient:
 
     def set_credentials(self, client_id: str, client_secret: str, username: str, password: str) -> None:
         """Set the credentials for the client after instantiation.
+
+        Cached responses are dropped, as they may belong to the previous user.
         
         Args:
             client_id (str): Client ID from OGS
@@ -129,8 +147,112 @@ class OGSClient:
         self.credentials = OGSCredentials(client_id=client_id, client_secret=client_secret,
                                           username=username, password=password)
         self.api.credentials = self.credentials
+        # Before authenticating, which may already fetch /me
+        self.invalidate_cache()
         self.api.authenticate()
 
+    def invalidate_cache(self, *endpoints: str) -> None:
+        """Remove cached responses for endpoints and everything below them. Does nothing if caching is disabled.
+
+        Examples:
+            >>> ogs.invalidate_cache('/games/1234', '/players/5678')
+
+        Args:
+            *endpoints (str): Endpoints to invalidate. Invalidates everything if none are given.
+        """
+        if self.api.cache is None:
+            return
+        if not endpoints:
+            self.api.cache.invalidate()
+        for endpoint in endpoints:
+            self.api.cache.invalidate(endpoint)
+
+    def remember_players(self, data: Any) -> None:
+        """Add the player objects found in a response or gamedata to the username to player ID cache.
+
+        Args:
+            data (Any): JSON data to search for objects with an `id` and `username`
+        """
+        if isinstance(data, dict):
+            player_id = data.get('id')
+            username = data.get('username')
+            if isinstance(player_id, int) and isinstance(username, str):
+                self.player_ids.set(username, player_id)
+            for value in data.values():
+                if isinstance(value, (dict, list)):
+                    self.remember_players(value)
+        elif isinstance(data, list):
+            for value in data:
+                if isinstance(value, (dict, list)):
+                    self.remember_players(value)
+
+    def resolve_player_id(self, player: str | int) -> int:
+        """Get the player ID of a player, only calling the API if the username is not cached.
+
+        Args:
+            player (str | int): Username or player ID of the player. Player IDs are returned as is.
+
+        Returns:
+            player_id (int): ID of the player
+        """
+        if isinstance(player, int):
+            return player
+        player_id = self.player_ids.get(player)
+        if player_id is None:
+            player_id = self.get_player(player)['id']
+        else:
+            logger.debug(f"Resolved player {player} to {player_id} from cache")
+        return player_id
+
+    def _iter_pages(self, endpoint: str, params: dict | None = None, page_size: int = 50,
+                    max_items: int | None = None, prefetch: bool = True) -> Iterator[dict]:
+        """Iterate over the results of a paginated endpoint, following the `next` links lazily.
+
+        Only the current page and, when prefetching, the next page are held in memory.
+
+        Args:
+            endpoint (str): Paginated endpoint to iterate over
+            params (dict, optional): Additional parameters to pass to the endpoint. Defaults to None.
+            page_size (int, optional): Number of results to request per page. Defaults to 50.
+            max_items (int, optional): Maximum number of results to yield. Defaults to None, yielding all results.
+            prefetch (bool, optional): Fetch the next page in the background while the current one is consumed. Defaults to True.
+
+        Yields:
+            result (dict): Each result of the endpoint
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ogsapi-pager") if prefetch else None
+
+        def fetch(request_params: dict) -> dict:
+            logger.debug(f"Fetching page {request_params.get('page', 1)} of {endpoint}")
+            return self.api.call_rest_endpoint('GET', endpoint=endpoint, params=request_params).json()
+
+        def next_params(page: dict) -> dict | None:
+            if not page.get('next'):
+                return None
+            return dict(parse_qsl(urlsplit(page['next']).query))
+
+        yielded = 0
+        try:
+            page = fetch({**(params or {}), 'page_size': page_size})
+            while True:
+                page_params = next_params(page)
+                pending = None
+                if executor is not None and page_params is not None:
+                    pending = executor.submit(fetch, page_params)
+                results = page.get('results', [])
+                self.remember_players(results)
+                for result in results:
+                    if max_items is not None and yielded >= max_items:
+                        return
+                    yielded += 1
+                    yield result
+                if page_params is None or (max_items is not None and yielded >= max_items):
+                    return
+                page = pending.result() if pending is not None else fetch(page_params)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
     def enable_logging(self) -> None:
         """Enable logging from ogsapi"""
         logger.enable("src.ogsapi")
@@ -209,10 +331,14 @@ class OGSClient:
         if about is not None:
             payload['about'] = about
 
+        self.api.ensure_user_id()
         endpoint = f'/players/{self.credentials.user_id}'
         # Add the inputs to a payload, only if they are not None
         logger.info(f"Updating user settings with the following payload: {payload}")
-        return self.api.call_rest_endpoint('PUT', endpoint=endpoint, payload=payload).json()
+        response = self.api.call_rest_endpoint('PUT', endpoint=endpoint, payload=payload).json()
+        # The username lookups on /players may point at the old username
+        self.invalidate_cache('/me', '/players')
+        return response
 
     def active_games(self, player_id: int | None = None) -> list[dict]:
         """
@@ -253,6 +379,27 @@ class OGSClient:
         logger.info(f"Getting user games - page {page} with page size {page_size}")
         return self.api.call_rest_endpoint('GET', endpoint=endpoint, params=params).json()
 
+    def iter_user_games(self, page_size: int = 50, max_items: int | None = None, prefetch: bool = True) -> Iterator[dict]:
+        """Iterate over all of the user's games, fetching pages lazily. Authed only.
+
+        Examples:
+            >>> for game in ogs.iter_user_games(page_size=100):
+            ...     archive(game['id'])
+
+        Args:
+            page_size (int, optional): Number of games to request per page. Defaults to 50.
+            max_items (int, optional): Maximum number of games to yield. Defaults to None, yielding all games.
+            prefetch (bool, optional): Fetch the next page in the background. Defaults to True.
+
+        Yields:
+            game (dict): JSON object of each game
+        """
+
+        self.authed_endpoint()
+
+        logger.info(f"Iterating over user games with page size {page_size}")
+        return self._iter_pages('/me/games', page_size=page_size, max_items=max_items, prefetch=prefetch)
+
 
     def user_friends(self, username: str | None = None) -> dict:
         """Get the user's friends. Authed only.
@@ -270,12 +417,12 @@ class OGSClient:
         logger.info("Getting user friends")
         return self.api.call_rest_endpoint('GET', endpoint=endpoint, params={'username' : username}).json()
 
-    def send_friend_request(self, username: str) -> dict:
+    def send_friend_request(self, username: str | int) -> dict:
         """Send a friend request to a user. Authed only.
-        
+
         Args:
-            username (str): Username of the user to send a friend request to.
-            
+            username (str | int): Username or player ID of the user to send a friend request to.
+
         Returns:
             response (dict): JSON response from the endpoint
         """
@@ -283,19 +430,21 @@ class OGSClient:
         self.authed_endpoint()
 
         endpoint = '/me/friends'
-        player_id = self.get_player(username)['id']
+        player_id = self.resolve_player_id(username)
         payload = {
             "player_id" : player_id
         }
         logger.info(f"Sending friend request to {username} - {player_id}")
-        return self.api.call_rest_endpoint('POST', endpoint=endpoint, payload=payload).json()
+        response = self.api.call_rest_endpoint('POST', endpoint=endpoint, payload=payload).json()
+        self.invalidate_cache('/me/friends', f'/players/{player_id}')
+        return response
 
-    def remove_friend(self, username: str) -> dict:
+    def remove_friend(self, username: str | int) -> dict:
         """Remove a friend. Authed only.
-        
+
         Args:
-            username (str): Username of the user to remove as a friend.
-        
+            username (str | int): Username or player ID of the user to remove as a friend.
+
         Returns:
             response (dict): JSON response from the endpoint
         """
@@ -303,13 +452,15 @@ class OGSClient:
         self.authed_endpoint()
 
         endpoint = '/me/friends/'
-        player_id = self.get_player(username)['id']
+        player_id = self.resolve_player_id(username)
         payload = {
             "delete": True,
             "player_id" : player_id
         }
         logger.info(f"Removing friend {username} - {player_id}")
-        return self.api.call_rest_endpoint('POST', endpoint=endpoint, payload=payload).json()
+        response = self.api.call_rest_endpoint('POST', endpoint=endpoint, payload=payload).json()
+        self.invalidate_cache('/me/friends', f'/players/{player_id}')
+        return response
 
     # Players: /players
 
@@ -325,24 +476,45 @@ class OGSClient:
 
         endpoint = '/players/'
         logger.info(f"Getting player {player_username}")
-        return self.api.call_rest_endpoint('GET', endpoint=endpoint, params={'username' : player_username}).json()['results'][0]
-    
-    def get_player_games(self, player_username: str) -> dict:
+        player = self.api.call_rest_endpoint('GET', endpoint=endpoint, params={'username' : player_username}).json()['results'][0]
+        self.remember_players(player)
+        return player
+
+    def get_player_games(self, player_username: str | int) -> dict:
         """Get a player's games by username.
-        
+
         Args:
-            player_username (str): Username of the player to get games of.
-            
+            player_username (str | int): Username or player ID of the player to get games of.
+
         Returns:
             player_games (dict): Player games returned from the endpoint
         """
         logger.info(f"Getting player {player_username}'s games")
-        player_id = self.get_player(player_username)['id']
+        player_id = self.resolve_player_id(player_username)
         endpoint = f'/players/{player_id}/games'
-        return self.api.call_rest_endpoint('GET', endpoint=endpoint).json()
+        games = self.api.call_rest_endpoint('GET', endpoint=endpoint).json()
+        self.remember_players(games)
+        return games
+
+    def iter_player_games(self, player_username: str | int, page_size: int = 50, max_items: int | None = None,
+                          prefetch: bool = True) -> Iterator[dict]:
+        """Iterate over all of a player's games, fetching pages lazily.
+
+        Args:
+            player_username (str | int): Username or player ID of the player to get games of.
+            page_size (int, optional): Number of games to request per page. Defaults to 50.
+            max_items (int, optional): Maximum number of games to yield. Defaults to None, yielding all games.
+            prefetch (bool, optional): Fetch the next page in the background. Defaults to True.
+
+        Yields:
+            game (dict): JSON object of each game
+        """
+        logger.info(f"Iterating over player {player_username}'s games with page size {page_size}")
+        player_id = self.resolve_player_id(player_username)
+        return self._iter_pages(f'/players/{player_id}/games', page_size=page_size, max_items=max_items, prefetch=prefetch)
 
     # TODO: This needs to be using a dataclass to make challenge customization easier
-    def create_challenge(self, player_username: str | None = None, **game_settings) -> tuple[int, int]:
+    def create_challenge(self, player_username: str | int | None = None, **game_settings) -> tuple[int, int]:
         """Create either an open challenge or a challenge to a specific player. Authed only.
         The time control settings are built depending on which time control is used.
         Make sure that you pass the correct time control settings for the time control you want to use.
@@ -354,7 +526,7 @@ class OGSClient:
             (20328495, 53331333)
 
         Args:
-            player_username (str): Username of the player to challenge. 
+            player_username (str | int): Username or player ID of the player to challenge. 
                 If used will issue the challenge to the player. Defaults to None.
         
         Keyword Args:
@@ -471,7 +643,7 @@ class OGSClient:
         logger.info(f"Created challenge object with following parameters: {challenge}")
 
         if player_username is not None:
-            player_id = self.get_player(player_username)['id']
+            player_id = self.resolve_player_id(player_username)
             print(f"Challenging player: {player_username} - {player_id}")
             endpoint = f'/players/{player_id}/challenge/'
             logger.info(f"Sending challenge to {player_username} - {player_id}")
@@ -481,6 +653,7 @@ class OGSClient:
             logger.info("Sending open challenge")
             response = self.api.call_rest_endpoint('POST', endpoint, challenge).json()
 
+        self.invalidate_cache('/me/challenges', '/ui/overview')
         logger.debug(f"Challenge response - {response}")
         challenge_id = response['challenge']
         game_id = response['game']
@@ -489,45 +662,117 @@ class OGSClient:
 
     # Challenges
 
-    # TODO: Change these to use the 'challenger' parameter instead of looping through all challenges
-    def received_challenges(self) -> list[dict]:
-        """Get all received challenges. Authed only.
+    def received_challenges(self, since_id: int | None = None) -> list[dict]:
+        """Get all received challenges, following pagination. Authed only.
+
+        Args:
+            since_id (int, optional): Only get challenges with an ID higher than this. Defaults to None.
         
         Returns:
             challenges (list[dict]): JSON response from the endpoint
         """
 
-        self.authed_endpoint()
-
-        endpoint = '/me/challenges/'
-        received_challenges = []
         logger.info("Getting received challenges")
-        all_challenges = self.api.call_rest_endpoint('GET', endpoint).json()['results']
-        logger.debug(f"Got challenges: {all_challenges}")
-        for challenge in all_challenges:
-            if challenge['challenger']['id'] != self.credentials.user_id:
-                received_challenges.append(challenge)
-        return received_challenges
-
-    # TODO: Same as above
-    def sent_challenges(self) -> list[dict]:
-        """Get all sent challenges. Authed only.
+        return list(self.iter_received_challenges(since_id=since_id))
+
+    def sent_challenges(self, since_id: int | None = None) -> list[dict]:
+        """Get all sent challenges, following pagination. Authed only.
+
+        Args:
+            since_id (int, optional): Only get challenges with an ID higher than this. Defaults to None.
         
         Returns:
             challenges (list[dict]): JSON response from the endpoint
         """
 
+        logger.info("Getting sent challenges")
+        return list(self.iter_sent_challenges(since_id=since_id))
+
+    def iter_received_challenges(self, since_id: int | None = None, page_size: int = 50,
+                                 max_items: int | None = None, prefetch: bool = True) -> Iterator[dict]:
+        """Iterate over received challenges, fetching pages lazily. Authed only.
+
+        Passing the highest challenge ID seen so far as `since_id` makes polling for new challenges cheap,
+        as the challenges are requested newest first and iteration stops at the first one already seen.
+
+        Examples:
+            >>> last_seen = 0
+            >>> for challenge in ogs.iter_received_challenges(since_id=last_seen):
+            ...     last_seen = max(last_seen, challenge['id'])
+
+        Args:
+            since_id (int, optional): Only yield challenges with an ID higher than this. Defaults to None.
+            page_size (int, optional): Number of challenges to request per page. Defaults to 50.
+            max_items (int, optional): Maximum number of challenges to yield. Defaults to None, yielding all challenges.
+            prefetch (bool, optional): Fetch the next page in the background. Defaults to True.
+
+        Yields:
+            challenge (dict): JSON object of each challenge
+        """
+
         self.authed_endpoint()
+        self.api.ensure_user_id()
 
-        endpoint = '/me/challenges'
-        sent_challenges = []
-        logger.info("Getting sent challenges")
-        all_challenges = self.api.call_rest_endpoint('GET', endpoint).json()['results']
-        logger.debug(f"Got challenges: {all_challenges}")
-        for challenge in all_challenges:
-            if challenge['challenger']['id'] == self.credentials.user_id:
-                sent_challenges.append(challenge)
-        return sent_challenges
+        # There is no filter for challenges *not* sent by us, so filter the rest out here
+        user_id = self.credentials.user_id
+        return self._iter_challenges({}, lambda challenge: challenge['challenger']['id'] != user_id,
+                                     since_id, page_size, max_items, prefetch)
+
+    def iter_sent_challenges(self, since_id: int | None = None, page_size: int = 50,
+                             max_items: int | None = None, prefetch: bool = True) -> Iterator[dict]:
+        """Iterate over sent challenges, filtered by the server and fetching pages lazily. Authed only.
+
+        Args:
+            since_id (int, optional): Only yield challenges with an ID higher than this. Defaults to None.
+            page_size (int, optional): Number of challenges to request per page. Defaults to 50.
+            max_items (int, optional): Maximum number of challenges to yield. Defaults to None, yielding all challenges.
+            prefetch (bool, optional): Fetch the next page in the background. Defaults to True.
+
+        Yields:
+            challenge (dict): JSON object of each challenge
+        """
+
+        self.authed_endpoint()
+        self.api.ensure_user_id()
+
+        # Still check the challenger, in case the server ignores the filter
+        user_id = self.credentials.user_id
+        return self._iter_challenges({'challenger': user_id}, lambda challenge: challenge['challenger']['id'] == user_id,
+                                     since_id, page_size, max_items, prefetch)
+
+    def _iter_challenges(self, params: dict, keep: Callable[[dict], bool], since_id: int | None,
+                         page_size: int, max_items: int | None, prefetch: bool) -> Iterator[dict]:
+        """Iterate over the challenges passing `keep`, stopping at `since_id` when given"""
+        if since_id is not None:
+            params = {**params, 'ordering': '-id'}
+        pages = self._iter_pages('/me/challenges/', params=params, page_size=page_size, prefetch=prefetch)
+        yielded = 0
+        for challenge in pages:
+            if max_items is not None and yielded >= max_items:
+                return
+            # Newest first, so everything from here on has been seen already
+            if since_id is not None and challenge['id'] <= since_id:
+                return
+            if keep(challenge):
+                yielded += 1
+                yield challenge
+
+    def iter_challenges(self, page_size: int = 50, max_items: int | None = None, prefetch: bool = True) -> Iterator[dict]:
+        """Iterate over all sent and received challenges, fetching pages lazily. Authed only.
+
+        Args:
+            page_size (int, optional): Number of challenges to request per page. Defaults to 50.
+            max_items (int, optional): Maximum number of challenges to yield. Defaults to None, yielding all challenges.
+            prefetch (bool, optional): Fetch the next page in the background. Defaults to True.
+
+        Yields:
+            challenge (dict): JSON object of each challenge
+        """
+
+        self.authed_endpoint()
+
+        logger.info(f"Iterating over challenges with page size {page_size}")
+        return self._iter_pages('/me/challenges/', page_size=page_size, max_items=max_items, prefetch=prefetch)
 
     def accept_challenge(self, challenge_id: str) -> dict:
         """Accept a challenge. Authed only.
@@ -543,7 +788,9 @@ class OGSClient:
 
         endpoint = f'/me/challenges/{challenge_id}/accept'
         logger.info(f"Accepting challenge {challenge_id}")
-        return self.api.call_rest_endpoint('POST', endpoint=endpoint,payload={}).json()
+        response = self.api.call_rest_endpoint('POST', endpoint=endpoint,payload={}).json()
+        self.invalidate_cache('/me/challenges', '/ui/overview', '/me/games')
+        return response
     
     def decline_challenge(self, challenge_id: str) -> dict:
         """Decline a challenge. Authed only.
@@ -559,7 +806,9 @@ class OGSClient:
 
         endpoint = f'/me/challenges/{challenge_id}/'
         logger.info(f"Declining challenge {challenge_id}")
-        return self.api.call_rest_endpoint('DELETE', endpoint=endpoint, payload={}).json()
+        response = self.api.call_rest_endpoint('DELETE', endpoint=endpoint, payload={}).json()
+        self.invalidate_cache('/me/challenges')
+        return response
 
     def challenge_details(self, challenge_id: str) -> dict:
         """Get details of a challenge. Authed only.
@@ -588,7 +837,9 @@ class OGSClient:
         """
         endpoint = f'/games/{game_id}'
         logger.info(f"Getting game details for {game_id}")
-        return self.api.call_rest_endpoint('GET', endpoint).json()
+        details = self.api.call_rest_endpoint('GET', endpoint).json()
+        self.remember_players(details.get('players'))
+        return details
 
     def game_reviews(self, game_id: str) -> dict:
         """Get reviews of a game.
@@ -629,16 +880,80 @@ class OGSClient:
         logger.info(f"Getting game SGF for {game_id}")
         return self.api.call_rest_endpoint('GET', endpoint).text
 
-    def socket_connect(self, callback_handler: Callable) -> None:
+    def bulk_game_details(self, game_ids: Iterable[str | int], max_workers: int = 8,
+                          ordered: bool = True) -> Iterator[OGSBulkResult[dict]]:
+        """Get details of many games concurrently.
+
+        Requests count against the request budget of the [OGSRestAPI](#src.ogsapi.ogsrestapi.OGSRestAPI).
+        A failed game is returned as a result with an error instead of stopping the whole fetch.
+
+        Examples:
+            >>> for item in ogs.bulk_game_details(game_ids, max_workers=16):
+            ...     if item.ok:
+            ...         store(item.id, item.result)
+
+        Args:
+            game_ids (Iterable[str | int]): IDs of the games to get details of.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+            ordered (bool, optional): Yield results in the order of the IDs instead of as they complete. Defaults to True.
+
+        Yields:
+            result (OGSBulkResult[dict]): Details of each game
+        """
+        logger.info(f"Getting game details in bulk with {max_workers} workers")
+        return bulk_fetch(self.game_details, game_ids, max_workers=max_workers, ordered=ordered)
+
+    def bulk_game_sgf(self, game_ids: Iterable[str | int], max_workers: int = 8,
+                      ordered: bool = True) -> Iterator[OGSBulkResult[str]]:
+        """Get SGFs of many games concurrently. See [bulk_game_details()](#src.ogsapi.client.OGSClient.bulk_game_details).
+
+        Args:
+            game_ids (Iterable[str | int]): IDs of the games to get SGFs of.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+            ordered (bool, optional): Yield results in the order of the IDs instead of as they complete. Defaults to True.
+
+        Yields:
+            result (OGSBulkResult[str]): SGF of each game
+        """
+        logger.info(f"Getting game SGFs in bulk with {max_workers} workers")
+        return bulk_fetch(self.game_sgf, game_ids, max_workers=max_workers, ordered=ordered)
+
+    def bulk_game_png(self, game_ids: Iterable[str | int], max_workers: int = 8,
+                      ordered: bool = True) -> Iterator[OGSBulkResult[bytes]]:
+        """Get PNGs of many games concurrently. See [bulk_game_details()](#src.ogsapi.client.OGSClient.bulk_game_details).
+
+        Args:
+            game_ids (Iterable[str | int]): IDs of the games to get PNGs of.
+            max_workers (int, optional): Maximum number of concurrent requests. Defaults to 8.
+            ordered (bool, optional): Yield results in the order of the IDs instead of as they complete. Defaults to True.
+
+        Yields:
+            result (OGSBulkResult[bytes]): PNG image of each game
+        """
+        logger.info(f"Getting game PNGs in bulk with {max_workers} workers")
+        return bulk_fetch(self.game_png, game_ids, max_workers=max_workers, ordered=ordered)
+
+    def socket_connect(self, callback_handler: Callable | None = None, dispatcher: OGSEventDispatcher | None = None) -> None:
         """Connect to the socket. Need credentials to be able to connect.
+
+        Instead of, or next to a callback handler receiving every event, handlers can be registered for
+        single events with [OGSSocket.on()](#src.ogsapi.ogssocket.OGSSocket.on) and [OGSGame.on()](#src.ogsapi.ogsgame.OGSGame.on).
         
         Args:
-            callback_handler (Callable): Callback function to send socket events to.
+            callback_handler (Callable, optional): Callback function to send every socket event to. Defaults to None.
+            dispatcher (OGSEventDispatcher, optional): Dispatcher to call the callback handlers on worker threads,
+                so a slow handler doesn't hold up the events of other games. Defaults to None.
         """
 
         self.authed_endpoint()
+        self.api.ensure_auth_data()
+
+        def remember_gamedata_players(data: Any) -> None:
+            if isinstance(data, dict):
+                self.remember_players(data.get('players'))
 
-        self.sock = OGSSocket(self.credentials)
+        self.sock = OGSSocket(self.credentials, auth_refresher=self.api.get_auth_data, dispatcher=dispatcher)
+        self.sock.register_callback('gamedata', remember_gamedata_players, game_id=OGSEventRouter.ANY_GAME)
         self.sock.callback_handler = callback_handler
         self.sock.connect()
 
@@ -0,0 +1,246 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Callable
+from loguru import logger
+import socketio # type: ignore[import]
+from .ogscredentials import OGSCredentials
+from .ogsgamedata import OGSGameData
+from .ogsgameclock import OGSGameClock
+
+class AsyncOGSGame:
+    """Asyncio version of OGSGame for games connected via the AsyncOGSSocket.
+
+    Events are delivered to the callback handler, which may be a regular function or a coroutine function,
+    and can also be consumed with `async for` using [events()](#src.ogsapi.ogsasyncgame.AsyncOGSGame.events).
+
+    Examples:
+        >>> game = await sock.game_connect(12345678)
+        >>> async for event_name, data in game.events():
+        ...     if event_name == 'move':
+        ...         await game.move('dd')
+
+    Args:
+        game_socket (socketio.AsyncClient): Async socketio client to connect to the game with.
+        credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
+        game_id (int): ID of the game to connect to.
+        callback_handler (Callable): Callback handler function to send events to the user.
+        max_queued_events (int, optional): Maximum number of events buffered for events(), dropping the
+            oldest event when full. Defaults to 1000.
+
+    Attributes:
+        socket (socketio.AsyncClient): Async socketio client the game is connected through.
+        game_data (OGSGameData): OGSGameData object containing game data.
+        clock (OGSGameClock): OGSGameClock object containing the clock data.
+        credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
+        callback_handler (Callable): Callback handler function to send events to the user.
+        dropped (int): Number of events dropped because the events() buffer was full
+        subscribed (bool): Whether the socket handlers of the game are registered
+    """
+
+    def __init__(self, game_socket: socketio.AsyncClient, credentials: OGSCredentials, game_id: int,
+                 callback_handler: Callable, max_queued_events: int = 1000):
+        self.socket = game_socket
+        self.game_data = OGSGameData(game_id=game_id)
+        self.clock = OGSGameClock()
+        self.credentials = credentials
+        self.callback_handler = callback_handler
+        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued_events)
+        self.dropped = 0
+        self.subscribed = True
+        self._socket_events: list[str] = []
+        self._game_call_backs()
+
+    async def _send_event(self, event_name: str, data: Any) -> None:
+        """Send an event to the callback handler and the events() queue"""
+        result = self.callback_handler(event_name=event_name, data=data)
+        if inspect.isawaitable(result):
+            await result
+        if self._event_queue.full():
+            # Drop the oldest event rather than blocking the socket
+            self._event_queue.get_nowait()
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % self._event_queue.maxsize == 0:
+                logger.warning(f"Events of game {self.game_data.game_id} aren't consumed, dropped {self.dropped} so far")
+        self._event_queue.put_nowait((event_name, data))
+
+    def _on(self, event: str) -> Callable:
+        """Register a socket handler for an event of this game, remembering it so it can be removed again"""
+        socket_event = f'game/{self.game_data.game_id}/{event}'
+        self._socket_events.append(socket_event)
+        return self.socket.on(socket_event)
+
+    def unsubscribe(self) -> None:
+        """Remove the socket handlers of the game.
+
+        Afterwards the socket no longer references the game, so it can be garbage collected.
+        """
+        if not self.subscribed:
+            return
+        self.subscribed = False
+        logger.info(f"Unsubscribing from game {self.game_data.game_id}")
+        socket_handlers = self.socket.handlers.get('/', {})
+        for socket_event in self._socket_events:
+            socket_handlers.pop(socket_event, None)
+        self._socket_events.clear()
+
+    # Low level socket functions
+    def _game_call_backs(self) -> None:
+
+        @self._on('move')
+        async def _on_game_move(data) -> None:
+            logger.debug(f"Received move {data['move']} from game {self.game_data.game_id} - {data}")
+            await self._send_event('move', data)
+
+        @self._on('gamedata')
+        async def _on_game_data(data) -> None:
+            logger.debug(f"Received game data from game {self.game_data.game_id} - {data}")
+            self.game_data.update(data)
+            if self.clock.system is None:
+                self.clock.system = self.game_data.time_control.system
+            await self._send_event('gamedata', data)
+
+        @self._on('clock')
+        async def _on_game_clock(data) -> None:
+            logger.debug(f"Received clock data from game {self.game_data.game_id} - {data}")
+            self.clock.update(data)
+            await self._send_event('clock', data)
+
+        @self._on('phase')
+        async def _on_game_phase(data) -> None:
+            logger.debug(f"Received phase data from game {self.game_data.game_id} - {data}")
+            self.game_data.phase = data
+            await self._send_event('phase', data)
+
+        @self._on('latency')
+        async def _on_game_latency(data) -> None:
+            logger.debug(f"Received latency data from game {self.game_data.game_id} - {data}")
+            self.game_data.latency = data['latency']
+            await self._send_event('latency', data)
+
+        @self._on('undo_requested')
+        async def _on_undo_requested(data) -> None:
+            logger.debug(f"Received undo request from game {self.game_data.game_id} - {data}")
+            await self._send_event('undo_requested', data)
+
+        @self._on('undo_accepted')
+        async def _on_undo_accepted(data) -> None:
+            logger.debug(f"Received undo accepted from game {self.game_data.game_id} - {data}")
+            await self._send_event('undo_accepted', data)
+
+        @self._on('undo_canceled')
+        async def _on_undo_canceled(data) -> None:
+            logger.debug(f"Received undo canceled from game {self.game_data.game_id} - {data}")
+            await self._send_event('undo_canceled', data)
+
+    async def events(self) -> AsyncIterator[tuple[str, Any]]:
+        """Iterate over the events received for this game.
+
+        Events are buffered from the moment the game is connected, up to `max_queued_events`.
+
+        Yields:
+            event (tuple[str, Any]): Tuple of the event name and the event data
+        """
+        while True:
+            yield await self._event_queue.get()
+
+    # Send functions
+    async def connect(self) -> None:
+        """Connect to the game"""
+        logger.info(f"Connecting to game {self.game_data.game_id}")
+        await self.socket.emit(event="game/connect", data={'game_id': self.game_data.game_id, 'player_id': self.credentials.user_id, 'chat': False})
+
+    async def disconnect(self) -> None:
+        """Disconnect from the game"""
+        logger.info(f"Disconnecting game {self.game_data.game_id}")
+        await self.socket.emit(event="game/disconnect", data={'game_id': self.game_data.game_id})
+
+    async def get_gamedata(self) -> None:
+        """Get game data"""
+        logger.info(f"Getting game data for game {self.game_data.game_id}")
+        await self.socket.emit(event=f"game/{self.game_data.game_id}/gamedata", data={})
+
+    async def pause(self) -> None:
+        """Pause the game"""
+        logger.info(f"Pausing game {self.game_data.game_id}")
+        await self.socket.emit(event="game/pause", data={'game_id': self.game_data.game_id})
+
+    async def resume(self) -> None:
+        """Resume the game"""
+        logger.info(f"Resuming game {self.game_data.game_id}")
+        await self.socket.emit(event="game/resume", data={'game_id': self.game_data.game_id})
+
+    async def move(self, move: str) -> None:
+        """Submit a move to the game
+
+        Args:
+            move (str): The move to submit to the game.
+        """
+        logger.info(f"Submitting move {move} to game {self.game_data.game_id}")
+        await self.socket.emit(event="game/move", data={'auth': self.credentials.chat_auth, 'player_id': self.credentials.user_id, 'game_id': self.game_data.game_id, 'move': move})
+
+    async def resign(self) -> None:
+        """Resign the game"""
+        logger.info(f"Resigning game {self.game_data.game_id}")
+        await self.socket.emit(event="game/resign", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id})
+
+    async def cancel(self) -> None:
+        """Cancel the game if within the first few moves"""
+        logger.info(f"Canceling game {self.game_data.game_id}")
+        await self.socket.emit(event="game/cancel", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id})
+
+    async def undo(self, move: int) -> None:
+        """Request an undo on the game
+
+        Args:
+            move (int): The move number to accept the undo at.
+        """
+        logger.info(f"Requesting undo on game {self.game_data.game_id}")
+        await self.socket.emit(event="game/undo/request", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id, 'move_number': move})
+
+    async def cancel_undo(self, move: int) -> None:
+        """Cancel an undo request on the game
+
+        Args:
+            move (int): The move number to accept the undo at.
+        """
+        logger.info(f"Canceling undo on game {self.game_data.game_id}")
+        await self.socket.emit(event="game/undo/cancel", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id, 'move_number': move})
+
+    async def accept_undo(self, move: int) -> None:
+        """Accept an undo request on the game
+
+        Args:
+            move (int): The move number to accept the undo at.
+        """
+        logger.info(f"Accepting undo on game {self.game_data.game_id}")
+        await self.socket.emit(event="game/undo/accept", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id, 'move_number': move})
+
+    async def pass_turn(self) -> None:
+        """Pass the turn in the game"""
+        logger.info(f'Submitting move pass to game {self.game_data.game_id}')
+        await self.socket.emit(event="game/move", data={'auth': self.credentials.chat_auth, 'player_id': self.credentials.user_id, 'game_id': self.game_data.game_id, 'move': '..'})
+
+    async def send_chat(self, message: str, chat_type: str, move: int) -> None:
+        """Send a chat message to the game
+
+        Args:
+            message (str): The message to send to the game.
+            chat_type (str): The type of message to send. Accepts 'main', 'malkovich', 'hidden', or 'personal'
+            move (int): The move number to send the message at.
+        """
+        logger.info(f'Sending chat message to game {self.game_data.game_id}')
+        await self.socket.emit(event="game/chat", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id, 'body': message, 'type': chat_type, 'move_number': move})
@@ -0,0 +1,173 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import inspect
+from time import time
+from typing import Any, Callable
+import socketio # type: ignore[import]
+from loguru import logger
+from .ogs_api_exception import OGSApiException
+from .ogscredentials import OGSCredentials
+from .ogsasyncgame import AsyncOGSGame
+
+class AsyncOGSSocket:
+    """Asyncio version of OGSSocket, built on socketio.AsyncClient.
+
+    The callback handler may be a regular function or a coroutine function.
+    Requires the `aiohttp` package to be installed.
+
+    Args:
+        credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
+
+    Attributes:
+        clock_drift (float): The clock drift of the socket
+        clock_latency (float): The clock latency of the socket
+        last_ping (int): The last ping time of the socket
+        games (dict[int, AsyncOGSGame]): A dict of connected game objects
+        callback_handler (Callable): Callback handler for socket level events
+        credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
+        socket (socketio.AsyncClient): The async socketio client object
+    """
+
+    def __init__(self, credentials: OGSCredentials):
+        # Clock Settings
+        self.clock_drift = 0.0
+        self.clock_latency = 0.0
+        self.last_ping = 0.0
+        # Dict of connected game objects
+        self.games: dict[int, AsyncOGSGame] = {}
+        # Socket level callbacks
+        self.callback_handler: Callable = lambda event_name, data: None
+        self.credentials = credentials
+        self.socket = socketio.AsyncClient()
+
+    async def _send_event(self, event_name: str, data: Any) -> None:
+        """Send an event to the callback handler"""
+        result = self.callback_handler(event_name=event_name, data=data)
+        if inspect.isawaitable(result):
+            await result
+
+    async def connect(self) -> None:
+        """Connect to the socket"""
+        self.socket_callbacks()
+        logger.info("Connecting to Websocket")
+        try:
+            await self.socket.connect('https://online-go.com/socket.io/?EIO=4', transports='websocket', headers={"Authorization" : f"Bearer {self.credentials.access_token}"})
+        except Exception as e:
+            raise OGSApiException("Failed to connect to OGS Websocket") from e
+
+    def socket_callbacks(self) -> None:
+        """Set the callback functions for the socket"""
+
+        @self.socket.on('connect')
+        async def authenticate() -> None:
+            """Authenticate to the socket"""
+            logger.success("Connected to Websocket, authenticating")
+            await self.socket.emit(event="authenticate", data={"auth": self.credentials.chat_auth, "player_id": self.credentials.user_id, "username": self.credentials.username, "jwt": self.credentials.user_jwt})
+
+        @self.socket.on('hostinfo')
+        async def on_hostinfo(data) -> None:
+            """Called when hostinfo is received on the socket"""
+            logger.debug(f"Got Hostinfo: {data}")
+
+        @self.socket.on('net/pong')
+        async def on_pong(data) -> None:
+            """Called when a pong is received on the socket"""
+            now = time() * 1000
+            latency = now - data["client"]
+            drift = ((now - latency / 2) - data["server"])
+            self.clock_latency = latency / 1000
+            self.clock_drift = drift / 1000
+            self.last_ping = now / 1000
+            logger.debug(f"Got Pong: {data}")
+
+        @self.socket.on('active_game')
+        async def on_active_game(data) -> None:
+            """Called when an active game is received on the socket"""
+            logger.debug(f"Got Active Game: {data}")
+            await self._send_event("active_game", data)
+
+        @self.socket.on('notification')
+        async def on_notification(data) -> None:
+            """Called when a notification is received on the socket"""
+            logger.debug(f"Got Notification: {data}")
+            await self._send_event("notification", data)
+
+        @self.socket.on('ERROR')
+        async def on_error(data) -> None:
+            """Called when an error is received from the server"""
+            logger.error(f"Got Error: {data}")
+            await self._send_event("ERROR", data)
+
+    async def host_info(self) -> None:
+        """Get the host info of the socket"""
+        logger.info("Getting Host Info")
+        await self.socket.emit(event="hostinfo", namespace='/')
+
+    async def ping(self) -> None:
+        """Ping the socket"""
+        logger.info("Pinging Websocket")
+        await self.socket.emit(event="net/ping", data={"client": int(time() * 1000), "drift": self.clock_drift, "latency": self.clock_latency})
+
+    async def notification_connect(self) -> None:
+        """Connect to the notification socket"""
+        logger.info("Connecting to Notification Websocket")
+        await self.socket.emit(event="notification/connect", data={"auth": self.credentials.notification_auth, "player_id": self.credentials.user_id, "username": self.credentials.username})
+
+    async def chat_connect(self) -> None:
+        """Connect to the chat socket"""
+        logger.info("Connecting to Chat Websocket")
+        await self.socket.emit(event="chat/connect", data={"auth": self.credentials.chat_auth, "player_id": self.credentials.user_id, "username": self.credentials.username})
+
+    async def game_connect(self, game_id: int, callback_handler: Callable | None = None) -> AsyncOGSGame:
+        """Connect to a game
+
+        Args:
+            game_id (int): The id of the game to connect to
+            callback_handler (Callable, optional): The callback handler for the game. Defaults to the callback_handler of the socket.
+
+        Returns:
+            AsyncOGSGame (AsyncOGSGame): The game object
+        """
+        logger.info(f"Connecting to Game {game_id}")
+        if callback_handler is None:
+            callback_handler = self.callback_handler
+        game = AsyncOGSGame(game_socket=self.socket, game_id=game_id, credentials=self.credentials, callback_handler=callback_handler)
+        self.games[game_id] = game
+        await game.connect()
+        logger.success(f"Connected to Game {game_id}")
+        return game
+
+    async def game_disconnect(self, game_id: int) -> None:
+        """Disconnect from a game
+
+        Args:
+            game_id (int): The id of the game to disconnect from
+        """
+        logger.info(f"Disconnecting from Game {game_id}")
+        game = self.games.pop(game_id)
+        await game.disconnect()
+        game.unsubscribe()
+
+    @property
+    def registered_handlers(self) -> int:
+        """Number of event handlers registered with the socketio client"""
+        return sum(len(handlers) for handlers in self.socket.handlers.values())
+
+    async def disconnect(self) -> None:
+        """Disconnect from the socket, unsubscribing from every game"""
+        logger.info("Disconnecting from Websocket")
+        for game_id in list(self.games):
+            await self.game_disconnect(game_id)
+        await self.socket.disconnect()
@@ -0,0 +1,464 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import random
+from array import array
+from typing import Sequence
+from .ogs_api_exception import OGSApiException
+
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+class _OGSGroup:
+    """A chain of connected stones and the empty points next to it"""
+    __slots__ = ('color', 'stones', 'liberties')
+
+    def __init__(self, color: int):
+        self.color = color
+        self.stones: list[int] = []
+        self.liberties: set[int] = set()
+
+class _OGSDelta:
+    """What a move changed, so it can be undone without replaying the game"""
+    __slots__ = ('point', 'color', 'captured', 'suicided', 'ko', 'to_move')
+
+    def __init__(self, point: int, color: int, ko: int, to_move: int):
+        self.point = point
+        self.color = color
+        self.captured: list[int] = []
+        self.suicided: list[int] = []
+        self.ko = ko
+        self.to_move = to_move
+
+class OGSBoard:
+    """Board position of a game, updated incrementally with every move.
+
+    The points are kept in a flat array, with the stones of each chain and its liberties tracked
+    per group. Playing a move only touches the groups next to it, merging the smaller groups into
+    the largest one, and undoing a move only rebuilds the groups around the changed points.
+
+    Every position is identified by a Zobrist hash, updated with each stone placed or captured. The
+    random keys are derived from the board size, so the same position has the same hash in every
+    process, and hashes can be compared between games.
+
+    Examples:
+        >>> board = OGSBoard(19, 19)
+        >>> board.play(3, 3)
+        []
+        >>> board.get(3, 3) == BLACK
+        True
+
+    Args:
+        width (int, optional): Width of the board. Defaults to 19.
+        height (int, optional): Height of the board. Defaults to 19.
+        initial_state (dict, optional): Stones placed before the first move, as OGS sends them in the
+            gamedata: strings of two letter coordinates for `black` and `white`. Defaults to None.
+        handicap (int, optional): Number of handicap stones black places as its first moves. Defaults to 0.
+        initial_player (str, optional): Player making the first move, `black` or `white`. Defaults to 'black'.
+        superko (bool, optional): Reject moves repeating an earlier position while validating, as the
+            chinese and aga rules do. Defaults to False.
+
+    Attributes:
+        width (int): Width of the board
+        height (int): Height of the board
+        to_move (int): Color of the player making the next move, BLACK or WHITE
+        move_number (int): Number of moves played, including passes
+        captures (dict[int, int]): Number of stones captured by each color
+        ko (tuple[int, int] | None): Point that can't be played next because of ko
+        hash (int): Zobrist hash of the current position
+        hashes (list[int]): Hash of the position after each move, starting with the initial position
+        superko (bool): Whether moves repeating an earlier position are rejected while validating
+    """
+
+    _neighbor_tables: dict[tuple[int, int], list[tuple[int, ...]]] = {}
+    _zobrist_tables: dict[tuple[int, int], list[int]] = {}
+
+    def __init__(self, width: int = 19, height: int = 19, initial_state: dict | None = None,
+                 handicap: int = 0, initial_player: str = 'black', superko: bool = False):
+        self.reset(width, height, initial_state, handicap, initial_player, superko)
+
+    def reset(self, width: int = 19, height: int = 19, initial_state: dict | None = None,
+              handicap: int = 0, initial_player: str = 'black', superko: bool = False) -> None:
+        """Clear the board and set it up for a new game. See the class arguments."""
+        self.superko = superko
+        self.width = width
+        self.height = height
+        self.handicap = handicap or 0
+        self.initial_player = initial_player or 'black'
+        self.initial_state = {'black': '', 'white': ''}
+        if initial_state:
+            self.initial_state.update({color: initial_state.get(color) or '' for color in ('black', 'white')})
+        self._points = array('b', bytes(width * height))
+        self._groups: list[_OGSGroup | None] = [None] * (width * height)
+        self._neighbors = self._neighbor_table(width, height)
+        self._zobrist = self._zobrist_table(width, height)
+        self._history: list[_OGSDelta] = []
+        self._ko = -1
+        self.move_number = 0
+        self.captures = {BLACK: 0, WHITE: 0}
+        self.to_move = self.color_for(0)
+        self.hash = 0
+        for color, name in ((BLACK, 'black'), (WHITE, 'white')):
+            stones = self.initial_state[name]
+            for i in range(0, len(stones) - 1, 2):
+                point = self._index(ord(stones[i]) - 97, ord(stones[i + 1]) - 97)
+                if self._points[point] == EMPTY:
+                    self._points[point] = color
+                    self.hash ^= self._zobrist[point * 2 + color - 1]
+        self.hashes = [self.hash]
+        self._seen = {self.hash: 1}
+        self._rebuild(range(width * height))
+
+    @classmethod
+    def _neighbor_table(cls, width: int, height: int) -> list[tuple[int, ...]]:
+        """Get the neighbors of every point, computed once per board size"""
+        table = cls._neighbor_tables.get((width, height))
+        if table is None:
+            table = []
+            for point in range(width * height):
+                x, y = point % width, point // width
+                table.append(tuple(ny * width + nx for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+                                   if 0 <= nx < width and 0 <= ny < height))
+            cls._neighbor_tables[(width, height)] = table
+        return table
+
+    @classmethod
+    def _zobrist_table(cls, width: int, height: int) -> list[int]:
+        """Get a random 64 bit key for each color on every point, the same for every board of this size"""
+        table = cls._zobrist_tables.get((width, height))
+        if table is None:
+            rng = random.Random(f'ogsapi-zobrist-{width}x{height}')
+            table = [rng.getrandbits(64) for _ in range(width * height * 2)]
+            cls._zobrist_tables[(width, height)] = table
+        return table
+
+    def _index(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise OGSApiException(f"Move ({x}, {y}) is outside of the {self.width}x{self.height} board")
+        return y * self.width + x
+
+    def color_for(self, move_number: int) -> int:
+        """Get the color making a move, black placing its handicap stones first
+
+        Args:
+            move_number (int): Number of moves played before the move, 0 for the first move
+
+        Returns:
+            color (int): BLACK or WHITE
+        """
+        first = WHITE if self.initial_player == 'white' else BLACK
+        if first == BLACK and self.handicap > 1:
+            if move_number < self.handicap:
+                return BLACK
+            move_number -= self.handicap - 1
+        return first if move_number % 2 == 0 else 3 - first
+
+    @property
+    def ko(self) -> tuple[int, int] | None:
+        return None if self._ko < 0 else (self._ko % self.width, self._ko // self.width)
+
+    def get(self, x: int, y: int) -> int:
+        """Get the stone on a point
+
+        Args:
+            x (int): Column of the point, from the left
+            y (int): Row of the point, from the top
+
+        Returns:
+            color (int): EMPTY, BLACK or WHITE
+        """
+        return self._points[self._index(x, y)]
+
+    def liberties(self, x: int, y: int) -> int:
+        """Get the number of liberties of the group on a point, 0 for an empty point"""
+        group = self._groups[self._index(x, y)]
+        return len(group.liberties) if group is not None else 0
+
+    def stones(self, color: int) -> list[tuple[int, int]]:
+        """Get the points of every stone of a color"""
+        return [(point % self.width, point // self.width) for point, stone in enumerate(self._points) if stone == color]
+
+    def seen(self, position_hash: int | None = None) -> int:
+        """Get how often a position occurred in the game so far
+
+        Args:
+            position_hash (int, optional): Hash of the position, defaults to the current position
+
+        Returns:
+            count (int): Number of times the position occurred
+        """
+        return self._seen.get(self.hash if position_hash is None else position_hash, 0)
+
+    def check(self, x: int, y: int, color: int | None = None) -> None:
+        """Check whether a move is legal, without playing it
+
+        Args:
+            x (int): Column of the move, -1 to pass
+            y (int): Row of the move, -1 to pass
+            color (int, optional): Color of the stone, defaults to the player to move.
+
+        Raises:
+            OGSApiException: If the point is outside of the board or occupied, or the move is suicide,
+                retakes a ko or repeats a position with superko
+        """
+        if x < 0 or y < 0:
+            return
+        point = self._index(x, y)
+        points, groups = self._points, self._groups
+        if points[point] != EMPTY:
+            raise OGSApiException(f"Point ({x}, {y}) is already occupied")
+        if point == self._ko:
+            raise OGSApiException(f"Point ({x}, {y}) retakes the ko")
+        color = color or self.to_move
+        captured: list[_OGSGroup] = []
+        has_liberty = False
+        for neighbor in self._neighbors[point]:
+            group = groups[neighbor]
+            if group is None:
+                has_liberty = True
+            elif group.color == color:
+                has_liberty = has_liberty or len(group.liberties) > 1
+            elif len(group.liberties) == 1 and group not in captured:
+                captured.append(group)
+        if not has_liberty and not captured:
+            raise OGSApiException(f"Move ({x}, {y}) is suicide")
+        if self.superko:
+            position_hash = self.hash ^ self._zobrist[point * 2 + color - 1]
+            for group in captured:
+                for stone in group.stones:
+                    position_hash ^= self._zobrist[stone * 2 + group.color - 1]
+            if position_hash in self._seen:
+                raise OGSApiException(f"Move ({x}, {y}) repeats an earlier position")
+
+    def is_legal(self, x: int, y: int, color: int | None = None) -> bool:
+        """Whether a move is legal. See `check()`."""
+        try:
+            self.check(x, y, color)
+        except OGSApiException:
+            return False
+        return True
+
+    def pass_turn(self) -> None:
+        """Pass, giving the turn to the other player"""
+        self._history.append(_OGSDelta(-1, self.to_move, self._ko, self.to_move))
+        self._ko = -1
+        self._advance()
+
+    def _advance(self) -> None:
+        """Finish a move, recording the new position"""
+        self.move_number += 1
+        self.to_move = self.color_for(self.move_number)
+        self.hashes.append(self.hash)
+        self._seen[self.hash] = self._seen.get(self.hash, 0) + 1
+
+    def play(self, x: int, y: int, color: int | None = None, validate: bool = True) -> list[tuple[int, int]]:
+        """Play a move, capturing the groups left without liberties
+
+        Args:
+            x (int): Column of the move, -1 to pass
+            y (int): Row of the move, -1 to pass
+            color (int, optional): Color of the stone, defaults to the player to move.
+            validate (bool, optional): Raise on suicide and ko. When False, a suicide removes the
+                group and ko is not checked, as moves already accepted by the server are trusted.
+                Defaults to True.
+
+        Returns:
+            captured (list[tuple[int, int]]): Points of the captured stones
+
+        Raises:
+            OGSApiException: If the point is outside of the board or occupied, or the move is suicide,
+                retakes a ko or repeats a position with superko while validating
+        """
+        if x < 0 or y < 0:
+            self.pass_turn()
+            return []
+        point = self._index(x, y)
+        if self._points[point] != EMPTY:
+            raise OGSApiException(f"Point ({x}, {y}) is already occupied")
+        if validate and point == self._ko:
+            raise OGSApiException(f"Point ({x}, {y}) retakes the ko")
+        color = color or self.to_move
+        delta = _OGSDelta(point, color, self._ko, self.to_move)
+        points, groups = self._points, self._groups
+
+        # Merge the new stone with the friendly groups next to it
+        group = _OGSGroup(color)
+        enemies: list[_OGSGroup] = []
+        for neighbor in self._neighbors[point]:
+            stone = points[neighbor]
+            if stone == EMPTY:
+                group.liberties.add(neighbor)
+                continue
+            other = groups[neighbor]
+            assert other is not None
+            if stone == color:
+                if other is not group:
+                    group = self._merge(group, other)
+            elif other not in enemies:
+                enemies.append(other)
+        points[point] = color
+        self.hash ^= self._zobrist[point * 2 + color - 1]
+        group.stones.append(point)
+        group.liberties.discard(point)
+        groups[point] = group
+
+        # Take the liberty from the enemy groups, capturing those left without any
+        for enemy in enemies:
+            enemy.liberties.discard(point)
+            if not enemy.liberties:
+                delta.captured.extend(enemy.stones)
+                self._remove(enemy)
+
+        if not group.liberties:
+            if validate:
+                self.hash ^= self._zobrist[point * 2 + color - 1]
+                self._rebuild([point], exclude=point)
+                raise OGSApiException(f"Move ({x}, {y}) is suicide")
+            delta.suicided.extend(group.stones)
+            self._remove(group)
+            self.captures[3 - color] += len(delta.suicided)
+
+        self.captures[color] += len(delta.captured)
+        if len(delta.captured) == 1 and len(group.stones) == 1 and len(group.liberties) == 1:
+            self._ko = delta.captured[0]
+        else:
+            self._ko = -1
+        self._history.append(delta)
+        self._advance()
+        if validate and self.superko and self._seen[self.hash] > 1:
+            self.undo()
+            raise OGSApiException(f"Move ({x}, {y}) repeats an earlier position")
+        return [(captured % self.width, captured // self.width) for captured in delta.captured]
+
+    def _merge(self, group: _OGSGroup, other: _OGSGroup) -> _OGSGroup:
+        """Merge two groups, moving the stones of the smaller one"""
+        if len(group.stones) > len(other.stones):
+            group, other = other, group
+        groups = self._groups
+        for stone in group.stones:
+            groups[stone] = other
+        other.stones.extend(group.stones)
+        other.liberties |= group.liberties
+        return other
+
+    def _remove(self, group: _OGSGroup) -> None:
+        """Remove the stones of a group, giving their points back as liberties to the groups next to them"""
+        points, groups, zobrist = self._points, self._groups, self._zobrist
+        offset = group.color - 1
+        for stone in group.stones:
+            points[stone] = EMPTY
+            groups[stone] = None
+            self.hash ^= zobrist[stone * 2 + offset]
+        for stone in group.stones:
+            for neighbor in self._neighbors[stone]:
+                other = groups[neighbor]
+                if other is not None:
+                    other.liberties.add(stone)
+
+    def undo(self) -> bool:
+        """Undo the last move
+
+        Returns:
+            undone (bool): Whether a move was undone, False if no moves were played
+        """
+        if not self._history:
+            return False
+        delta = self._history.pop()
+        self._seen[self.hash] -= 1
+        if not self._seen[self.hash]:
+            del self._seen[self.hash]
+        self.hashes.pop()
+        self.hash = self.hashes[-1]
+        self.move_number -= 1
+        self.to_move = delta.to_move
+        self._ko = delta.ko
+        if delta.point < 0:
+            return True
+        points = self._points
+        points[delta.point] = EMPTY
+        self._groups[delta.point] = None
+        for stone in delta.suicided:
+            if stone != delta.point:
+                points[stone] = delta.color
+        for stone in delta.captured:
+            points[stone] = 3 - delta.color
+        self.captures[delta.color] -= len(delta.captured)
+        self.captures[3 - delta.color] -= len(delta.suicided)
+        self._rebuild(delta.captured + delta.suicided + [delta.point])
+        return True
+
+    def _rebuild(self, changed: Sequence[int] | range, exclude: int = -1) -> None:
+        """Rebuild the groups on and next to the changed points"""
+        points, groups, neighbors = self._points, self._groups, self._neighbors
+        if exclude >= 0:
+            points[exclude] = EMPTY
+            groups[exclude] = None
+        seeds = set(changed)
+        for point in changed:
+            seeds.update(neighbors[point])
+        done: set[int] = set()
+        for seed in seeds:
+            color = points[seed]
+            if color == EMPTY or seed in done:
+                continue
+            group = _OGSGroup(color)
+            stack = [seed]
+            done.add(seed)
+            while stack:
+                stone = stack.pop()
+                group.stones.append(stone)
+                groups[stone] = group
+                for neighbor in neighbors[stone]:
+                    stone_color = points[neighbor]
+                    if stone_color == EMPTY:
+                        group.liberties.add(neighbor)
+                    elif stone_color == color and neighbor not in done:
+                        done.add(neighbor)
+                        stack.append(neighbor)
+
+    def sync(self, moves: Sequence[Sequence[int]]) -> int:
+        """Bring the board up to date with the moves of a game, only playing the moves not played yet
+
+        The board is replayed from the start only when the moves played so far don't match the start
+        of the given moves.
+
+        Args:
+            moves (Sequence[Sequence[int]]): Moves of the game as `[x, y, ...]`, -1 for a pass
+
+        Returns:
+            played (int): Number of moves played
+        """
+        if self.move_number > len(moves) or not self._follows(moves):
+            self.reset(self.width, self.height, self.initial_state, self.handicap, self.initial_player, self.superko)
+        played = 0
+        for move in moves[self.move_number:]:
+            self.play(move[0], move[1], validate=False)
+            played += 1
+        return played
+
+    def _follows(self, moves: Sequence[Sequence[int]]) -> bool:
+        """Whether the last move played matches the move with the same number"""
+        if not self._history:
+            return True
+        point = self._history[-1].point
+        move = moves[self.move_number - 1]
+        if point < 0:
+            return move[0] < 0 or move[1] < 0
+        return (move[0], move[1]) == (point % self.width, point // self.width)
+
+    def __str__(self) -> str:
+        symbols = '.XO'
+        return '\n'.join(''.join(symbols[self._points[y * self.width + x]] for x in range(self.width))
+                         for y in range(self.height))
@@ -0,0 +1,92 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import dataclasses
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+from loguru import logger
+
+T = TypeVar('T')
+
+@dataclasses.dataclass
+class OGSBulkResult(Generic[T]):
+    """Result of a single item of a bulk fetch
+
+    Attributes:
+        id (Any): ID the item was fetched for
+        result (T, optional): The fetched value, None if the fetch failed
+        error (Exception, optional): The exception raised while fetching, None if the fetch succeeded
+    """
+    id: Any
+    result: T | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was fetched successfully"""
+        return self.error is None
+
+def bulk_fetch(fetch: Callable[[Any], T], ids: Iterable[Any], max_workers: int = 8,
+               ordered: bool = True) -> Iterator[OGSBulkResult[T]]:
+    """Call a fetch function for many IDs concurrently and stream the results.
+
+    At most `max_workers` fetches run at the same time and at most twice as many are queued, so
+    the IDs can be a lazy iterable of any length. Exceptions are returned per item instead of raised.
+
+    Args:
+        fetch (Callable): Function fetching a single ID
+        ids (Iterable): IDs to fetch
+        max_workers (int, optional): Maximum number of concurrent fetches. Defaults to 8.
+        ordered (bool, optional): Yield results in the order of the IDs instead of as they complete. Defaults to True.
+
+    Yields:
+        result (OGSBulkResult): Result of each ID
+    """
+
+    def run(item_id: Any) -> OGSBulkResult[T]:
+        try:
+            return OGSBulkResult(id=item_id, result=fetch(item_id))
+        except Exception as e: # pylint: disable=broad-except
+            logger.warning(f"Bulk fetch of {item_id} failed: {e}")
+            return OGSBulkResult(id=item_id, error=e)
+
+    id_iter = iter(ids)
+    max_pending = max_workers * 2
+    pending: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ogsapi-bulk") as executor:
+
+        def fill() -> None:
+            while len(pending) < max_pending:
+                try:
+                    item_id = next(id_iter)
+                except StopIteration:
+                    return
+                pending.append(executor.submit(run, item_id))
+
+        try:
+            fill()
+            while pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+                fill()
+        finally:
+            # Don't start queued fetches if the caller stopped iterating early
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,208 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import re
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable
+from loguru import logger
+
+_MISSING = object()
+
+class OGSLRUCache:
+    """Thread safe, size bounded LRU cache with optional per entry expiry.
+
+    Args:
+        max_size (int, optional): Maximum number of entries to keep. Defaults to 1024.
+
+    Attributes:
+        max_size (int): Maximum number of entries to keep
+        hits (int): Number of lookups that found a valid entry
+        misses (int): Number of lookups that found no valid entry
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get an entry, marking it as recently used.
+
+        Args:
+            key (Hashable): Key of the entry
+            default (Any, optional): Value to return if the entry is missing or expired. Defaults to None.
+
+        Returns:
+            value (Any): The cached value or the default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires is not None and expires <= monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Add or replace an entry, evicting the least recently used entries if full.
+
+        Args:
+            key (Hashable): Key of the entry
+            value (Any): Value to cache
+            ttl (float, optional): Seconds until the entry expires. Defaults to None, never expiring.
+        """
+        expires = monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value.
+
+        Args:
+            key (Hashable): Key of the entry
+            default (Any, optional): Value to return if the entry is missing. Defaults to None.
+
+        Returns:
+            value (Any): The removed value or the default
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+class OGSResponseCache(OGSLRUCache):
+    """LRU cache of REST responses for read-only endpoints with per endpoint TTLs.
+
+    Only GET requests to endpoints matching one of the TTL patterns are cached. Any object implementing
+    `lookup()`, `store()` and `invalidate()` can be used in place of this class by the OGSRestAPI.
+
+    Examples:
+        >>> cache = OGSResponseCache(max_size=4096, ttls={r'^/games/\\d+/sgf$': 3600})
+        >>> ogs = OGSClient(client_id, client_secret, username, password, cache=cache)
+        >>> ogs.api.cache.invalidate('/games/1234')
+
+    Args:
+        max_size (int, optional): Maximum number of responses to keep. Defaults to 1024.
+        ttls (dict[str, float], optional): Mapping of endpoint regex patterns to TTLs in seconds.
+            Endpoints are matched without their trailing slash. Defaults to DEFAULT_TTLS.
+
+    Attributes:
+        ttls (dict[str, float]): Mapping of endpoint regex patterns to TTLs in seconds
+    """
+
+    DEFAULT_TTLS: dict[str, float] = {
+        r'^/players$': 300,
+        r'^/players/\d+$': 300,
+        r'^/games/\d+$': 30,
+        r'^/games/\d+/reviews$': 300,
+        r'^/games/\d+/sgf$': 600,
+        r'^/games/\d+/png$': 600,
+        r'^/me/settings$': 60,
+    }
+
+    def __init__(self, max_size: int = 1024, ttls: dict[str, float] | None = None):
+        super().__init__(max_size=max_size)
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self._patterns = [(re.compile(pattern), ttl) for pattern, ttl in self.ttls.items()]
+
+    @staticmethod
+    def _normalize(endpoint: str) -> str:
+        return endpoint.rstrip('/') or '/'
+
+    def ttl_for(self, endpoint: str) -> float | None:
+        """Get the TTL of an endpoint.
+
+        Args:
+            endpoint (str): Endpoint to get the TTL for
+
+        Returns:
+            ttl (float | None): TTL in seconds, or None if the endpoint is not cached
+        """
+        endpoint = self._normalize(endpoint)
+        for pattern, ttl in self._patterns:
+            if pattern.match(endpoint):
+                return ttl
+        return None
+
+    def _key(self, endpoint: str, params: dict | None) -> tuple:
+        # requests accepts lists as parameter values, which aren't hashable
+        items = ((key, tuple(value) if isinstance(value, (list, tuple)) else value) for key, value in (params or {}).items())
+        return (self._normalize(endpoint), tuple(sorted(items, key=lambda item: str(item[0]))))
+
+    def lookup(self, endpoint: str, params: dict | None = None) -> Any:
+        """Get the cached response of a GET request.
+
+        Args:
+            endpoint (str): Endpoint of the request
+            params (dict, optional): Parameters of the request. Defaults to None.
+
+        Returns:
+            response (Any): The cached response, or None if not cached
+        """
+        if self.ttl_for(endpoint) is None:
+            return None
+        return self.get(self._key(endpoint, params))
+
+    def store(self, endpoint: str, params: dict | None, response: Any) -> None:
+        """Cache the response of a GET request if its endpoint is cacheable.
+
+        Args:
+            endpoint (str): Endpoint of the request
+            params (dict, optional): Parameters of the request
+            response (Any): Response to cache
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl is not None:
+            self.set(self._key(endpoint, params), response, ttl=ttl)
+
+    def invalidate(self, endpoint: str | None = None) -> None:
+        """Remove cached responses of an endpoint and everything below it.
+
+        Args:
+            endpoint (str, optional): Endpoint to invalidate, EX: '/games/1234' also invalidates
+                '/games/1234/sgf'. Defaults to None, invalidating everything.
+        """
+        if endpoint is None:
+            self.clear()
+            return
+        prefix = self._normalize(endpoint)
+        with self._lock:
+            stale = [key for key in self._entries
+                     if isinstance(key, tuple) and (key[0] == prefix or key[0].startswith(prefix + '/'))]
+            for key in stale:
+                del self._entries[key]
+        logger.debug(f"Invalidated {len(stale)} cached responses for {prefix}")
@@ -0,0 +1,101 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+from .ogs_api_exception import OGSApiException
+
+GTP_COLUMNS = 'ABCDEFGHJKLMNOPQRSTUVWXYZ'
+
+class OGSCoordinates:
+    """Lookup tables converting moves between GTP and OGS coordinates for a board size.
+
+    GTP coordinates name the column with a letter, skipping I, and count the rows from the bottom,
+    like `D4`. OGS uses two letters counted from the top left, like `dp`. Passes are `pass` and `..`.
+    The tables of each board size are built once, see `for_board()`.
+
+    Examples:
+        >>> coordinates = OGSCoordinates.for_board(19, 19)
+        >>> coordinates.parse('D4')
+        (3, 15)
+        >>> coordinates.to_ogs(3, 15)
+        'dp'
+
+    Args:
+        width (int): Width of the board, at most 25
+        height (int): Height of the board, at most 25
+
+    Attributes:
+        width (int): Width of the board
+        height (int): Height of the board
+    """
+
+    _tables: dict[tuple[int, int], 'OGSCoordinates'] = {}
+
+    def __init__(self, width: int, height: int):
+        if not (0 < width <= len(GTP_COLUMNS) and 0 < height <= len(GTP_COLUMNS)):
+            raise OGSApiException(f"Unsupported board size {width}x{height}")
+        self.width = width
+        self.height = height
+        self._moves: dict[str, tuple[int, int]] = {'..': (-1, -1), 'PASS': (-1, -1)}
+        self._ogs: dict[tuple[int, int], str] = {(-1, -1): '..'}
+        self._gtp: dict[tuple[int, int], str] = {(-1, -1): 'pass'}
+        for x in range(width):
+            for y in range(height):
+                ogs = chr(97 + x) + chr(97 + y)
+                gtp = f'{GTP_COLUMNS[x]}{height - y}'
+                self._moves[ogs] = self._moves[gtp] = (x, y)
+                self._ogs[(x, y)] = ogs
+                self._gtp[(x, y)] = gtp
+
+    @classmethod
+    def for_board(cls, width: int = 19, height: int = 19) -> 'OGSCoordinates':
+        """Get the tables of a board size, building them on first use
+
+        Args:
+            width (int, optional): Width of the board. Defaults to 19.
+            height (int, optional): Height of the board. Defaults to 19.
+
+        Returns:
+            coordinates (OGSCoordinates): The tables of the board size
+        """
+        tables = cls._tables.get((width, height))
+        if tables is None:
+            tables = cls._tables[(width, height)] = cls(width, height)
+        return tables
+
+    def parse(self, move: str) -> tuple[int, int]:
+        """Get the point of a move in GTP or OGS coordinates
+
+        Args:
+            move (str): The move, like `D4`, `dp`, `pass` or `..`
+
+        Returns:
+            point (tuple[int, int]): Column and row of the move from the top left, (-1, -1) for a pass
+
+        Raises:
+            OGSApiException: If the move is not a point on the board
+        """
+        point = self._moves.get(move)
+        if point is None:
+            point = self._moves.get(move.upper())
+            if point is None:
+                raise OGSApiException(f"Invalid move {move} for a {self.width}x{self.height} board")
+        return point
+
+    def to_ogs(self, x: int, y: int) -> str:
+        """Get the OGS coordinates of a point, `..` for a pass"""
+        return self._ogs[(x, y)]
+
+    def to_gtp(self, x: int, y: int) -> str:
+        """Get the GTP coordinates of a point, `pass` for a pass"""
+        return self._gtp[(x, y)]
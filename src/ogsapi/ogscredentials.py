@@ -25,6 +25,7 @@ class OGSCredentials:
         password (str, optional): OGS Password
         access_token (str, optional): Access token to use for authentication. Defaults to None.
         refresh_token (str, optional): The refresh token to use for authentication. Defaults to None.
+        expires_at (float, optional): Unix time the access token expires at. Defaults to None.
         user_id (str, optional): The user ID to use for authentication. Defaults to None.
         chat_auth (str, optional): The chat auth token to use for authentication. Defaults to None.
         user_jwt (str, optional): The user JWT to use for authentication. Defaults to None.
@@ -36,6 +37,7 @@ class OGSCredentials:
     password: str | None = None
     access_token: str | None = None
     refresh_token: str | None = None
+    expires_at: float | None = None
     user_id: str | None = None
     chat_auth: str | None = None
     user_jwt: str | None = None
@@ -0,0 +1,204 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Hashable
+from loguru import logger
+from .ogs_api_exception import OGSApiException
+
+class _OGSEvent:
+    """Event waiting in a dispatcher queue"""
+    __slots__ = ('key', 'handler', 'event_name', 'data', 'queued_at', 'control')
+
+    def __init__(self, key: Hashable, handler: Callable, event_name: str, data: Any, control: bool = False):
+        self.key = key
+        self.handler = handler
+        self.event_name = event_name
+        self.data = data
+        self.queued_at = monotonic()
+        self.control = control
+
+class _OGSShard:
+    """Bounded queue of events handled by a single worker thread"""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self.events: deque[_OGSEvent] = deque()
+        self.clocks: dict[Hashable, _OGSEvent] = {}
+        self.condition = threading.Condition()
+
+class OGSEventDispatcher:
+    """Hands socket events to the callback handlers on a pool of worker threads.
+
+    Events are sharded over the workers by key, usually the game ID, so the events of a game are
+    handled in order while different games are handled in parallel. A slow handler only delays
+    the games sharing its worker, instead of every event received on the socket.
+
+    Examples:
+        >>> dispatcher = OGSEventDispatcher(workers=4, policy='coalesce_clock')
+        >>> ogs.socket_connect(callback_handler, dispatcher=dispatcher)
+
+    Args:
+        workers (int, optional): Number of worker threads. Defaults to 4.
+        max_queue (int, optional): Maximum number of events waiting per worker. Defaults to 1000.
+        policy (str, optional): What to do when a queue is full. Defaults to 'block'.
+            Accepted policies are:
+                - block: Block the socket thread until there is room, pushing back on the server
+                - drop_oldest: Drop the oldest waiting event
+                - coalesce_clock: Drop a waiting clock event of the same game when a newer one is queued,
+                  blocking like `block` when the queue is still full
+
+    Attributes:
+        policy (str): What to do when a queue is full
+        dropped (int): Number of events dropped by the drop_oldest policy
+        coalesced (int): Number of clock events replaced by a newer one
+        handled (int): Number of events handed to a handler
+        last_lag (float): Seconds the last handled event waited in the queue
+        max_lag (float): Most seconds any event waited in the queue
+    """
+
+    POLICIES = ('block', 'drop_oldest', 'coalesce_clock')
+
+    def __init__(self, workers: int = 4, max_queue: int = 1000, policy: str = 'block'):
+        if policy not in self.POLICIES:
+            raise OGSApiException(f"Invalid dispatch policy, Got: {policy}. Expected: {', '.join(self.POLICIES)}")
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.handled = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._total_lag = 0.0
+        self._metrics_lock = threading.Lock()
+        self._running = True
+        self._shards = [_OGSShard(max_queue) for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._work, args=(shard,), name=f"ogsapi-dispatch-{i}", daemon=True)
+            for i, shard in enumerate(self._shards)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.debug(f"Started event dispatcher with {workers} workers, policy {policy}")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be handled"""
+        return sum(len(shard.events) for shard in self._shards)
+
+    def metrics(self) -> dict:
+        """Get the queue and handler lag metrics.
+
+        Returns:
+            metrics (dict): Queue depth, depth per worker, handled, dropped and coalesced counts, and the
+                last, mean and max seconds events waited before being handled
+        """
+        with self._metrics_lock:
+            return {
+                'queue_depth': self.queue_depth,
+                'worker_depths': [len(shard.events) for shard in self._shards],
+                'handled': self.handled,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced,
+                'last_lag': self.last_lag,
+                'mean_lag': self._total_lag / self.handled if self.handled else 0.0,
+                'max_lag': self.max_lag,
+            }
+
+    def dispatch(self, key: Hashable, handler: Callable, event_name: str, data: Any, control: bool = False) -> None:
+        """Queue an event for a handler.
+
+        Args:
+            key (Hashable): Events with the same key are handled in order, EX: the game ID
+            handler (Callable): Handler to call with `event_name` and `data`
+            event_name (str): Name of the event
+            data (Any): Data of the event
+            control (bool, optional): Internal bookkeeping that must run, like removing the handlers of a
+                game. Control events are queued even when the queue is full, and are never dropped.
+                Defaults to False.
+        """
+        if not self._running:
+            raise OGSApiException("Event dispatcher is closed")
+        shard = self._shards[hash(key) % len(self._shards)]
+        with shard.condition:
+            if self.policy == 'coalesce_clock' and event_name == 'clock':
+                waiting = shard.clocks.get(key)
+                if waiting is not None and waiting.handler == handler:
+                    # Only the newest clock matters, queued behind the events sent before it
+                    shard.events.remove(waiting)
+                    del shard.clocks[key]
+                    with self._metrics_lock:
+                        self.coalesced += 1
+
+            while not control and len(shard.events) >= shard.max_queue and self._running:
+                if self.policy == 'drop_oldest':
+                    dropped = next((event for event in shard.events if not event.control), None)
+                    if dropped is None:
+                        break
+                    shard.events.remove(dropped)
+                    self._forget_clock(shard, dropped)
+                    with self._metrics_lock:
+                        self.dropped += 1
+                    logger.warning(f"Event queue full, dropped {dropped.event_name} event of {dropped.key}")
+                else:
+                    shard.condition.wait()
+
+            event = _OGSEvent(key, handler, event_name, data, control)
+            shard.events.append(event)
+            if self.policy == 'coalesce_clock' and event_name == 'clock':
+                shard.clocks[key] = event
+            shard.condition.notify_all()
+
+    @staticmethod
+    def _forget_clock(shard: _OGSShard, event: _OGSEvent) -> None:
+        if shard.clocks.get(event.key) is event:
+            del shard.clocks[event.key]
+
+    def _work(self, shard: _OGSShard) -> None:
+        while True:
+            with shard.condition:
+                while not shard.events and self._running:
+                    shard.condition.wait()
+                if not shard.events:
+                    return
+                event = shard.events.popleft()
+                self._forget_clock(shard, event)
+                shard.condition.notify_all()
+
+            lag = monotonic() - event.queued_at
+            with self._metrics_lock:
+                self.handled += 1
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+                self._total_lag += lag
+            try:
+                event.handler(event_name=event.event_name, data=event.data)
+            except Exception: # pylint: disable=broad-except
+                logger.exception(f"Handler for {event.event_name} event of {event.key} failed")
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the workers once the waiting events are handled.
+
+        Args:
+            wait (bool, optional): Block until the waiting events are handled. Defaults to True.
+        """
+        self._running = False
+        for shard in self._shards:
+            with shard.condition:
+                shard.condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join()
@@ -12,13 +12,40 @@
 # You should have received a copy of the GNU General Public License 
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Callable
+import re
+from collections import deque
+from concurrent.futures import Future
+from time import perf_counter
+from typing import Any, Callable
+import threading
 from loguru import logger
 import socketio # type: ignore[import]
 from .ogs_api_exception import OGSApiException
 from .ogscredentials import OGSCredentials
 from .ogsgamedata import OGSGameData
 from .ogsgameclock import OGSGameClock
+from .ogsrouter import OGSEventRouter
+from .ogsdispatcher import OGSEventDispatcher
+from .ogslatency import OGSLatencyEstimator
+from .ogsboard import OGSBoard, BLACK, WHITE
+from .ogscoordinates import OGSCoordinates
+from .ogspositionindex import OGSPositionIndex
+
+# Words in the game errors caused by a submitted move, EX: 'illegal_ko_move' or 'Not your turn'.
+# Other errors leave the pending moves alone
+_MOVE_ERRORS = frozenset(('move', 'illegal', 'turn', 'ko', 'suicide', 'suicidal', 'occupied'))
+_WORD_SEPARATORS = re.compile(r'[^a-z]+')
+
+class _OGSPendingMove:
+    """A submitted move waiting for the server to echo it"""
+
+    __slots__ = ('future', 'coordinates', 'submitted', 'timer')
+
+    def __init__(self, coordinates: tuple[int, int] | None):
+        self.future: Future = Future()
+        self.coordinates = coordinates
+        self.submitted = perf_counter()
+        self.timer: threading.Timer | None = None
 
 class OGSGame:
     """OGSGame class for handling games connected via the OGSSocket.
@@ -27,115 +54,314 @@ class OGSGame:
         game_socket (OGSSocket): OGSSocket object to connect to the game.
         game_id (str): ID of the game to connect to.
         credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
-        callback_handler (Callable): Callback handler function to send events to the user.
+        callback_handler (Callable, optional): Callback handler function to send every event of the game to. Defaults to None.
+        router (OGSEventRouter, optional): Router to register the handlers of the game with. Defaults to a new router.
+        dispatcher (OGSEventDispatcher, optional): Dispatcher to call the handlers on worker threads. Defaults to None.
+        auto_unsubscribe (bool, optional): Disconnect and unsubscribe from the game once it is finished. Defaults to True.
+        connect (bool, optional): Send the game/connect right away. Defaults to True.
+        fast_path (bool, optional): Send moves by reusing a payload built when connecting, without logging
+            each move. Defaults to False.
+        track_board (bool, optional): Keep the board position of the game up to date in `board`. Defaults to True.
+        position_index (OGSPositionIndex, optional): Index to add the positions of the game to. Defaults to None.
+        validate_moves (bool, optional): Check moves against the phase and board position before sending them,
+            raising instead of waiting for the server to reject them. Defaults to False.
         
     Attributes:
         socket (OGSSocket): OGSSocket object to connect to the game.
         game_data (OGSGameData): OGSGameData object containing game data.
         credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
-        callback_handler (Callable): Callback handler function to send events to the user.
-        callback_func (dict): Dictionary containing the callback functions.
+        callback_handler (Callable | None): Callback handler function receiving every event of the game.
+        router (OGSEventRouter): Router the handlers of the game are registered with.
+        dispatcher (OGSEventDispatcher | None): Dispatcher calling the handlers, None to call them on the socket thread.
+        auto_unsubscribe (bool): Whether to disconnect and unsubscribe from the game once it is finished.
+        subscribed (bool): Whether the handlers of the game are registered with the socket.
+        on_unsubscribe (Callable | None): Called with the game after it unsubscribed.
+        ready (Future): Resolved with the game once its first gamedata and clock have been applied.
+        fast_path (bool): Whether moves are sent by reusing a prebuilt payload.
+        move_latency (OGSLatencyEstimator): Time in seconds between submitting a move with `submit_move()`
+            and the server echoing it.
+        board (OGSBoard | None): Board position of the game, updated with every move. None if not tracked.
+        position_index (OGSPositionIndex | None): Index the positions of the game are added to, None if disabled.
+        validate_moves (bool): Whether moves are checked before they are sent.
 
     """
     
-    def __init__(self, game_socket: socketio.Client, credentials: OGSCredentials, game_id, callback_handler: Callable):
+    def __init__(self, game_socket: socketio.Client, credentials: OGSCredentials, game_id, callback_handler: Callable | None = None,
+                 router: OGSEventRouter | None = None, dispatcher: OGSEventDispatcher | None = None,
+                 auto_unsubscribe: bool = True, connect: bool = True, fast_path: bool = False,
+                 track_board: bool = True, position_index: OGSPositionIndex | None = None,
+                 validate_moves: bool = False):
         self.socket = game_socket
         self.game_data = OGSGameData(game_id=game_id)
         self.clock = OGSGameClock()
+        self.router = router if router is not None else OGSEventRouter()
+        self.dispatcher = dispatcher
+        self.auto_unsubscribe = auto_unsubscribe
+        self.on_unsubscribe: Callable[['OGSGame'], None] | None = None
+        self.subscribed = True
+        self.ready: Future = Future()
+        self._pending_ready = {'gamedata', 'clock'}
+        self._connected = False
+        self._socket_events: list[str] = []
+        self._callback_handler: Callable | None = None
+        self.fast_path = fast_path
+        self.move_latency = OGSLatencyEstimator()
+        self._move_payload: dict[str, Any] = {}
+        self._pending_moves: deque[_OGSPendingMove] = deque()
+        self._moves_lock = threading.Lock()
+        self.board: OGSBoard | None = OGSBoard() if track_board else None
+        self._board_setup: tuple | None = None
+        self.position_index = position_index
+        self.validate_moves = validate_moves
         # Define callback functions from the API
         self._game_call_backs()
         self.credentials = credentials
         self.callback_handler = callback_handler
 
         # Connect to the game
-        self.connect()
+        if connect:
+            self.connect()
 
         # Define relevant game data
     def __del__(self):
         self.disconnect()
 
-    # def register_callback(self, event: str, callback: Callable):
-    #     """Register a callback function for receiving data from the API.
+    @property
+    def callback_handler(self) -> Callable | None:
+        """Callback handler receiving every event of the game, registered as a catch-all handler with the router"""
+        return self._callback_handler
+
+    @callback_handler.setter
+    def callback_handler(self, callback_handler: Callable | None) -> None:
+        if self._callback_handler is not None:
+            self.router.unregister(OGSEventRouter.ALL, self._callback_handler, self.game_data.game_id)
+        self._callback_handler = callback_handler
+        if callback_handler is not None:
+            self.router.register(OGSEventRouter.ALL, callback_handler, self.game_data.game_id)
+
+    def register_callback(self, event: str, callback: Callable) -> None:
+        """Register a callback function for receiving data from the API.
         
-    #     Args:
-    #         event (str): Event to register the callback function for.
-    #             Accepted events are:
-    #                 - on_move
-    #                 - on_clock
-    #                 - on_phase_change
-    #                 - on_undo_requested
-    #                 - on_undo_accepted
-    #                 - on_undo_canceled
-    #         callback (Callable): Callback function to register.   
-    #     """
-    #     self.callback_func[event] = callback
+        Args:
+            event (str): Event to register the callback function for.
+                Accepted events are:
+                    - move
+                    - gamedata
+                    - clock
+                    - phase
+                    - latency
+                    - undo_requested
+                    - undo_accepted
+                    - undo_canceled
+                    - error
+                    - gamedata_changes: What a gamedata event changed, see `OGSGameData.update()`
+            callback (Callable): Callback function to register, called with the event data.
+        """
+        self.router.register(event, callback, self.game_data.game_id)
+
+    def on(self, event: str) -> Callable[[Callable], Callable]:
+        """Decorator to register a callback function for an event. See `register_callback()`.
+
+        Examples:
+            >>> @game.on('move')
+            ... def on_move(data):
+            ...     print(data['move'])
+
+        Args:
+            event (str): Event to register the callback function for.
+
+        Returns:
+            decorator (Callable): Decorator registering the function
+        """
+        return self.router.on(event, self.game_data.game_id)
+
+    def _send_event(self, event_name: str, data: Any) -> None:
+        """Send an event to its handlers, dropping it before any other work if there are none"""
+        if not self.router.handlers(self.game_data.game_id, event_name):
+            return
+        logger.debug(f"Received {event_name} from game {self.game_data.game_id} - {data}")
+        if self.dispatcher is not None:
+            self.dispatcher.dispatch(self.game_data.game_id, self._route, event_name, data)
+        else:
+            self._route(event_name, data)
+
+    def _route(self, event_name: str, data: Any) -> None:
+        self.router.route(self.game_data.game_id, event_name, data)
+
+    def _on(self, event: str) -> Callable:
+        """Register a socket handler for an event of this game, remembering it so it can be removed again"""
+        socket_event = f'game/{self.game_data.game_id}/{event}'
+        self._socket_events.append(socket_event)
+        return self.socket.on(socket_event)
+
+    def unsubscribe(self) -> None:
+        """Remove the socket and router handlers of the game.
+
+        Afterwards the socket no longer references the game, so it can be garbage collected.
+        """
+        if not self.subscribed:
+            return
+        self.subscribed = False
+        logger.info(f"Unsubscribing from game {self.game_data.game_id}")
+        self._remove_socket_handlers()
+        if self.dispatcher is not None:
+            # Let the events already queued for the game reach their handlers first
+            self.dispatcher.dispatch(self.game_data.game_id, self._clear_handlers, 'unsubscribe', None, control=True)
+        else:
+            self.router.clear(self.game_data.game_id)
+        if not self.ready.done():
+            self.ready.set_exception(OGSApiException(f"Unsubscribed from game {self.game_data.game_id} before it was ready"))
+        while self._pending_moves:
+            self._fail_move(OGSApiException(f"Unsubscribed from game {self.game_data.game_id} before the move was accepted"))
+        if self.on_unsubscribe is not None:
+            self.on_unsubscribe(self)
+
+    def _remove_socket_handlers(self) -> None:
+        socket_handlers = self.socket.handlers.get('/', {})
+        for socket_event in self._socket_events:
+            socket_handlers.pop(socket_event, None)
+        self._socket_events.clear()
+
+    def rebind(self, game_socket: socketio.Client) -> None:
+        """Move the game to another socketio client, registering its handlers there and connecting again.
+
+        Args:
+            game_socket (socketio.Client): The socketio client to move to
+        """
+        self._remove_socket_handlers()
+        self.socket = game_socket
+        self._game_call_backs()
+        self.connect()
+
+    def _clear_handlers(self, event_name: str, data: Any) -> None:
+        self.router.clear(self.game_data.game_id)
+
+    def _applied(self, event: str) -> None:
+        """Resolve the ready future once both the gamedata and clock have been applied"""
+        if self._pending_ready:
+            self._pending_ready.discard(event)
+            if not self._pending_ready and not self.ready.done():
+                logger.debug(f"Game {self.game_data.game_id} is ready")
+                self.ready.set_result(self)
+
+    def _sync_board(self) -> None:
+        """Play the moves of the game not on the board yet, setting the board up again if the game settings changed"""
+        if self.board is None:
+            return
+        data = self.game_data
+        setup = (data.width or 19, data.height or 19, dict(data.initial_state), data.handicap or 0,
+                 data.initial_player or 'black', data.rules in ('chinese', 'aga'))
+        if setup != self._board_setup:
+            self._board_setup = setup
+            self.board.reset(*setup)
+        try:
+            played = self.board.sync(data.moves)
+            if played and self.position_index is not None:
+                self.position_index.add_board(data.game_id, self.board, self.board.move_number - played + 1)
+        except OGSApiException as e:
+            logger.error(f"Failed to update the board of game {data.game_id}: {e}")
+            self.board.reset(*setup)
+
+    def _add_move(self, data: Any) -> None:
+        """Add a move event to the moves of the game"""
+        move = data.get('move') if isinstance(data, dict) else None
+        if not move:
+            return
+        move_number = data.get('move_number', len(self.game_data.moves) + 1)
+        if move_number == len(self.game_data.moves) + 1:
+            self.game_data.moves.append(move)
+            self._sync_board()
+
+    def _check_finished(self) -> None:
+        if self.auto_unsubscribe and self.game_data.phase == 'finished':
+            logger.info(f"Game {self.game_data.game_id} finished")
+            self.disconnect()
+            self.unsubscribe()
 
     # Low level socket functions
     def _game_call_backs(self) -> None:
 
-        # TODO: Need to create a game board state and have this update it
-        @self.socket.on(f'game/{self.game_data.game_id}/move')
+        @self._on('move')
         def _on_game_move(data) -> None:
-            logger.debug(f"Received move {data['move']} from game {self.game_data.game_id} - {data}")
-            self.callback_handler(event_name='move', data=data)
+            self._add_move(data)
+            if self._pending_moves:
+                self._move_echoed(data)
+            self._send_event('move', data)
 
-        @self.socket.on(f'game/{self.game_data.game_id}/gamedata')
+        @self._on('error')
+        def _on_game_error(data) -> None:
+            logger.error(f"Error from game {self.game_data.game_id}: {data}")
+            if self._pending_moves and self._is_move_error(data):
+                self._fail_move(OGSApiException(f"Move rejected by game {self.game_data.game_id}: {data}"))
+            self._send_event('error', data)
+
+        @self._on('gamedata')
         def _on_game_data(data) -> None:
-            logger.debug(f"Received game data from game {self.game_data.game_id} - {data}")
             # Set important game data
-            self.game_data.update(data)
+            changes = self.game_data.update(data)
+            self._sync_board()
             if self.clock.system == None:
                 self.clock.system = self.game_data.time_control.system
-            self.callback_handler(event_name="gamedata", data=data)
+            self._applied('gamedata')
+            self._send_event('gamedata', data)
+            if changes:
+                self._send_event('gamedata_changes', changes)
+            self._check_finished()
 
-        @self.socket.on(f'game/{self.game_data.game_id}/clock')
+        @self._on('clock')
         def _on_game_clock(data) -> None:
-            logger.debug(f"Received clock data from game {self.game_data.game_id} - {data}")
             #TODO: Need to create a game clock and sync clock with this event
 
             # Define clock parameters based on time control
             self.clock.update(data)
+            self._applied('clock')
             
             # Call the on_clock callback
-            self.callback_handler(event_name="clock", data=data)
+            self._send_event('clock', data)
 
-        @self.socket.on(f'game/{self.game_data.game_id}/phase')
+        @self._on('phase')
         def _on_game_phase(data) -> None:
-            logger.debug(f"Received phase data from game {self.game_data.game_id} - {data}")
             self.game_data.phase = data
-            self.callback_handler(event_name="phase", data=data)
+            self._send_event('phase', data)
+            self._check_finished()
 
-        @self.socket.on(f'game/{self.game_data.game_id}/latency')
+        @self._on('latency')
         def _on_game_latency(data) -> None:
-            logger.debug(f"Received latency data from game {self.game_data.game_id} - {data}")
             self.game_data.latency = data['latency']
-            self.callback_handler(event_name="latency", data=data)
+            self._send_event('latency', data)
 
-        @self.socket.on(f'game/{self.game_data.game_id}/undo_requested')
+        @self._on('undo_requested')
         def _on_undo_requested(data) -> None:
-            logger.debug(f"Received undo request from game {self.game_data.game_id} - {data}")
             #TODO: Handle This 
-            self.callback_handler(event_name="undo_requested", data=data)
+            self._send_event('undo_requested', data)
         
-        @self.socket.on(f'game/{self.game_data.game_id}/undo_accepted')
+        @self._on('undo_accepted')
         def _on_undo_accepted(data) -> None:
-            logger.debug(f"Received undo accepted from game {self.game_data.game_id} - {data}")
-            #TODO: Handle This
-            self.callback_handler(event_name="undo_accepted", data=data)
+            if self.game_data.moves:
+                self.game_data.moves.pop()
+                if self.board is not None and self.board.move_number > len(self.game_data.moves):
+                    if self.position_index is not None:
+                        self.position_index.remove(self.board.hash, self.game_data.game_id, self.board.move_number)
+                    self.board.undo()
+            self._send_event('undo_accepted', data)
         
-        @self.socket.on(f'game/{self.game_data.game_id}/undo_canceled')
+        @self._on('undo_canceled')
         def _on_undo_canceled(data) -> None:
-            logger.debug(f"Received undo canceled from game {self.game_data.game_id} - {data}")
-            self.callback_handler(event_name="undo_canceled", data=data)
+            self._send_event('undo_canceled', data)
     
     # Send functions
     def connect(self) -> None:
         """Connect to the game"""
         logger.info(f"Connecting to game {self.game_data.game_id}")
+        self._connected = True
+        self._move_payload = {'auth': self.credentials.chat_auth, 'player_id': self.credentials.user_id, 'game_id': self.game_data.game_id, 'move': None}
         self.socket.emit(event="game/connect", data={'game_id': self.game_data.game_id, 'player_id': self.credentials.user_id, 'chat': False})
 
     def disconnect(self) -> None:
         """Disconnect from the game"""
+        if not self._connected:
+            return
+        self._connected = False
         logger.info(f"Disconnecting game {self.game_data.game_id}")
         self.socket.emit(event="game/disconnect", data={'game_id': self.game_data.game_id})
 
@@ -162,11 +388,154 @@ class OGSGame:
             
         Examples:
             >>> game.move('B2')
+
+        Raises:
+            OGSApiException: If validating moves and the move is not legal. See `check_move()`.
+        """
+        if self.validate_moves:
+            move = self.check_move(move)
+        self._emit_move(move)
+
+    @property
+    def coordinates(self) -> OGSCoordinates:
+        """Coordinate tables for the board size of the game"""
+        return OGSCoordinates.for_board(self.game_data.width or 19, self.game_data.height or 19)
+
+    def check_move(self, move: str) -> str:
+        """Check whether a move can be played now, against the phase, turn and board position of the game
+
+        Args:
+            move (str): The move to check, in GTP or OGS coordinates
+
+        Returns:
+            move (str): The move in OGS coordinates
+
+        Raises:
+            OGSApiException: If the move is not on the board, the game is not being played, it is not
+                our turn, or the move is not legal on the board
         """
+        x, y = self.coordinates.parse(move)
+        if self.game_data.phase is not None and self.game_data.phase != 'play':
+            raise OGSApiException(f"Can't move in game {self.game_data.game_id} during the {self.game_data.phase} phase")
+        if self.board is not None:
+            color = self._own_color()
+            if color is not None and color != self.board.to_move:
+                raise OGSApiException(f"Not our turn in game {self.game_data.game_id}")
+            self.board.check(x, y, color)
+        return self.coordinates.to_ogs(x, y)
+
+    def _own_color(self) -> int | None:
+        """Color we are playing in the game, None if not known"""
+        user_id = self.credentials.user_id
+        if user_id is None:
+            return None
+        if self.game_data.black_player.id == user_id:
+            return BLACK
+        if self.game_data.white_player.id == user_id:
+            return WHITE
+        return None
+
+    def submit_move(self, move: str, timeout: float | None = 10) -> Future:
+        """Submit a move to the game, returning a future resolved once the server accepted it
+
+        The time between submitting the move and the server echoing it is added to `move_latency`.
+        Moves on the board are matched with the echoed move, other moves with the next move echoed. Once
+        the players are known, only moves made by our color are matched.
 
+        Args:
+            move (str): The move to submit to the game. Accepts GTP format.
+            timeout (float, optional): Seconds to wait for the server to echo the move, None to wait
+                forever. Defaults to 10.
+
+        Returns:
+            accepted (Future): Resolved with the move event data once the move is echoed. Fails with an
+                OGSApiException if the game sends an error about the move or the move isn't echoed within the timeout
+
+        Raises:
+            OGSApiException: If validating moves and the move is not legal. See `check_move()`.
+
+        Examples:
+            >>> game.submit_move('dd').result()
+            {'game_id': 12345678, 'move_number': 1, 'move': [3, 3, 1200]}
+        """
+        if self.validate_moves:
+            move = self.check_move(move)
+        pending = _OGSPendingMove(self._move_coordinates(move))
+        if timeout is not None:
+            pending.timer = threading.Timer(timeout, self._expire_move, args=(pending,))
+            pending.timer.daemon = True
+        with self._moves_lock:
+            self._pending_moves.append(pending)
+        if pending.timer is not None:
+            pending.timer.start()
+        self._emit_move(move)
+        return pending.future
+
+    def _emit_move(self, move: str) -> None:
+        if self.fast_path and self._move_payload:
+            # socketio serializes the payload before emit returns, so it can be reused for the next move
+            self._move_payload['move'] = move
+            self.socket.emit(event="game/move", data=self._move_payload)
+            return
         logger.info(f"Submitting move {move} to game {self.game_data.game_id}")
         self.socket.emit(event="game/move", data={'auth': self.credentials.chat_auth, 'player_id': self.credentials.user_id, 'game_id': self.game_data.game_id, 'move': move})
 
+    def _move_coordinates(self, move: str) -> tuple[int, int] | None:
+        """Get the coordinates the server echoes for a move, None if they can't be told from the move"""
+        try:
+            return self.coordinates.parse(move)
+        except OGSApiException:
+            return None
+
+    def _move_echoed(self, data: Any) -> None:
+        """Resolve the first pending move matching an echoed move of ours"""
+        echoed = data.get('move') if isinstance(data, dict) else None
+        coordinates = (echoed[0], echoed[1]) if echoed else None
+        own = self._own_color()
+        if own is not None and self.board is not None and isinstance(data, dict) and isinstance(data.get('move_number'), int):
+            # Our opponent may play the point we submitted, or pass while we submitted a pass
+            if self.board.color_for(data['move_number'] - 1) != own:
+                return
+        with self._moves_lock:
+            for pending in self._pending_moves:
+                if pending.coordinates is None or coordinates is None or pending.coordinates == coordinates:
+                    self._pending_moves.remove(pending)
+                    break
+            else:
+                return
+        latency = perf_counter() - pending.submitted
+        if pending.timer is not None:
+            pending.timer.cancel()
+        self.move_latency.add(latency, 0.0)
+        logger.debug(f"Move accepted by game {self.game_data.game_id} after {latency * 1000:.1f}ms")
+        pending.future.set_result(data)
+
+    @staticmethod
+    def _is_move_error(data: Any) -> bool:
+        """Whether a game error was caused by a submitted move, matching whole words of its message"""
+        if isinstance(data, dict):
+            data = data.get('message') or data.get('error') or data.get('code') or ''
+        if not isinstance(data, str):
+            return False
+        return not _MOVE_ERRORS.isdisjoint(_WORD_SEPARATORS.split(data.lower()))
+
+    def _fail_move(self, error: Exception) -> None:
+        """Fail the oldest pending move"""
+        with self._moves_lock:
+            if not self._pending_moves:
+                return
+            pending = self._pending_moves.popleft()
+        if pending.timer is not None:
+            pending.timer.cancel()
+        pending.future.set_exception(error)
+
+    def _expire_move(self, pending: _OGSPendingMove) -> None:
+        with self._moves_lock:
+            if pending not in self._pending_moves:
+                return
+            self._pending_moves.remove(pending)
+        pending.future.set_exception(OGSApiException(f"Move on game {self.game_data.game_id} was not accepted in time"))
+
     def resign(self) -> None:
         """Resign the game"""
         logger.info(f"Resigning game {self.game_data.game_id}")
@@ -205,9 +574,14 @@ class OGSGame:
         self.socket.emit(event="game/undo/accept", data={'auth': self.credentials.chat_auth, 'game_id': self.game_data.game_id, 'move_number': move})
 
     def pass_turn(self) -> None:
-        """Pass the turn in the game"""
-        logger.info(f'Submitting move pass to game {self.game_data.game_id}')
-        self.socket.emit(event="game/move", data={'auth': self.credentials.chat_auth, 'player_id': self.credentials.user_id, 'game_id': self.game_data.game_id, 'move': '..'})
+        """Pass the turn in the game
+
+        Raises:
+            OGSApiException: If validating moves and we can't pass now. See `check_move()`.
+        """
+        if self.validate_moves:
+            self.check_move('..')
+        self._emit_move('..')
     
     def send_chat(self, message: str, chat_type: str, move: int) -> None:
         """Send a chat message to the game
@@ -16,7 +16,7 @@ import dataclasses
 from loguru import logger
 #TODO: Implement Canadian and Absolute time controls
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ByoyomiTime:
   """OGS Byoyomi Time Data
   
@@ -37,7 +37,7 @@ class ByoyomiTime:
         setattr(self, key, value)
     logger.debug(f"Updated time data: {self}")
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class FischerTime:
   """OGS Fischer Time Data
   
@@ -59,7 +59,7 @@ class FischerTime:
         setattr(self, key, value)
     logger.debug(f"Updated time data: {self}")
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class OGSGameClock:
   """OGS Game Clock Dataclass
   
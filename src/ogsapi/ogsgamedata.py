@@ -13,9 +13,144 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import dataclasses
+from array import array
+from collections.abc import MutableSequence
+from typing import Iterable, Iterator, Sequence, overload
 from loguru import logger
 
-@dataclasses.dataclass
+_MISSING = object()
+
+def _update_fields(instance: object, new_values: dict) -> dict:
+  """Set the fields of a dataclass that changed, returning the old and new value of each"""
+  changes = {}
+  for key, value in new_values.items():
+    old = getattr(instance, key, _MISSING)
+    if old is not _MISSING and old != value:
+      setattr(instance, key, value)
+      changes[key] = (old, value)
+  return changes
+
+class OGSMoveList(MutableSequence):
+  """Moves of a game, stored in typed arrays instead of a list of lists.
+
+  Each move takes 10 bytes: the column and row as int8, and the time as int64, as the milliseconds
+  spent on a correspondence move don't fit in an int32. Moves are read as `[x, y, time]` lists like
+  OGS sends them, which are copies, so changing them doesn't change the move list.
+
+  Only the column, row and time are kept. Anything OGS sends after the time, like the dict of extra
+  move data, is dropped, and a missing or None time is stored as 0.
+
+  Args:
+    moves (Iterable[Sequence[int]], optional): Moves as `[x, y]` or `[x, y, time, ...]`. Defaults to None.
+  """
+
+  __slots__ = ('_x', '_y', '_time')
+
+  def __init__(self, moves: Iterable[Sequence[int]] | None = None):
+    self._x = array('b')
+    self._y = array('b')
+    self._time = array('q')
+    if moves is not None:
+      self.extend(moves)
+
+  def __len__(self) -> int:
+    return len(self._x)
+
+  @overload
+  def __getitem__(self, index: int) -> list[int]: ...
+
+  @overload
+  def __getitem__(self, index: slice) -> list[list[int]]: ...
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [[x, y, time] for x, y, time in zip(self._x[index], self._y[index], self._time[index])]
+    return [self._x[index], self._y[index], self._time[index]]
+
+  def __iter__(self) -> Iterator[list[int]]:
+    for x, y, time in zip(self._x, self._y, self._time):
+      yield [x, y, time]
+
+  def __setitem__(self, index, value) -> None:
+    if isinstance(index, slice):
+      moves = self[:]
+      moves[index] = value
+      self.clear()
+      self.extend(moves)
+      return
+    self._x[index], self._y[index], self._time[index] = value[0], value[1], self._move_time(value)
+
+  def __delitem__(self, index) -> None:
+    del self._x[index]
+    del self._y[index]
+    del self._time[index]
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, OGSMoveList):
+      return self._x == other._x and self._y == other._y and self._time == other._time
+    if isinstance(other, Sequence):
+      return self[:] == [[move[0], move[1], self._move_time(move)] for move in other]
+    return NotImplemented
+
+  def __repr__(self) -> str:
+    return f"OGSMoveList({self[:]})"
+
+  @staticmethod
+  def _move_time(move: Sequence) -> int:
+    return int(move[2]) if len(move) > 2 and move[2] is not None else 0
+
+  def insert(self, index: int, value: Sequence[int]) -> None:
+    self._x.insert(index, value[0])
+    self._y.insert(index, value[1])
+    self._time.insert(index, self._move_time(value))
+
+  def append(self, value: Sequence[int]) -> None:
+    self._x.append(value[0])
+    self._y.append(value[1])
+    self._time.append(self._move_time(value))
+
+  def extend(self, values: Iterable[Sequence[int]]) -> None:
+    for value in values:
+      self.append(value)
+
+  def clear(self) -> None:
+    del self._x[:]
+    del self._y[:]
+    del self._time[:]
+
+  def sync(self, moves: Sequence[Sequence[int]]) -> tuple[int, list[list[int]]]:
+    """Bring the move list up to date with the moves of a game, only changing the moves that differ
+
+    The stored moves are kept when the last of them matches the move with the same number, as moves
+    are only added or undone. Otherwise the moves are replaced from the first one that differs.
+
+    Args:
+      moves (Sequence[Sequence[int]]): Moves of the game as `[x, y]` or `[x, y, time, ...]`
+
+    Returns:
+      changes (tuple[int, list[list[int]]]): Number of moves removed from the end, and the moves added
+    """
+    kept = min(len(self), len(moves))
+    if kept and not self._matches(kept - 1, moves[kept - 1]):
+      kept = 0
+      while kept < len(self) and kept < len(moves) and self._matches(kept, moves[kept]):
+        kept += 1
+    removed = len(self) - kept
+    if removed:
+      del self[kept:]
+    added = [[move[0], move[1], self._move_time(move)] for move in moves[kept:]]
+    self.extend(added)
+    return removed, added
+
+  def _matches(self, index: int, move: Sequence[int]) -> bool:
+    return self._x[index] == move[0] and self._y[index] == move[1] and self._time[index] == self._move_time(move)
+
+  @property
+  def nbytes(self) -> int:
+    """Bytes used by the stored moves"""
+    return sum(len(moves) * moves.itemsize for moves in (self._x, self._y, self._time))
+
+@dataclasses.dataclass(slots=True)
 class Player:
   """OGS Player Dataclass
   
@@ -30,14 +165,18 @@ class Player:
   professional: bool | None = None
   id: int | None = None
 
-  def update(self, new_values: dict) -> None:
-    """Update the player data with new values"""
-    for key, value in new_values.items():
-      if hasattr(self, key):
-        setattr(self, key, value)
-    logger.debug(f"Updated player data: {self}")
+  def update(self, new_values: dict) -> dict:
+    """Update the player data with new values
 
-@dataclasses.dataclass
+    Returns:
+      changes (dict): Old and new value of each field that changed
+    """
+    changes = _update_fields(self, new_values)
+    if changes:
+      logger.debug(f"Updated player data: {changes}")
+    return changes
+
+@dataclasses.dataclass(slots=True)
 class TimeControl:
   """OGS Time Control Dataclass
 
@@ -59,14 +198,18 @@ class TimeControl:
   initial_time: int | None = None
   max_time: int | None = None
 
-  def update(self, new_values: dict) -> None:
-    """Update the player data with new values"""
-    for key, value in new_values.items():
-      if hasattr(self, key):
-        setattr(self, key, value)
-    logger.debug(f"Updated TimeControl data: {self}")
+  def update(self, new_values: dict) -> dict:
+    """Update the time control data with new values
 
-@dataclasses.dataclass
+    Returns:
+      changes (dict): Old and new value of each field that changed
+    """
+    changes = _update_fields(self, new_values)
+    if changes:
+      logger.debug(f"Updated TimeControl data: {changes}")
+    return changes
+
+@dataclasses.dataclass(slots=True)
 class OGSGameData:
   """OGS Game Dataclass
   
@@ -84,8 +227,9 @@ class OGSGameData:
     rules (str): Ruleset of the game. EX: "japanese", "chinese", "aga"
     time_control (dict): Dictionary containing information about the time control.
     phase (str): Phase of the game.
-    move_list (list[str]): List of moves in the game.
+    moves (OGSMoveList): Moves of the game as [x, y, time], -1 for a pass. Move data after the time is dropped.
     initial_state (dict): Initial state of the game.
+    initial_player (str): Player making the first move. EX: "black", "white"
     start_time (int): Start time of the game.
     clock (dict): Dictionary containing the clock data.
     latency (int): Latency of the game.
@@ -105,26 +249,51 @@ class OGSGameData:
   rules: str | None = None
   time_control: TimeControl = dataclasses.field(default_factory=TimeControl)
   phase: str | None = None
-  moves: list[str] = dataclasses.field(default_factory=list)
+  moves: OGSMoveList = dataclasses.field(default_factory=OGSMoveList)
   initial_state: dict = dataclasses.field(default_factory= lambda: {
     "black": None,
     "white": None
   })
+  initial_player: str | None = None
   start_time: int | None = None
   latency: int | None = None
 
-  def update(self, new_values: dict) -> None:
-    """Update the game data with new values
+  def update(self, new_values: dict) -> dict:
+    """Update the game data with new values, only changing what differs
     
     Args:
       new_values (dict): Dictionary containing the new values to update the game data with.
+
+    Returns:
+      changes (dict): Old and new value of each field that changed. Changes of the players and time
+        control are dicts of their fields, and changed moves are a dict with the number of moves
+        `removed` from the end and the moves `added`.
+
+    Examples:
+      >>> game_data.update({'phase': 'finished', 'moves': [[3, 3, 100], [15, 15, 200]]})
+      {'phase': ('play', 'finished'), 'moves': {'removed': 0, 'added': [[15, 15, 200]]}}
     """
+    changes: dict = {}
     for key, value in new_values.items():
       if key == "players":
-        self.white_player.update(value['white'])
-        self.black_player.update(value['black'])
+        for color in ('white', 'black'):
+          if color in value:
+            player_changes = getattr(self, f'{color}_player').update(value[color])
+            if player_changes:
+              changes[f'{color}_player'] = player_changes
       elif key == "time_control":
-        self.time_control.update(value)
-      elif hasattr(self, key):
-        setattr(self, key, value)
-    logger.debug(f"Updated game data: {self}")
\ No newline at end of file
+        time_control_changes = self.time_control.update(value)
+        if time_control_changes:
+          changes['time_control'] = time_control_changes
+      elif key == "moves":
+        removed, added = self.moves.sync(value)
+        if removed or added:
+          changes['moves'] = {'removed': removed, 'added': added}
+      else:
+        old = getattr(self, key, _MISSING)
+        if old is not _MISSING and old != value:
+          setattr(self, key, value)
+          changes[key] = (old, value)
+    if changes:
+      logger.debug(f"Updated game data of game {self.game_id}: {changes}")
+    return changes
@@ -0,0 +1,127 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import statistics
+import threading
+from collections import deque
+
+class OGSLatencyEstimator:
+    """Smooths latency and clock drift samples from the socket pings.
+
+    Each estimate is an exponentially weighted moving average. A sample whose latency is far from the
+    median of the recent samples is treated as an outlier and left out of the averages. Outliers are
+    still kept in the ring buffer of recent samples, so a lasting change in latency becomes the new
+    median and is accepted again.
+
+    Args:
+        alpha (float, optional): Weight of a new sample in the moving averages. Defaults to 0.2.
+        window (int, optional): Number of recent samples to keep. Defaults to 64.
+        outlier_factor (float, optional): Number of deviations from the median a latency sample may be
+            before it is rejected. Defaults to 3.
+        min_deviation (float, optional): Smallest deviation in seconds used for rejecting samples, so a
+            very stable connection doesn't reject every little jitter. Defaults to 0.01.
+
+    Attributes:
+        latency (float): Smoothed round trip latency in seconds
+        drift (float): Smoothed difference between the local and the server clock in seconds
+        accepted (int): Number of samples used in the averages
+        rejected (int): Number of samples rejected as outliers
+    """
+
+    MIN_SAMPLES = 5
+
+    def __init__(self, alpha: float = 0.2, window: int = 64, outlier_factor: float = 3.0, min_deviation: float = 0.01):
+        self.alpha = alpha
+        self.outlier_factor = outlier_factor
+        self.min_deviation = min_deviation
+        self.latency = 0.0
+        self.drift = 0.0
+        self.accepted = 0
+        self.rejected = 0
+        self._samples: deque[tuple[float, float]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def _is_outlier(self, latency: float) -> bool:
+        if len(self._samples) < self.MIN_SAMPLES:
+            return False
+        latencies = [sample[0] for sample in self._samples]
+        median = statistics.median(latencies)
+        # Median absolute deviation, scaled to match a standard deviation
+        deviation = 1.4826 * statistics.median(abs(value - median) for value in latencies)
+        return abs(latency - median) > self.outlier_factor * max(deviation, self.min_deviation)
+
+    def add(self, latency: float, drift: float) -> bool:
+        """Add a sample.
+
+        Args:
+            latency (float): Measured round trip latency in seconds
+            drift (float): Measured clock drift in seconds
+
+        Returns:
+            accepted (bool): Whether the sample was used in the averages, False if it was an outlier
+        """
+        with self._lock:
+            outlier = self._is_outlier(latency)
+            self._samples.append((latency, drift))
+            if outlier:
+                self.rejected += 1
+                return False
+            if self.accepted == 0:
+                self.latency, self.drift = latency, drift
+            else:
+                self.latency += self.alpha * (latency - self.latency)
+                self.drift += self.alpha * (drift - self.drift)
+            self.accepted += 1
+            return True
+
+    def samples(self) -> list[tuple[float, float]]:
+        """Get the recent samples.
+
+        Returns:
+            samples (list[tuple[float, float]]): Latency and drift of each recent sample, oldest first
+        """
+        with self._lock:
+            return list(self._samples)
+
+    def percentile(self, percent: float) -> float:
+        """Get a percentile of the recent latency samples.
+
+        Args:
+            percent (float): Percentile to get, from 0 to 100
+
+        Returns:
+            latency (float): The latency in seconds, 0 if there are no samples
+        """
+        with self._lock:
+            latencies = sorted(sample[0] for sample in self._samples)
+        if not latencies:
+            return 0.0
+        rank = round(percent / 100 * (len(latencies) - 1))
+        return latencies[min(max(rank, 0), len(latencies) - 1)]
+
+    def stats(self) -> dict:
+        """Get the smoothed estimates and latency percentiles.
+
+        Returns:
+            stats (dict): Smoothed latency and drift, p50, p90 and p99 latency, and the sample counts
+        """
+        return {
+            'latency': self.latency,
+            'drift': self.drift,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,117 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from typing import Sequence
+from .ogsboard import OGSBoard
+
+class OGSPositionIndex:
+    """Index of the board positions of many games, by their Zobrist hash.
+
+    Games tracked by an `OGSGame` add their positions as they are played, and archived games can be
+    added with `index_game()`. Looking up a hash gives every game and move number the position
+    occurred at, for opening books, transpositions and finding duplicate positions.
+
+    Examples:
+        >>> index = OGSPositionIndex()
+        >>> sock = OGSSocket(credentials, position_index=index)
+        >>> index.lookup(game.board.hash)
+        [(12345678, 4), (23456789, 4)]
+    """
+
+    def __init__(self) -> None:
+        self._positions: dict[int, set[tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, position_hash: int, game_id: int, move_number: int) -> None:
+        """Add a position
+
+        Args:
+            position_hash (int): Zobrist hash of the position
+            game_id (int): ID of the game the position occurred in
+            move_number (int): Number of moves played when the position occurred
+        """
+        with self._lock:
+            self._positions.setdefault(position_hash, set()).add((game_id, move_number))
+
+    def remove(self, position_hash: int, game_id: int, move_number: int) -> None:
+        """Remove a position, e.g. when its move is undone
+
+        Args:
+            position_hash (int): Zobrist hash of the position
+            game_id (int): ID of the game the position occurred in
+            move_number (int): Number of moves played when the position occurred
+        """
+        with self._lock:
+            occurrences = self._positions.get(position_hash)
+            if occurrences is None:
+                return
+            occurrences.discard((game_id, move_number))
+            if not occurrences:
+                del self._positions[position_hash]
+
+    def add_board(self, game_id: int, board: OGSBoard, start: int = 1) -> int:
+        """Add the positions after each move played on a board
+
+        Args:
+            game_id (int): ID of the game
+            board (OGSBoard): Board of the game
+            start (int, optional): First move number to add. Defaults to 1, leaving out the initial position.
+
+        Returns:
+            added (int): Number of positions added
+        """
+        hashes = board.hashes[start:]
+        with self._lock:
+            for move_number, position_hash in enumerate(hashes, start):
+                self._positions.setdefault(position_hash, set()).add((game_id, move_number))
+        return len(hashes)
+
+    def index_game(self, game_id: int, moves: Sequence[Sequence[int]], width: int = 19, height: int = 19,
+                   initial_state: dict | None = None, handicap: int = 0, initial_player: str = 'black') -> int:
+        """Replay an archived game and add its positions
+
+        Args:
+            game_id (int): ID of the game
+            moves (Sequence[Sequence[int]]): Moves of the game as `[x, y, ...]`, -1 for a pass
+            width (int, optional): Width of the board. Defaults to 19.
+            height (int, optional): Height of the board. Defaults to 19.
+            initial_state (dict, optional): Stones placed before the first move. Defaults to None.
+            handicap (int, optional): Number of handicap stones. Defaults to 0.
+            initial_player (str, optional): Player making the first move. Defaults to 'black'.
+
+        Returns:
+            added (int): Number of positions added
+        """
+        board = OGSBoard(width, height, initial_state, handicap, initial_player)
+        board.sync(moves)
+        return self.add_board(game_id, board)
+
+    def lookup(self, position_hash: int) -> list[tuple[int, int]]:
+        """Get where a position occurred
+
+        Args:
+            position_hash (int): Zobrist hash of the position
+
+        Returns:
+            occurrences (list[tuple[int, int]]): Game ID and move number of every occurrence
+        """
+        with self._lock:
+            return sorted(self._positions.get(position_hash, ()))
+
+    def __contains__(self, position_hash: int) -> bool:
+        return position_hash in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
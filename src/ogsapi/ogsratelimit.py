@@ -0,0 +1,309 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import random
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep
+from typing import Iterator
+from loguru import logger
+
+class OGSTokenBucket:
+    """Thread safe token bucket used to pace requests.
+
+    Args:
+        rate (float): Tokens added per second
+        capacity (float, optional): Maximum number of tokens, which is the allowed burst size. Defaults to rate.
+
+    Attributes:
+        rate (float): Tokens added per second
+        capacity (float): Maximum number of tokens
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Number of tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Get the number of seconds until the tokens are available.
+
+        Args:
+            tokens (float, optional): Number of tokens needed. Defaults to 1.
+
+        Returns:
+            wait_time (float): Seconds to wait, 0 if available now
+        """
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens from the bucket, blocking until they are available.
+
+        Tokens are reserved immediately, so concurrent callers are queued fairly rather than racing each other.
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            waited (float): Seconds spent waiting for the tokens
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+class OGSRateLimiter:
+    """Client side rate limiter with a token bucket per endpoint class.
+
+    Requests are classified as `auth` (OAuth token requests), `media` (SGF and PNG downloads),
+    `read` (other GET requests) or `write` (POST, PUT and DELETE). When the server responds with
+    `429: Too Many Requests` the class is paused for the `Retry-After` time, or an exponential backoff
+    with full jitter if the server did not send one.
+
+    On top of the per class budgets, an optional global budget limits the rate and number of
+    concurrent requests across every class, see `configure_global()`. A request first waits for its
+    class, then for the global rate, and holds one of the concurrent slots while it is sent.
+
+    Examples:
+        >>> limiter = OGSRateLimiter(budgets={'read': 5, 'write': 1})
+        >>> ogs.api.rate_limiter = limiter
+        >>> limiter.budget()
+        {'read': {'rate': 5, 'tokens': 5.0, 'wait_time': 0.0}, ...}
+
+    Args:
+        budgets (dict[str, float], optional): Requests per second for each endpoint class.
+            Missing classes use DEFAULT_BUDGETS. Defaults to None.
+        max_retries (int, optional): Maximum number of retries of idempotent requests that were throttled. Defaults to 3.
+        backoff_base (float, optional): Base delay in seconds of the exponential backoff. Defaults to 0.5.
+        backoff_max (float, optional): Maximum delay in seconds of the exponential backoff. Defaults to 30.
+        max_concurrent_requests (int, optional): Maximum number of requests in flight at once across
+            every class. Defaults to None, unlimited.
+        requests_per_second (float, optional): Maximum sustained request rate across every class.
+            Defaults to None, unlimited.
+
+    Attributes:
+        max_retries (int): Maximum number of retries of idempotent requests that were throttled
+        backoff_base (float): Base delay in seconds of the exponential backoff
+        backoff_max (float): Maximum delay in seconds of the exponential backoff
+        throttled_count (int): Number of throttled responses received
+        total_wait (float): Total seconds requests have waited for the rate limiter
+        in_flight (int): Number of requests currently being sent
+    """
+
+    DEFAULT_BUDGETS: dict[str, float] = {
+        'auth': 1.0,
+        'media': 5.0,
+        'read': 10.0,
+        'write': 2.0,
+    }
+    IDEMPOTENT_METHODS = ('GET', 'PUT', 'DELETE')
+
+    def __init__(self, budgets: dict[str, float] | None = None, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0, max_concurrent_requests: int | None = None,
+                 requests_per_second: float | None = None):
+        rates = {**self.DEFAULT_BUDGETS, **(budgets or {})}
+        self._buckets = {endpoint_class: OGSTokenBucket(rate) for endpoint_class, rate in rates.items()}
+        self._paused_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.throttled_count = 0
+        self.total_wait = 0.0
+        self.in_flight = 0
+        self.configure_global(max_concurrent_requests, requests_per_second)
+
+    def configure_global(self, max_concurrent_requests: int | None = None, requests_per_second: float | None = None) -> None:
+        """Configure the global budget shared by every endpoint class.
+
+        Args:
+            max_concurrent_requests (int, optional): Maximum number of requests in flight at once. Defaults to None, unlimited.
+            requests_per_second (float, optional): Maximum sustained request rate. Defaults to None, unlimited.
+        """
+        self.max_concurrent_requests = max_concurrent_requests
+        self._concurrency = threading.BoundedSemaphore(max_concurrent_requests) if max_concurrent_requests else None
+        self._global = OGSTokenBucket(requests_per_second) if requests_per_second else None
+        logger.debug(f"Configured global request budget: {max_concurrent_requests} concurrent, {requests_per_second} per second")
+
+    @staticmethod
+    def classify(method: str, endpoint: str) -> str:
+        """Get the endpoint class of a request.
+
+        Args:
+            method (str): HTTP method of the request
+            endpoint (str): Endpoint of the request
+
+        Returns:
+            endpoint_class (str): The endpoint class, one of `auth`, `media`, `read` or `write`
+        """
+        if endpoint.lstrip('/').startswith('oauth2'):
+            return 'auth'
+        if method != 'GET':
+            return 'write'
+        if endpoint.rstrip('/').endswith(('/sgf', '/png')):
+            return 'media'
+        return 'read'
+
+    def _pause_remaining(self, endpoint_class: str) -> float:
+        return max(0.0, self._paused_until.get(endpoint_class, 0.0) - monotonic())
+
+    def wait_time(self, endpoint_class: str) -> float:
+        """Get the number of seconds a request of an endpoint class would currently wait.
+
+        Args:
+            endpoint_class (str): The endpoint class
+
+        Returns:
+            wait_time (float): Seconds to wait, 0 if a request can be made now
+        """
+        with self._lock:
+            paused = self._pause_remaining(endpoint_class)
+        global_wait = self._global.wait_time() if self._global is not None else 0.0
+        return max(paused, self._buckets[endpoint_class].wait_time(), global_wait)
+
+    def budget(self) -> dict[str, dict[str, float]]:
+        """Get the current budget of every endpoint class.
+
+        Returns:
+            budget (dict[str, dict[str, float]]): The rate, available tokens and wait time of each endpoint
+                class. When a global budget is configured, its rate, tokens, wait time, concurrency limit
+                and requests in flight are under `global`
+        """
+        budget = {
+            endpoint_class: {
+                'rate': bucket.rate,
+                'tokens': bucket.tokens,
+                'wait_time': self.wait_time(endpoint_class),
+            }
+            for endpoint_class, bucket in self._buckets.items()
+        }
+        if self._global is not None or self._concurrency is not None:
+            budget['global'] = {
+                'rate': self._global.rate if self._global is not None else float('inf'),
+                'tokens': self._global.tokens if self._global is not None else float('inf'),
+                'wait_time': self._global.wait_time() if self._global is not None else 0.0,
+                'max_concurrent': self.max_concurrent_requests or float('inf'),
+                'in_flight': self.in_flight,
+            }
+        return budget
+
+    def acquire(self, endpoint_class: str) -> float:
+        """Wait until a request of an endpoint class is allowed.
+
+        Args:
+            endpoint_class (str): The endpoint class
+
+        Returns:
+            waited (float): Seconds spent waiting
+        """
+        with self._lock:
+            paused = self._pause_remaining(endpoint_class)
+        if paused > 0:
+            sleep(paused)
+        waited = paused + self._buckets[endpoint_class].acquire()
+        if self._global is not None:
+            waited += self._global.acquire()
+        if waited:
+            with self._lock:
+                self.total_wait += waited
+        return waited
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the concurrent request slots of the global budget while sending a request"""
+        if self._concurrency is not None:
+            self._concurrency.acquire()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            if self._concurrency is not None:
+                self._concurrency.release()
+
+    def backoff(self, attempt: int) -> float:
+        """Get the jittered exponential backoff delay of a retry.
+
+        Args:
+            attempt (int): Number of the retry, starting at 0
+
+        Returns:
+            delay (float): Seconds to wait before retrying
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def throttled(self, endpoint_class: str, attempt: int, retry_after: str | None = None) -> float:
+        """Pause an endpoint class after the server throttled a request.
+
+        Args:
+            endpoint_class (str): The endpoint class
+            attempt (int): Number of times this request has been retried, used for the backoff if there is no Retry-After
+            retry_after (str, optional): Value of the `Retry-After` header. Defaults to None.
+
+        Returns:
+            delay (float): Seconds the endpoint class is paused for
+        """
+        delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff(attempt)
+        with self._lock:
+            self.throttled_count += 1
+            self._paused_until[endpoint_class] = max(self._paused_until.get(endpoint_class, 0.0), monotonic() + delay)
+        logger.warning(f"Throttled by OGS, pausing {endpoint_class} requests for {delay:.2f}s")
+        return delay
+
+    @staticmethod
+    def parse_retry_after(retry_after: str | None) -> float | None:
+        """Parse a `Retry-After` header value.
+
+        Args:
+            retry_after (str, optional): Header value in seconds or as an HTTP date
+
+        Returns:
+            delay (float | None): Seconds to wait, or None if the value is missing or invalid
+        """
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
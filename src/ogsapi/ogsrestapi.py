@@ -13,10 +13,19 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 
+import copy
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 from .ogscredentials import OGSCredentials
 from .ogs_api_exception import OGSApiException
+from .ogscache import OGSResponseCache
+from .ogsratelimit import OGSRateLimiter
+from .ogstokenstore import OGSTokenStore
 
 class OGSRestAPI:
     """OGS Rest API Class for handling REST connections to OGS
@@ -24,19 +33,63 @@ class OGSRestAPI:
     Args:
         credentials (OGSCredentials): The credentials to use for authentication
         dev (bool, optional): Whether to connect to beta OGS instance. Defaults to False.
-    
+        pool_connections (int, optional): Number of per-host connection pools to keep. Defaults to 10.
+        pool_maxsize (int, optional): Maximum number of keep-alive connections per host. Defaults to 10.
+        pool_block (bool, optional): Block when all connections to a host are in use
+            instead of opening a new, non-pooled one. Defaults to False.
+        max_retries (int, optional): Number of retries for failed connections and
+            502/503/504 responses on idempotent methods. Throttled requests are retried by the
+            rate limiter instead. Defaults to 3.
+        cache (OGSResponseCache, optional): Cache for responses of read-only endpoints. Defaults to None.
+        max_concurrent_requests (int, optional): Maximum number of requests in flight at once
+            across all threads. Defaults to None, unlimited. See `configure_budget()`.
+        requests_per_second (float, optional): Maximum sustained request rate across all threads.
+            Defaults to None, unlimited. See `configure_budget()`.
+        rate_limiter (OGSRateLimiter, optional): Rate limiter with per endpoint class budgets.
+            Defaults to an OGSRateLimiter with the default budgets.
+        token_store (OGSTokenStore, optional): Store to persist tokens in, so they are reused
+            across restarts. Defaults to None.
+        lazy (bool, optional): Don't fetch the socket auth data and user ID when authenticating, only
+            when they are first needed. See `ensure_auth_data()`. Defaults to False.
+        coalesce_requests (bool, optional): Let identical GET requests made at the same time share a
+            single request. Defaults to True.
+
     Attributes:
         credentials (OGSCredentials, optional): The credentials used for authentication
         is_authed (bool): Whether the user is authenticated
         api_ver (str): The API version to use
         base_url (str): The base URL to use for API calls
+        session (requests.Session): Pooled keep-alive HTTP session shared by all calls
+        cache (OGSResponseCache | None): Cache for responses of read-only endpoints, None if disabled
+        rate_limiter (OGSRateLimiter): Rate limiter all requests go through
+        token_store (OGSTokenStore | None): Store tokens are persisted in, None if disabled
+        lazy (bool): Whether the socket auth data and user ID are only fetched when first needed
+        coalesce_requests (bool): Whether identical concurrent GET requests share a single request
     """
 
-    def __init__(self, credentials: OGSCredentials, dev: bool = False):
+    TOKEN_EXPIRY_MARGIN = 60
+
+    def __init__(self, credentials: OGSCredentials, dev: bool = False, pool_connections: int = 10,
+                 pool_maxsize: int = 10, pool_block: bool = False, max_retries: int = 3,
+                 cache: OGSResponseCache | None = None, max_concurrent_requests: int | None = None,
+                 requests_per_second: float | None = None, rate_limiter: OGSRateLimiter | None = None,
+                 token_store: OGSTokenStore | None = None, lazy: bool = False, coalesce_requests: bool = True):
 
         self.credentials = credentials
+        self.cache = cache
+        self.token_store = token_store
+        self.lazy = lazy
+        self.coalesce_requests = coalesce_requests
+        self._inflight: dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._auth_lock = threading.RLock()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else OGSRateLimiter()
+        self.configure_budget(max_concurrent_requests=max_concurrent_requests, requests_per_second=requests_per_second)
         self.is_authed = False
         self.api_ver = "v1"
+        self.session = requests.Session()
+        self.configure_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                               pool_block=pool_block, max_retries=max_retries)
         if dev:
             self.base_url = 'https://beta.online-go.com/'
             logger.debug("Connecting to beta OGS instance")
@@ -44,42 +97,170 @@ class OGSRestAPI:
             self.base_url = 'https://online-go.com/'
             logger.debug("Connecting to production OGS instance")
 
-        # TODO: Maybe implement some form of token caching
         if self.credentials.client_id is not None and self.credentials.client_secret is not None:
             self.authenticate()
-            self.get_auth_data()
+
+    def __del__(self):
+        self.close()
+
+    def configure_session(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                          pool_block: bool = False, max_retries: int = 3) -> None:
+        """Configure the connection pool and retry policy of the HTTP session.
+
+        The urllib3 connection pool is thread safe, so the session can be shared by every thread
+        using this OGSRestAPI object.
+
+        Args:
+            pool_connections (int, optional): Number of per-host connection pools to keep. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of keep-alive connections per host. Defaults to 10.
+            pool_block (bool, optional): Block when all connections to a host are in use. Defaults to False.
+            max_retries (int, optional): Number of retries for failed connections and 502/503/504
+                responses on idempotent methods. Defaults to 3.
+        """
+        # 429 responses are left to the rate limiter, which pauses the endpoint class and retries
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=['GET', 'PUT', 'DELETE'],
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        logger.debug(f"Configured HTTP session with {pool_connections} pools of {pool_maxsize} connections")
+
+    def configure_budget(self, max_concurrent_requests: int | None = None, requests_per_second: float | None = None) -> None:
+        """Configure the global request budget shared by all threads using this OGSRestAPI object.
+
+        The global budget is part of the `rate_limiter`, on top of its per endpoint class budgets, so
+        it is exposed with `rate_limiter.budget()` too. Replacing the rate limiter replaces the budget.
+
+        Args:
+            max_concurrent_requests (int, optional): Maximum number of requests in flight at once. Defaults to None, unlimited.
+            requests_per_second (float, optional): Maximum sustained request rate. Defaults to None, unlimited.
+        """
+        self.rate_limiter.configure_global(max_concurrent_requests, requests_per_second)
+
+    def close(self) -> None:
+        """Close all pooled connections of the HTTP session."""
+        session = getattr(self, 'session', None)
+        if session is not None:
+            session.close()
 
     # TODO: All these internal functions should be moved into private functions
     @logger.catch
     def authenticate(self) -> None:
-        """Authenticate with the OGS API and save the access token and user ID."""
+        """Authenticate with the OGS API and save the access token and user ID.
 
-        endpoint = f'{self.base_url}/oauth2/token/'
+        A still valid access token from the token store is reused. Otherwise the refresh token is
+        used if there is one, falling back to the password grant.
+        """
+
+        with self._auth_lock:
+            if self._load_tokens():
+                logger.info("Using stored access token")
+            elif not self.refresh_access_token():
+                self._password_grant()
+            self.is_authed = True
+        if not self.lazy:
+            self.ensure_auth_data()
+
+    def refresh_access_token(self) -> bool:
+        """Get a new access token using the refresh token.
+
+        Returns:
+            refreshed (bool): Whether a new access token was received
+        """
+        if self.credentials.refresh_token is None:
+            return False
+        logger.info("Refreshing access token")
+        try:
+            self._token_grant({
+                'grant_type': 'refresh_token',
+                'refresh_token': self.credentials.refresh_token,
+                'client_secret': self.credentials.client_secret,
+            })
+        except OGSApiException as e:
+            logger.warning(f"Refreshing access token failed: {e}")
+            return False
+        return True
+
+    def _password_grant(self) -> None:
         logger.info("Authenticating with OGS API")
+        self._token_grant({
+            'grant_type': 'password',
+            'username': self.credentials.username,
+            'password': self.credentials.password,
+        })
+
+    def _token_grant(self, data: dict) -> None:
+        """Request tokens from the OAuth token endpoint, and save them to the credentials and token store"""
+        endpoint = f'{self.base_url}/oauth2/token/'
+        self.rate_limiter.acquire('auth')
         try:
-            response = requests.post(endpoint, data={
-                'client_id': self.credentials.client_id,
-                'grant_type': 'password',
-                'username': self.credentials.username,
-                'password': self.credentials.password,
-            },
+            response = self.session.post(endpoint, data={'client_id': self.credentials.client_id, **data},
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
             timeout=20
             )
         except requests.exceptions.RequestException as e:
             raise OGSApiException("Authentication Failed") from e
 
-        if 299 >= response.status_code >= 200:
-            # Save Access Token, Refresh Token, and User ID
-            # TODO: This should probably be made into a user object that has token and ID info
-            self.credentials.access_token = response.json()['access_token']
-            self.credentials.refresh_token = response.json()['refresh_token']
-            self.get_auth_data()
-            self.is_authed = True
-        else:
+        if not 299 >= response.status_code >= 200:
             raise OGSApiException(f"{response.status_code}: {response.reason}")
 
-    @logger.catch
+        # Save Access Token, Refresh Token, and when the Access Token expires
+        # TODO: This should probably be made into a user object that has token and ID info
+        tokens = response.json()
+        self.credentials.access_token = tokens['access_token']
+        self.credentials.refresh_token = tokens.get('refresh_token', self.credentials.refresh_token)
+        expires_in = tokens.get('expires_in')
+        self.credentials.expires_at = time.time() + expires_in if expires_in is not None else None
+        if self.token_store is not None:
+            self.token_store.save(self._token_key(), self.credentials.access_token,
+                                  self.credentials.refresh_token, self.credentials.expires_at)
+
+    def _token_key(self) -> str:
+        return OGSTokenStore.key(self.base_url, self.credentials.client_id, self.credentials.username)
+
+    def _load_tokens(self) -> bool:
+        """Load tokens from the token store, returns whether the stored access token is still valid"""
+        if self.token_store is None:
+            return False
+        tokens = self.token_store.load(self._token_key())
+        if not tokens:
+            return False
+        self.credentials.refresh_token = tokens.get('refresh_token') or self.credentials.refresh_token
+        expires_at = tokens.get('expires_at')
+        if tokens.get('access_token') is None or expires_at is None or expires_at - self.TOKEN_EXPIRY_MARGIN < time.time():
+            return False
+        self.credentials.access_token = tokens['access_token']
+        self.credentials.expires_at = expires_at
+        return True
+
+    def _token_expired(self) -> bool:
+        expires_at = self.credentials.expires_at
+        return expires_at is not None and expires_at - self.TOKEN_EXPIRY_MARGIN < time.time()
+
+    def _reauthenticate(self, stale_token: str | None) -> bool:
+        """Replace an expired or rejected access token, returns whether there is a new one to retry with"""
+        with self._auth_lock:
+            # Another thread already replaced the token
+            if self.credentials.access_token != stale_token:
+                return True
+            if self.refresh_access_token():
+                return True
+            if self.credentials.password is None:
+                return False
+            try:
+                self._password_grant()
+            except OGSApiException as e:
+                logger.error(f"Re-authenticating failed: {e}")
+                return False
+            return True
+
     def call_rest_endpoint(self, method: str, endpoint: str, params: dict | None = None, payload: dict | None = None) -> requests.Response:
         """Make a request to the OGS REST API.
         
@@ -91,13 +272,21 @@ class OGSRestAPI:
             
         Returns:
             response (Callable): Returns the request response
+
+        Raises:
+            OGSApiException: If the request fails, or the server responds with an error. Requests still
+                throttled after the rate limiter's retries raise with the 429 status
         """
         method = method.upper()
         url = f'{self.base_url}api/{self.api_ver}{endpoint}'
         
+        token = None
         if self.is_authed:
+            if self._token_expired():
+                self._reauthenticate(self.credentials.access_token)
+            token = self.credentials.access_token
             headers = {
-                'Authorization' : f'Bearer {self.credentials.access_token}',
+                'Authorization' : f'Bearer {token}',
                 'Content-Type': 'application/json'
             }
         else:
@@ -109,28 +298,135 @@ class OGSRestAPI:
         if method not in ['GET', 'POST', 'PUT', 'DELETE']:
             raise OGSApiException(f"Invalid HTTP Method, Got: {method}. Expected: GET, POST, PUT, DELETE")
 
-        # Add payload if method is POST or PUT
-        logger.debug(f"Making {method} request to {url}")
-        if method in ['POST', 'PUT']:
-            try:
-                response = requests.request(method, url, headers=headers, params=params, json=payload, timeout=20)
-            except requests.exceptions.RequestException as e:
-                raise OGSApiException(f"{method} Failed") from e
-        else:
-            try:
-                response = requests.request(method, url, headers=headers, params=params, timeout=20)
-            except requests.exceptions.RequestException as e:
-                raise OGSApiException(f"{method} Failed") from e
+        if method == 'GET' and self.cache is not None:
+            cached = self.cache.lookup(endpoint, params)
+            if cached is not None:
+                logger.debug(f"Using cached response for {url}")
+                return self._copy_response(cached)
+
+        if method != 'GET' or not self.coalesce_requests:
+            return self._fetch(method, endpoint, url, headers, params, payload, token)
+
+        # Identical GETs in flight at the same time share a single request
+        key = (url, tuple(sorted((str(k), repr(v)) for k, v in (params or {}).items())), token)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._inflight[key] = Future()
+        if not leader:
+            logger.debug(f"Joining in-flight request to {url}")
+            return self._copy_response(future.result())
+
+        try:
+            response = self._fetch(method, endpoint, url, headers, params, payload, token)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        future.set_result(response)
+        return response
+
+    def _fetch(self, method: str, endpoint: str, url: str, headers: dict, params: dict | None,
+               payload: dict | None, token: str | None) -> requests.Response:
+        """Send a request, renewing the access token if it was rejected, and update the cache with the result"""
+        endpoint_class = self.rate_limiter.classify(method, endpoint)
+        response = self._send(method, url, headers, params, payload, endpoint_class)
+
+        # Retry once with a new token if the access token was rejected
+        if response.status_code == 401 and self.is_authed and self._reauthenticate(token):
+            logger.info(f"Access token rejected by {url}, retrying with new token")
+            headers['Authorization'] = f'Bearer {self.credentials.access_token}'
+            response = self._send(method, url, headers, params, payload, endpoint_class)
 
         if 299 >= response.status_code >= 200:
+            if self.cache is not None:
+                if method == 'GET':
+                    self.cache.store(endpoint, params, response)
+                else:
+                    self.cache.invalidate(endpoint)
             return response
 
         raise OGSApiException(f"{response.status_code}: {response.reason}")
 
+    @staticmethod
+    def _copy_response(response: requests.Response) -> requests.Response:
+        """Shallow copy a shared response with its own headers, so callers can't modify each other's response"""
+        duplicate = copy.copy(response)
+        duplicate.headers = response.headers.copy()
+        return duplicate
+
+    def _send(self, method: str, url: str, headers: dict, params: dict | None, payload: dict | None,
+              endpoint_class: str) -> requests.Response:
+        """Send a request through the rate limiter, retrying idempotent requests that were throttled"""
+        attempt = 0
+        while True:
+            waited = self.rate_limiter.acquire(endpoint_class)
+            if waited:
+                logger.debug(f"Waited {waited:.3f}s for {endpoint_class} rate limit")
+            response = self._request(method, url, headers, params, payload)
+            if response.status_code != 429:
+                return response
+
+            # The rate limiter holds back the next request until the Retry-After or backoff has passed
+            delay = self.rate_limiter.throttled(endpoint_class, attempt, response.headers.get('Retry-After'))
+            if method not in OGSRateLimiter.IDEMPOTENT_METHODS or attempt >= self.rate_limiter.max_retries:
+                return response
+            attempt += 1
+            logger.info(f"Retrying {method} request to {url} in {delay:.2f}s, attempt {attempt}")
+
+    def _request(self, method: str, url: str, headers: dict, params: dict | None, payload: dict | None) -> requests.Response:
+        """Send a single request, holding one of the concurrent request slots of the rate limiter"""
+        with self.rate_limiter.slot():
+            # Add payload if method is POST or PUT
+            logger.debug(f"Making {method} request to {url}")
+            if method in ['POST', 'PUT']:
+                try:
+                    return self.session.request(method, url, headers=headers, params=params, json=payload, timeout=20)
+                except requests.exceptions.RequestException as e:
+                    raise OGSApiException(f"{method} Failed") from e
+            else:
+                try:
+                    return self.session.request(method, url, headers=headers, params=params, timeout=20)
+                except requests.exceptions.RequestException as e:
+                    raise OGSApiException(f"{method} Failed") from e
+
     @logger.catch
     def get_auth_data(self) -> None:
         """Get the auth data from the OGS API and save it to the credentials object for use in the socket connection."""
         logger.info("Getting auth data from OGS API")
         auth_data = self.call_rest_endpoint('GET', '/ui/config').json()
         self.credentials.chat_auth = auth_data['chat_auth']
-        self.credentials.user_jwt = auth_data['user_jwt']
\ No newline at end of file
+        self.credentials.user_jwt = auth_data['user_jwt']
+
+    @logger.catch
+    def get_user_id(self) -> None:
+        """Get the ID of the authenticated user from the OGS API and save it to the credentials object."""
+        logger.info("Getting user ID from OGS API")
+        self.credentials.user_id = self.call_rest_endpoint('GET', '/me').json()['id']
+
+    def ensure_user_id(self) -> None:
+        """Get the ID of the authenticated user if it isn't known yet."""
+        if self.credentials.user_id is None:
+            self.get_user_id()
+
+    def ensure_auth_data(self) -> None:
+        """Get whichever of the socket auth data and user ID aren't known yet.
+
+        Both are independent requests, so when both are missing they are made concurrently.
+        """
+        fetches = []
+        if self.credentials.chat_auth is None or self.credentials.user_jwt is None:
+            fetches.append(self.get_auth_data)
+        if self.credentials.user_id is None:
+            fetches.append(self.get_user_id)
+
+        if len(fetches) == 2:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="ogsapi-auth") as executor:
+                future = executor.submit(fetches[0])
+                fetches[1]()
+                future.result()
+        elif fetches:
+            fetches[0]()
@@ -0,0 +1,205 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from typing import Any, Callable, Hashable
+
+class OGSEventRouter:
+    """Routes socket events to the handlers registered for them.
+
+    Handlers are registered per event, for a single game, for every game with `ANY_GAME`, or for
+    socket level events with a game ID of None. Registering for the `ALL` event makes a catch-all
+    handler, which is called with the event name as well. The handlers of every (game ID, event)
+    pair are precomputed when registering, so routing an event is a dict lookup, and events
+    nobody registered for can be dropped before doing any other work. Registering for a single game
+    only recomputes the pairs of that game, so connecting many games stays linear.
+
+    Examples:
+        >>> router = OGSEventRouter()
+        >>> @router.on('move', game_id=1234)
+        ... def on_move(data):
+        ...     print(data['move'])
+
+    Attributes:
+        ALL (str): Event name to register catch-all handlers with, called with `event_name` and `data`
+        ANY_GAME (str): Game ID to register handlers for the events of every game with
+    """
+
+    ALL = '*'
+    ANY_GAME = '*'
+
+    def __init__(self) -> None:
+        self._handlers: dict[tuple[Hashable, str], list[Callable]] = {}
+        self._events: dict[Hashable, set[str]] = {}
+        self._table: dict[tuple[Hashable, str], tuple[tuple[Callable, bool], ...]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, event: str, handler: Callable, game_id: Hashable = None) -> Callable:
+        """Register a handler for an event.
+
+        Args:
+            event (str): Event to handle, EX: 'move', or `ALL` to handle every event
+            handler (Callable): Called with the event data, or with `event_name` and `data` for `ALL`
+            game_id (Hashable, optional): Game to handle the event of, `ANY_GAME` for every game, or None
+                for socket level events. Defaults to None.
+
+        Returns:
+            handler (Callable): The registered handler
+        """
+        with self._lock:
+            self._handlers.setdefault((game_id, event), []).append(handler)
+            self._events.setdefault(game_id, set()).add(event)
+            self._update(game_id)
+        return handler
+
+    def unregister(self, event: str, handler: Callable, game_id: Hashable = None) -> None:
+        """Remove a registered handler, does nothing if it isn't registered.
+
+        Args:
+            event (str): Event the handler was registered for
+            handler (Callable): The registered handler
+            game_id (Hashable, optional): Game the handler was registered for. Defaults to None.
+        """
+        with self._lock:
+            handlers = self._handlers.get((game_id, event), [])
+            if handler in handlers:
+                handlers.remove(handler)
+                if not handlers:
+                    del self._handlers[(game_id, event)]
+                    self._forget(game_id, event)
+                self._update(game_id, {event})
+
+    def clear(self, game_id: Hashable = None) -> None:
+        """Remove every handler registered for a game.
+
+        Args:
+            game_id (Hashable, optional): Game to remove the handlers of, None for socket level events. Defaults to None.
+        """
+        with self._lock:
+            events = self._events.pop(game_id, set())
+            for event in events:
+                del self._handlers[(game_id, event)]
+            self._update(game_id, events)
+
+    def on(self, event: str, game_id: Hashable = None) -> Callable[[Callable], Callable]:
+        """Decorator to register a handler for an event. See `register()`.
+
+        Args:
+            event (str): Event to handle
+            game_id (Hashable, optional): Game to handle the event of. Defaults to None.
+
+        Returns:
+            decorator (Callable): Decorator registering the function
+        """
+        def decorator(handler: Callable) -> Callable:
+            return self.register(event, handler, game_id)
+        return decorator
+
+    def _forget(self, game_id: Hashable, event: str) -> None:
+        events = self._events.get(game_id)
+        if events is not None:
+            events.discard(event)
+            if not events:
+                del self._events[game_id]
+
+    def _update(self, game_id: Hashable, removed: set[str] | None = None) -> None:
+        """Recompute the pairs affected by a change to the handlers of a game"""
+        if game_id is None or game_id == self.ANY_GAME:
+            # Handlers for every game change the pairs of every game
+            self._rebuild()
+        else:
+            self._rebuild_game(game_id, removed or set())
+
+    def _rebuild(self) -> None:
+        """Precompute the handlers of every registered (game ID, event) pair"""
+        table: dict[tuple[Hashable, str], tuple[tuple[Callable, bool], ...]] = {}
+        for game_id in set(self._events) | {self.ANY_GAME}:
+            for event in self._game_events(game_id):
+                handlers = self._game_handlers(game_id, event)
+                if handlers:
+                    table[(game_id, event)] = handlers
+        self._table = table
+
+    def _rebuild_game(self, game_id: Hashable, removed: set[str]) -> None:
+        """Precompute the handlers of the pairs of a single game"""
+        table = self._table
+        events = self._game_events(game_id)
+        for event in events:
+            handlers = self._game_handlers(game_id, event)
+            if handlers:
+                table[(game_id, event)] = handlers
+            else:
+                table.pop((game_id, event), None)
+        for event in removed - events:
+            table.pop((game_id, event), None)
+
+    def _game_events(self, game_id: Hashable) -> set[str]:
+        """Events to precompute the pairs of a game for.
+
+        Looking up any other event falls back to the catch-all pair of the game, which holds the same handlers.
+        """
+        events = self._events.get(game_id, set()) | {self.ALL}
+        if game_id is not None:
+            events |= self._events.get(self.ANY_GAME, set())
+        return events
+
+    def _game_handlers(self, game_id: Hashable, event: str) -> tuple[tuple[Callable, bool], ...]:
+        handlers = self._collect(game_id, event)
+        if game_id is not None and game_id != self.ANY_GAME:
+            handlers += self._collect(self.ANY_GAME, event)
+        return tuple(handlers)
+
+    def _collect(self, game_id: Hashable, event: str) -> list[tuple[Callable, bool]]:
+        handlers = []
+        if event != self.ALL:
+            handlers += [(handler, False) for handler in self._handlers.get((game_id, event), [])]
+        handlers += [(handler, True) for handler in self._handlers.get((game_id, self.ALL), [])]
+        return handlers
+
+    def handlers(self, game_id: Hashable, event: str) -> tuple[tuple[Callable, bool], ...]:
+        """Get the handlers of an event.
+
+        Args:
+            game_id (Hashable): Game the event belongs to, None for socket level events
+            event (str): Name of the event
+
+        Returns:
+            handlers (tuple): Pairs of a handler and whether it is a catch-all handler, empty if there are none
+        """
+        table = self._table
+        found = table.get((game_id, event))
+        if found is None:
+            found = table.get((game_id, self.ALL))
+            if found is None and game_id is not None:
+                found = table.get((self.ANY_GAME, event)) or table.get((self.ANY_GAME, self.ALL))
+        return found or ()
+
+    def route(self, game_id: Hashable, event: str, data: Any) -> bool:
+        """Call the handlers of an event.
+
+        Args:
+            game_id (Hashable): Game the event belongs to, None for socket level events
+            event (str): Name of the event
+            data (Any): Data of the event
+
+        Returns:
+            handled (bool): Whether there were any handlers for the event
+        """
+        handlers = self.handlers(game_id, event)
+        for handler, catch_all in handlers:
+            if catch_all:
+                handler(event_name=event, data=data)
+            else:
+                handler(data)
+        return bool(handlers)
@@ -13,45 +13,109 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 
-from typing import Callable
-from time import sleep, time
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable
+from time import time
+import threading
 import socketio # type: ignore[import]
 from loguru import logger
 from .ogs_api_exception import OGSApiException
 from .ogscredentials import OGSCredentials
 from .ogsgame import OGSGame
+from .ogsdispatcher import OGSEventDispatcher
+from .ogsrouter import OGSEventRouter
+from .ogslatency import OGSLatencyEstimator
+from .ogspositionindex import OGSPositionIndex
 
 class OGSSocket:
     """OGS Socket Class for handling SocketIO connections to OGS
     
     Args:
         credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
-        debug (bool, optional): Enable debug logging. Defaults to False.
+        reconnect (bool, optional): Automatically reconnect when the connection drops. Defaults to True.
+        reconnect_delay (float, optional): Delay before the first reconnection attempt, doubling with each
+            failed attempt. Defaults to 1.
+        reconnect_delay_max (float, optional): Maximum delay between reconnection attempts. Defaults to 30.
+        reconnect_attempts (int, optional): Maximum number of reconnection attempts, 0 to keep trying forever. Defaults to 0.
+        reconnect_jitter (float, optional): Maximum number of seconds randomly added to or removed from each
+            delay, so many clients don't reconnect at the same moment. Defaults to 0.5.
+        auth_refresher (Callable, optional): Called before authenticating again after reconnecting, to refresh
+            the tokens in the credentials. Defaults to None.
+            Reconnection attempts send the access token the credentials held when the connection was lost.
+            An access token that expired in the meantime is only replaced by the refresher once reconnected,
+            the server authenticating the socket with the `authenticate` event instead of the header.
+        dispatcher (OGSEventDispatcher, optional): Dispatcher handing events to the callback handlers on
+            worker threads, instead of calling them on the socket thread. Defaults to None.
+        auto_unsubscribe (bool, optional): Disconnect and unsubscribe from games once they are finished. Defaults to True.
+        router (OGSEventRouter, optional): Router to register the handlers with, to share it between sockets.
+            Defaults to a new router.
+        socket_events (bool, optional): Send socket level events to the handlers, not only game events. Defaults to True.
+        heartbeat_interval (float, optional): Seconds between pings sent in the background while connected,
+            None to only ping when `ping()` is called. Defaults to None.
+        latency (OGSLatencyEstimator, optional): Estimator smoothing the latency and drift of the pings.
+            Defaults to a new estimator.
+        position_index (OGSPositionIndex, optional): Index to add the positions of every game to. Defaults to None.
     
     Attributes:
-        clock_drift (float): The clock drift of the socket
-        clock_latency (float): The clock latency of the socket
-        last_ping (int): The last ping time of the socket
-        last_issued_ping (int): The last time a ping was issued
+        clock_drift (float): The smoothed clock drift of the socket
+        clock_latency (float): The smoothed clock latency of the socket
+        last_ping (float): The last time a pong was received
+        last_issued_ping (float): The last time a ping was issued
+        latency (OGSLatencyEstimator): Estimator the latency and drift of every pong are added to
+        heartbeat_interval (float | None): Seconds between the background pings, None if disabled
+        position_index (OGSPositionIndex | None): Index the positions of every game are added to, None if disabled
         games (dict[OGSGame]): A dict of connected game objects
-        client_callbacks (dict): A dict of socket level callbacks
+        callback_handler (Callable | None): Callback handler receiving every socket level event
+        router (OGSEventRouter): Router the handlers of the socket and its games are registered with
         credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
         socket (socketio.Client): The socketio client object
+        auth_refresher (Callable | None): Called to refresh the credentials before authenticating after a reconnect
+        reconnects (int): Number of times the socket reconnected
+        dispatcher (OGSEventDispatcher | None): Dispatcher the events are handed to, None if disabled
+        auto_unsubscribe (bool): Whether games are disconnected and unsubscribed from once they are finished
+        ready (Future): Resolved once the server confirmed authentication. Replaced with a new future
+            when the connection drops
+        socket_events (bool): Whether socket level events are sent to the handlers
+        on_connection_change (Callable | None): Called with the socket and whether it is connected when
+            the connection is made or lost
         
     """
 
-    def __init__(self, credentials: OGSCredentials):
+    def __init__(self, credentials: OGSCredentials, reconnect: bool = True, reconnect_delay: float = 1,
+                 reconnect_delay_max: float = 30, reconnect_attempts: int = 0, reconnect_jitter: float = 0.5,
+                 auth_refresher: Callable[[], None] | None = None, dispatcher: OGSEventDispatcher | None = None,
+                 auto_unsubscribe: bool = True, router: OGSEventRouter | None = None, socket_events: bool = True,
+                 heartbeat_interval: float | None = None, latency: OGSLatencyEstimator | None = None,
+                 position_index: OGSPositionIndex | None = None):
         # Clock Settings
         self.clock_drift = 0.0
         self.clock_latency = 0.0
         self.last_ping = 0.0
-        self.last_issued_ping = 0
+        self.last_issued_ping = 0.0
+        self.latency = latency if latency is not None else OGSLatencyEstimator()
+        self.heartbeat_interval = heartbeat_interval
+        self._heartbeat: threading.Thread | None = None
+        self._heartbeat_stop = threading.Event()
         # Dict of connected game objects
         self.games: dict[int, OGSGame] = {}
         # Socket level callbacks
-        self.callback_handler = lambda event_name, data: None
+        self.router = router if router is not None else OGSEventRouter()
+        self.socket_events = socket_events
+        self.on_connection_change: Callable[['OGSSocket', bool], None] | None = None
+        self._callback_handler: Callable | None = None
         self.credentials = credentials
-        self.socket = socketio.Client()
+        self.auth_refresher = auth_refresher
+        self.dispatcher = dispatcher
+        self.auto_unsubscribe = auto_unsubscribe
+        self.position_index = position_index
+        self.reconnects = 0
+        self._connected_before = False
+        self._auth_ping: int | None = None
+        self.ready: Future = Future()
+        # socketio doubles the delay after every failed attempt, and adds the jitter to each delay
+        self.socket = socketio.Client(reconnection=reconnect, reconnection_attempts=reconnect_attempts,
+                                      reconnection_delay=reconnect_delay, reconnection_delay_max=reconnect_delay_max,
+                                      randomization_factor=reconnect_jitter)
 
     def __del__(self):
         self.disconnect()
@@ -66,28 +130,110 @@ class OGSSocket:
         logger.disable("engineio.client")
         logger.disable("socketio.client")
 
-    @logger.catch
-    def connect(self) -> None:
-        """Connect to the socket"""
+    def connect(self, wait: bool = True, timeout: float | None = 10) -> Future:
+        """Connect to the socket
+
+        Examples:
+            >>> ready = sock.connect(wait=False)
+            >>> ready.add_done_callback(lambda _: sock.game_connect(game_id))
+
+        Args:
+            wait (bool, optional): Block until the server confirmed authentication. Defaults to True.
+            timeout (float, optional): Seconds to wait for the authentication when blocking, None to
+                wait forever. Defaults to 10.
+
+        Returns:
+            ready (Future): Resolved once the server confirmed authentication
+
+        Raises:
+            OGSApiException: If connecting fails, or authentication isn't confirmed within the timeout
+        """
         self.socket_callbacks()
         logger.info("Connecting to Websocket")
         try:
-            self.socket.connect('https://online-go.com/socket.io/?EIO=4', transports='websocket', headers={"Authorization" : f"Bearer {self.credentials.access_token}"})
+            self.socket.connect('https://online-go.com/socket.io/?EIO=4', transports='websocket', headers=self._connection_headers())
         except Exception as e:
             raise OGSApiException("Failed to connect to OGS Websocket") from e
+        if self.heartbeat_interval is not None:
+            self.start_heartbeat(self.heartbeat_interval)
+        if wait:
+            self.wait_ready(timeout)
+        return self.ready
+
+    def _connection_headers(self) -> dict[str, str]:
+        """Headers sent when connecting, reused by socketio for every reconnection attempt"""
+        return {"Authorization" : f"Bearer {self.credentials.access_token}"}
+
+    def wait_ready(self, timeout: float | None = 10) -> None:
+        """Block until the server confirmed authentication.
+
+        Args:
+            timeout (float, optional): Seconds to wait, None to wait forever. Defaults to 10.
+
+        Raises:
+            OGSApiException: If authentication isn't confirmed within the timeout
+        """
+        try:
+            self.ready.result(timeout)
+        except FutureTimeoutError as e:
+            raise OGSApiException(f"Authentication to OGS Websocket not confirmed within {timeout}s") from e
+
+    def _set_ready(self, data: Any = None) -> None:
+        """Resolve the ready future, if it hasn't been already"""
+        try:
+            self.ready.set_result(data)
+        except InvalidStateError:
+            return
+        logger.success("Authenticated to Websocket")
 
-    # def register_callback(self, event: str, callback: Callable):
-    #     """Register a callback function for receiving data from the API.
+    @property
+    def callback_handler(self) -> Callable | None:
+        """Callback handler receiving every socket level event, registered as a catch-all handler with the router"""
+        return self._callback_handler
+
+    @callback_handler.setter
+    def callback_handler(self, callback_handler: Callable | None) -> None:
+        if self._callback_handler is not None:
+            self.router.unregister(OGSEventRouter.ALL, self._callback_handler)
+        self._callback_handler = callback_handler
+        if callback_handler is not None:
+            self.router.register(OGSEventRouter.ALL, callback_handler)
+
+    def register_callback(self, event: str, callback: Callable, game_id: int | str | None = None) -> None:
+        """Register a callback function for receiving data from the API.
         
-    #     Args:
-    #         event (str): Event to register the callback function for.
-    #             Accepted events are:
-    #                 - notification
-    #                 - chat
-    #                 - error
-    #         callback (Callable): Callback function to register.   
-    #     """
-    #     self.client_callbacks[event]: OGSGame = callback
+        Args:
+            event (str): Event to register the callback function for.
+                Accepted events are:
+                    - notification
+                    - active_game
+                    - ERROR
+                    - disconnect
+                    - reconnect
+                    - any other event sent by the server
+                Or a game event when `game_id` is given, see [OGSGame.register_callback()](#src.ogsapi.ogsgame.OGSGame.register_callback)
+            callback (Callable): Callback function to register, called with the event data.
+            game_id (int | str, optional): Game to register the callback for, or `OGSEventRouter.ANY_GAME` for
+                every game. Defaults to None, registering for a socket level event.
+        """
+        self.router.register(event, callback, game_id)
+
+    def on(self, event: str, game_id: int | str | None = None) -> Callable[[Callable], Callable]:
+        """Decorator to register a callback function for an event. See `register_callback()`.
+
+        Examples:
+            >>> @sock.on('move', game_id=OGSEventRouter.ANY_GAME)
+            ... def on_move(data):
+            ...     print(data['game_id'], data['move'])
+
+        Args:
+            event (str): Event to register the callback function for.
+            game_id (int | str, optional): Game to register the callback for. Defaults to None.
+
+        Returns:
+            decorator (Callable): Decorator registering the function
+        """
+        return self.router.on(event, game_id)
 
     # Listens to events received from the socket via the decorators, and calls the appropriate function
     def socket_callbacks(self) -> None:
@@ -97,9 +243,35 @@ class OGSSocket:
         def authenticate() -> None:
             """Authenticate to the socket"""
             logger.success("Connected to Websocket, authenticating")
-            self.socket.emit(event="authenticate", data={"auth": self.credentials.chat_auth, "player_id": self.credentials.user_id, "username": self.credentials.username, "jwt": self.credentials.user_jwt})
-            sleep(1)
-            logger.success("Authenticated to Websocket")
+            reconnected = self._connected_before
+            self._connected_before = True
+            if reconnected and self.auth_refresher is not None:
+                self.auth_refresher()
+                self.socket.connection_headers = self._connection_headers()
+            self.socket.emit(event="authenticate", data={"auth": self.credentials.chat_auth, "player_id": self.credentials.user_id, "username": self.credentials.username, "jwt": self.credentials.user_jwt},
+                             callback=self._set_ready)
+            # Events are handled in order, so the pong of a ping sent after the authenticate also confirms it.
+            # Pongs of pings sent before it, e.g. by the heartbeat, carry an older client timestamp
+            self._auth_ping = int(time() * 1000)
+            self.ping()
+            # Game connects are handled after the authenticate as well, no need to wait for it
+            if reconnected:
+                self._resync()
+            if self.on_connection_change is not None:
+                self.on_connection_change(self, True)
+
+        @self.socket.on('disconnect')
+        def on_disconnect() -> None:
+            """Called when the connection to the socket is lost or closed"""
+            logger.warning("Disconnected from Websocket")
+            self._auth_ping = None
+            # socketio starts reconnecting after this handler, pick up tokens refreshed by the REST API since connecting
+            self.socket.connection_headers = self._connection_headers()
+            if self.ready.done():
+                self.ready = Future()
+            self._send_event("disconnect", {"games": list(self.games)})
+            if self.on_connection_change is not None:
+                self.on_connection_change(self, False)
         
         @self.socket.on('hostinfo')
         def on_hostinfo(data) -> None:
@@ -112,34 +284,60 @@ class OGSSocket:
             now = time() * 1000
             latency = now - data["client"]
             drift = ((now - latency / 2) - data["server"])
-            self.clock_latency = latency / 1000
-            self.clock_drift = drift / 1000
+            if not self.latency.add(latency / 1000, drift / 1000):
+                logger.debug(f"Ignoring outlier ping latency of {latency}ms")
+            self.clock_latency = self.latency.latency
+            self.clock_drift = self.latency.drift
             self.last_ping = now / 1000
             logger.debug(f"Got Pong: {data}")
+            if self._auth_ping is not None and data["client"] >= self._auth_ping:
+                self._set_ready()
         
         @self.socket.on('active_game')
         def on_active_game(data) -> None:
             """Called when an active game is received on the socket"""
-            logger.debug(f"Got Active Game: {data}")
-            self.callback_handler(event_name="active_game", data=data)
+            self._send_event("active_game", data)
 
         @self.socket.on('notification')
         def on_notification(data) -> None:
             """Called when a notification is received on the socket"""
-            logger.debug(f"Got Notification: {data}")
-            self.callback_handler(event_name="notification", data=data)
+            self._send_event("notification", data)
 
         @self.socket.on('ERROR')
         def on_error(data) -> None:
             """Called when an error is received from the server"""
             logger.error(f"Got Error: {data}")
-            self.callback_handler(event_name="ERROR", data=data)
+            self._send_event("ERROR", data)
 
         @self.socket.on('*')
         def catch_all(event, data) -> None:
             """Catch all for events"""
-            logger.debug(f"Got Event: {event} with data: {data}")
-            self.callback_handler(event_name=event, data=data)
+            self._send_event(event, data)
+
+    def _send_event(self, event_name: str, data: Any) -> None:
+        """Send a socket level event to its handlers, through the dispatcher if there is one.
+
+        Events without handlers are dropped before any other work.
+        """
+        if not self.socket_events or not self.router.handlers(None, event_name):
+            return
+        logger.debug(f"Got Event: {event_name} with data: {data}")
+        if self.dispatcher is not None:
+            self.dispatcher.dispatch(None, self._route, event_name, data)
+        else:
+            self._route(event_name, data)
+
+    def _route(self, event_name: str, data: Any) -> None:
+        self.router.route(None, event_name, data)
+
+    def _resync(self) -> None:
+        """Resubscribe to every tracked game after reconnecting"""
+        self.reconnects += 1
+        logger.success(f"Reconnected to Websocket, resubscribing to {len(self.games)} games")
+        for game in list(self.games.values()):
+            # The server answers game/connect with the current gamedata and clock
+            game.connect()
+        self._send_event("reconnect", {"games": list(self.games), "reconnects": self.reconnects})
 
     # Get info on connected server
     def host_info(self) -> None:
@@ -151,7 +349,45 @@ class OGSSocket:
     def ping(self) -> None:
         """Ping the socket"""
         logger.info("Pinging Websocket")
-        self.socket.emit(event="net/ping", data={"client": int(time() * 1000), "drift": self.clock_drift, "latency": self.clock_latency})
+        self.last_issued_ping = time()
+        self.socket.emit(event="net/ping", data={"client": int(self.last_issued_ping * 1000), "drift": self.clock_drift, "latency": self.clock_latency})
+
+    def start_heartbeat(self, interval: float = 10) -> None:
+        """Ping the socket in the background at a fixed interval while connected
+
+        Args:
+            interval (float, optional): Seconds between the pings. Defaults to 10.
+        """
+        self.heartbeat_interval = interval
+        if self._heartbeat is not None and self._heartbeat.is_alive():
+            return
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="ogs-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def stop_heartbeat(self) -> None:
+        """Stop the background pings"""
+        self._heartbeat_stop.set()
+        if self._heartbeat is not None and self._heartbeat is not threading.current_thread():
+            self._heartbeat.join()
+        self._heartbeat = None
+
+    def _heartbeat_loop(self) -> None:
+        while not self._heartbeat_stop.wait(self.heartbeat_interval):
+            if not self.socket.connected:
+                continue
+            try:
+                self.ping()
+            except Exception as e:
+                logger.warning(f"Heartbeat ping failed: {e}")
+
+    def latency_stats(self) -> dict:
+        """Get the smoothed latency and drift, and percentiles of the recent ping latencies
+
+        Returns:
+            stats (dict): See `OGSLatencyEstimator.stats()`
+        """
+        return self.latency.stats()
     
     def notification_connect(self) -> None:
         """Connect to the notification socket"""
@@ -171,17 +407,64 @@ class OGSSocket:
             callback_handler (Callable, optional): The callback handler for the game. Defaults to the callback_handler of the socket.
             
         Returns:
-            OGSGame (OGSGame): The game object
+            OGSGame (OGSGame): The game object, the existing one if already connected to the game
         """
+        if game_id in self.games:
+            logger.info(f"Already connected to Game {game_id}")
+            if callback_handler is not None:
+                self.games[game_id].callback_handler = callback_handler
+            return self.games[game_id]
+
         logger.info(f"Connecting to Game {game_id}")
         if callback_handler is None:
             callback_handler = self.callback_handler
-        self.games[game_id] = OGSGame(game_socket=self.socket, game_id=game_id, credentials=self.credentials, callback_handler=callback_handler)
+        self.games[game_id] = OGSGame(game_socket=self.socket, game_id=game_id, credentials=self.credentials, callback_handler=callback_handler,
+                                      router=self.router, dispatcher=self.dispatcher, auto_unsubscribe=self.auto_unsubscribe,
+                                      position_index=self.position_index)
+        self.games[game_id].on_unsubscribe = self._forget_game
         logger.success(f"Connected to Game {game_id}")
         logger.debug(f"{self.games[game_id]}")
 
         return self.games[game_id]
 
+    def game_connect_many(self, game_ids: Iterable[int], callback_handler: Callable | None = None) -> dict[int, OGSGame]:
+        """Connect to many games at once.
+
+        The handlers of every game are registered first, then the game/connect emits are sent back to back.
+        Each game has a `ready` future, resolved once its first gamedata and clock have been applied.
+
+        Examples:
+            >>> games = sock.game_connect_many(game_ids)
+            >>> for ready in concurrent.futures.as_completed(game.ready for game in games.values()):
+            ...     game = ready.result()
+
+        Args:
+            game_ids (Iterable[int]): The ids of the games to connect to
+            callback_handler (Callable, optional): The callback handler for the games. Defaults to the callback_handler of the socket.
+
+        Returns:
+            games (dict[int, OGSGame]): The game objects by game id, including games that were already connected
+        """
+        if callback_handler is None:
+            callback_handler = self.callback_handler
+        games = {}
+        new_games = []
+        for game_id in game_ids:
+            if game_id in self.games:
+                games[game_id] = self.game_connect(game_id, callback_handler)
+                continue
+            game = OGSGame(game_socket=self.socket, game_id=game_id, credentials=self.credentials, callback_handler=callback_handler,
+                           router=self.router, dispatcher=self.dispatcher, auto_unsubscribe=self.auto_unsubscribe,
+                           position_index=self.position_index, connect=False)
+            game.on_unsubscribe = self._forget_game
+            self.games[game_id] = games[game_id] = game
+            new_games.append(game)
+
+        logger.info(f"Connecting to {len(new_games)} Games")
+        for game in new_games:
+            game.connect()
+        return games
+
     def game_disconnect(self, game_id: int) -> None:
         """Disconnect from a game
         
@@ -189,10 +472,43 @@ class OGSSocket:
             game_id (int): The id of the game to disconnect from
         """
         logger.info(f"Disconnecting from Game {game_id}")
-        del self.games[game_id]
+        game = self.games[game_id]
+        game.disconnect()
+        game.unsubscribe()
+
+    def adopt_game(self, game: OGSGame) -> None:
+        """Move a game connected through another socket to this socket, keeping its handlers and state.
+
+        The game should already be removed from the `games` of the other socket.
+
+        Args:
+            game (OGSGame): The game to move
+        """
+        logger.info(f"Moving Game {game.game_data.game_id} to this socket")
+        game.rebind(self.socket)
+        game.on_unsubscribe = self._forget_game
+        self.games[game.game_data.game_id] = game
+
+    def _forget_game(self, game: OGSGame) -> None:
+        """Stop tracking a game once it unsubscribed"""
+        if self.games.get(game.game_data.game_id) is game:
+            del self.games[game.game_data.game_id]
+
+    @property
+    def live_games(self) -> int:
+        """Number of games connected to"""
+        return len(self.games)
+
+    @property
+    def registered_handlers(self) -> int:
+        """Number of event handlers registered with the socketio client"""
+        return sum(len(handlers) for handlers in self.socket.handlers.values())
 
     def disconnect(self) -> None:
-        """Disconnect from the socket"""
+        """Disconnect from the socket, unsubscribing from every game"""
         logger.info("Disconnecting from Websocket")
+        self.stop_heartbeat()
+        for game_id in list(self.games):
+            self.game_disconnect(game_id)
         self.socket.disconnect()
         
@@ -0,0 +1,258 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import bisect
+import hashlib
+import threading
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Iterable
+from loguru import logger
+from .ogs_api_exception import OGSApiException
+from .ogscredentials import OGSCredentials
+from .ogsdispatcher import OGSEventDispatcher
+from .ogsgame import OGSGame
+from .ogsrouter import OGSEventRouter
+from .ogssocket import OGSSocket
+
+class OGSSocketManager:
+    """Spreads games over several socket connections, presenting them as a single socket.
+
+    Games are assigned to the sockets with consistent hashing. When a socket loses its connection,
+    only its games are moved, each to the next connected socket on the hash ring. Games stay where
+    they are when the socket comes back, and new games are assigned to it again.
+
+    All sockets share a single event router, so handlers registered with the manager receive the
+    events of every game. Socket level events are only sent by the first socket, as every connection
+    of the user receives the same notifications. While the first socket is disconnected, another
+    connected socket sends them, until the first socket reconnects.
+
+    Examples:
+        >>> manager = OGSSocketManager(ogs.credentials, shards=4)
+        >>> manager.connect()
+        >>> @manager.on('move', game_id=OGSEventRouter.ANY_GAME)
+        ... def on_move(data):
+        ...     print(data['game_id'], data['move'])
+        >>> games = manager.game_connect_many(game_ids)
+
+    Args:
+        credentials (OGSCredentials): OGSCredentials object containing tokens for authentication to the Socket
+        shards (int, optional): Number of socket connections. Defaults to 4.
+        replicas (int, optional): Number of points per socket on the hash ring. More points spread
+            the games more evenly. Defaults to 64.
+        dispatcher (OGSEventDispatcher, optional): Dispatcher shared by the sockets. Defaults to None.
+        **socket_kwargs: Additional arguments for each OGSSocket, EX: `auth_refresher`
+
+    Attributes:
+        sockets (list[OGSSocket]): The socket connections
+        router (OGSEventRouter): Router shared by all sockets
+        callback_handler (Callable | None): Callback handler receiving every socket level event and
+            the events of games connected without their own callback handler
+    """
+
+    def __init__(self, credentials: OGSCredentials, shards: int = 4, replicas: int = 64,
+                 dispatcher: OGSEventDispatcher | None = None, **socket_kwargs: Any):
+        if shards < 1:
+            raise OGSApiException(f"Need at least one shard, Got: {shards}")
+        self.router = OGSEventRouter()
+        self.sockets = [
+            OGSSocket(credentials, dispatcher=dispatcher, router=self.router, socket_events=(shard == 0), **socket_kwargs)
+            for shard in range(shards)
+        ]
+        self._connected = [False] * shards
+        self._closing = False
+        self._lock = threading.RLock()
+        self._callback_handler: Callable | None = None
+        self._events_shard = 0
+        self._ring = sorted((self._hash(f"{shard}:{replica}"), shard) for shard in range(shards) for replica in range(replicas))
+        self._ring_keys = [point for point, _ in self._ring]
+        for sock in self.sockets:
+            sock.on_connection_change = self._connection_changed
+
+    @staticmethod
+    def _hash(value: Any) -> int:
+        """Hash that is stable between processes, unlike hash()"""
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+    @property
+    def callback_handler(self) -> Callable | None:
+        """Callback handler receiving every socket level event"""
+        return self._callback_handler
+
+    @callback_handler.setter
+    def callback_handler(self, callback_handler: Callable | None) -> None:
+        # Only one socket sends socket level events
+        self.sockets[self._events_shard].callback_handler = callback_handler
+        self._callback_handler = callback_handler
+
+    @property
+    def games(self) -> dict[int, OGSGame]:
+        """All connected games, by game id"""
+        games: dict[int, OGSGame] = {}
+        for sock in self.sockets:
+            games.update(sock.games)
+        return games
+
+    @property
+    def live_games(self) -> int:
+        """Number of games connected to"""
+        return sum(sock.live_games for sock in self.sockets)
+
+    @property
+    def registered_handlers(self) -> int:
+        """Number of event handlers registered with the socketio clients"""
+        return sum(sock.registered_handlers for sock in self.sockets)
+
+    def register_callback(self, event: str, callback: Callable, game_id: int | str | None = None) -> None:
+        """Register a callback function for an event of any socket. See [OGSSocket.register_callback()](#src.ogsapi.ogssocket.OGSSocket.register_callback)"""
+        self.router.register(event, callback, game_id)
+
+    def on(self, event: str, game_id: int | str | None = None) -> Callable[[Callable], Callable]:
+        """Decorator to register a callback function for an event of any socket. See [OGSSocket.on()](#src.ogsapi.ogssocket.OGSSocket.on)"""
+        return self.router.on(event, game_id)
+
+    def connect(self, wait: bool = True, timeout: float | None = 10) -> None:
+        """Connect all sockets, authenticating them concurrently.
+
+        Args:
+            wait (bool, optional): Block until every socket is authenticated. Defaults to True.
+            timeout (float, optional): Seconds to wait for the authentication. Defaults to 10.
+
+        Raises:
+            OGSApiException: If a socket is not authenticated within the timeout
+        """
+        self._closing = False
+        ready = [sock.connect(wait=False) for sock in self.sockets]
+        if not wait:
+            return
+        _, not_done = wait_futures(ready, timeout=timeout)
+        if not_done:
+            raise OGSApiException(f"{len(not_done)} of {len(self.sockets)} sockets not authenticated within {timeout}s")
+
+    def disconnect(self) -> None:
+        """Disconnect all sockets, unsubscribing from every game"""
+        self._closing = True
+        for sock in self.sockets:
+            sock.disconnect()
+
+    def shard_for(self, game_id: int) -> OGSSocket:
+        """Get the socket a game is assigned to by the hash ring, skipping sockets that lost their connection.
+
+        Args:
+            game_id (int): The id of the game
+
+        Returns:
+            socket (OGSSocket): The socket to connect the game through
+        """
+        with self._lock:
+            start = bisect.bisect(self._ring_keys, self._hash(game_id))
+            for i in range(len(self._ring)):
+                shard = self._ring[(start + i) % len(self._ring)][1]
+                if self._connected[shard]:
+                    return self.sockets[shard]
+            # Nothing is connected, keep the game on its own socket until it reconnects
+            return self.sockets[self._ring[start % len(self._ring)][1]]
+
+    def socket_of(self, game_id: int) -> OGSSocket | None:
+        """Get the socket a game is connected through.
+
+        Args:
+            game_id (int): The id of the game
+
+        Returns:
+            socket (OGSSocket | None): The socket, None if not connected to the game
+        """
+        for sock in self.sockets:
+            if game_id in sock.games:
+                return sock
+        return None
+
+    def game_connect(self, game_id: int, callback_handler: Callable | None = None) -> OGSGame:
+        """Connect to a game through the socket it is assigned to. See [OGSSocket.game_connect()](#src.ogsapi.ogssocket.OGSSocket.game_connect)
+
+        Args:
+            game_id (int): The id of the game to connect to
+            callback_handler (Callable, optional): The callback handler for the game. Defaults to the callback_handler of the manager.
+
+        Returns:
+            OGSGame (OGSGame): The game object
+        """
+        sock = self.socket_of(game_id) or self.shard_for(game_id)
+        return sock.game_connect(game_id, callback_handler if callback_handler is not None else self.callback_handler)
+
+    def game_connect_many(self, game_ids: Iterable[int], callback_handler: Callable | None = None) -> dict[int, OGSGame]:
+        """Connect to many games, each through the socket it is assigned to. See [OGSSocket.game_connect_many()](#src.ogsapi.ogssocket.OGSSocket.game_connect_many)
+
+        Args:
+            game_ids (Iterable[int]): The ids of the games to connect to
+            callback_handler (Callable, optional): The callback handler for the games. Defaults to the callback_handler of the manager.
+
+        Returns:
+            games (dict[int, OGSGame]): The game objects by game id
+        """
+        if callback_handler is None:
+            callback_handler = self.callback_handler
+        by_socket: dict[int, list[int]] = {}
+        for game_id in game_ids:
+            sock = self.socket_of(game_id) or self.shard_for(game_id)
+            by_socket.setdefault(self.sockets.index(sock), []).append(game_id)
+        games: dict[int, OGSGame] = {}
+        for shard, shard_game_ids in by_socket.items():
+            games.update(self.sockets[shard].game_connect_many(shard_game_ids, callback_handler))
+        return games
+
+    def game_disconnect(self, game_id: int) -> None:
+        """Disconnect from a game, whichever socket it is connected through.
+
+        Args:
+            game_id (int): The id of the game to disconnect from
+        """
+        sock = self.socket_of(game_id)
+        if sock is None:
+            raise OGSApiException(f"Not connected to game {game_id}")
+        sock.game_disconnect(game_id)
+
+    def _move_socket_events(self, shard: int) -> None:
+        """Send the socket level events from another socket"""
+        if shard == self._events_shard:
+            return
+        logger.info(f"Socket {shard} takes over the socket level events from socket {self._events_shard}")
+        old = self.sockets[self._events_shard]
+        old.socket_events = False
+        old.callback_handler = None
+        new = self.sockets[shard]
+        new.socket_events = True
+        new.callback_handler = self._callback_handler
+        self._events_shard = shard
+
+    def _connection_changed(self, sock: OGSSocket, connected: bool) -> None:
+        shard = self.sockets.index(sock)
+        with self._lock:
+            self._connected[shard] = connected
+            if self._closing:
+                return
+            if connected:
+                # Move the socket level events back, or to the first socket reconnecting when none was connected
+                if shard == 0 or not self._connected[self._events_shard]:
+                    self._move_socket_events(shard)
+                return
+            if shard == self._events_shard:
+                fallback = next((other for other, up in enumerate(self._connected) if up), None)
+                if fallback is not None:
+                    self._move_socket_events(fallback)
+            logger.warning(f"Socket {shard} lost its connection, moving its {len(sock.games)} games")
+            for game_id in list(sock.games):
+                target = self.shard_for(game_id)
+                if target is sock:
+                    continue
+                target.adopt_game(sock.games.pop(game_id))
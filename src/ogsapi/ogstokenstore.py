@@ -0,0 +1,124 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import threading
+from loguru import logger
+
+class OGSTokenStore:
+    """On disk store for OAuth tokens, so restarted processes can reuse a valid access token.
+
+    Tokens are stored as JSON, keyed by the OGS instance, client ID and username. The file is
+    written atomically and only readable by the owner.
+
+    Examples:
+        >>> store = OGSTokenStore('~/.config/ogsapi/tokens.json')
+        >>> ogs = OGSClient(client_id, client_secret, username, password, token_store=store)
+
+    Args:
+        path (str): Path of the token file. `~` is expanded to the home directory.
+
+    Attributes:
+        path (str): Absolute path of the token file
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(base_url: str, client_id: str | None, username: str | None) -> str:
+        """Get the key tokens are stored under.
+
+        Args:
+            base_url (str): Base URL of the OGS instance
+            client_id (str, optional): OAuth client ID
+            username (str, optional): Username the tokens belong to
+
+        Returns:
+            key (str): The key of the tokens
+        """
+        return f"{base_url}|{client_id}|{username}"
+
+    def _read(self) -> dict:
+        try:
+            mode = os.stat(self.path).st_mode
+        except FileNotFoundError:
+            return {}
+        if os.name == 'posix' and mode & 0o077:
+            logger.warning(f"Token store {self.path} is readable by other users, restricting permissions")
+            try:
+                os.chmod(self.path, 0o600)
+            except OSError as e:
+                logger.warning(f"Failed to restrict permissions of token store {self.path}: {e}")
+        try:
+            with open(self.path, encoding='utf-8') as token_file:
+                data = json.load(token_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read token store {self.path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict) -> None:
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as token_file:
+                json.dump(data, token_file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, key: str) -> dict | None:
+        """Load stored tokens.
+
+        Args:
+            key (str): Key of the tokens
+
+        Returns:
+            tokens (dict | None): Dict with `access_token`, `refresh_token` and `expires_at`, or None if not stored
+        """
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key: str, access_token: str | None, refresh_token: str | None, expires_at: float | None) -> None:
+        """Store tokens, replacing any stored under the same key.
+
+        Args:
+            key (str): Key of the tokens
+            access_token (str, optional): OAuth access token
+            refresh_token (str, optional): OAuth refresh token
+            expires_at (float, optional): Unix time the access token expires at
+        """
+        with self._lock:
+            data = self._read()
+            data[key] = {'access_token': access_token, 'refresh_token': refresh_token, 'expires_at': expires_at}
+            self._write(data)
+        logger.debug(f"Saved tokens to {self.path}")
+
+    def clear(self, key: str) -> None:
+        """Remove stored tokens.
+
+        Args:
+            key (str): Key of the tokens
+        """
+        with self._lock:
+            data = self._read()
+            if data.pop(key, None) is not None:
+                self._write(data)
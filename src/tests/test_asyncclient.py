@@ -0,0 +1,40 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import threading
+import unittest
+from unittest import mock
+from src.ogsapi.asyncclient import AsyncOGSClient
+
+class TestAsyncOGSClientIterators(unittest.IsolatedAsyncioTestCase):
+
+    async def test_iterators_created_off_the_loop(self):
+        client = mock.Mock()
+        threads = []
+        def iter_received_challenges(*args):
+            # Creating the iterator may fetch the user ID first
+            threads.append(threading.current_thread())
+            return iter([{'id': 1}, {'id': 2}])
+        client.iter_received_challenges.side_effect = iter_received_challenges
+        ogs = AsyncOGSClient(client)
+        challenges = [challenge async for challenge in ogs.iter_received_challenges()]
+        self.assertEqual(challenges, [{'id': 1}, {'id': 2}])
+        self.assertIsNot(threads[0], threading.main_thread())
+        await ogs.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogsasyncgame import AsyncOGSGame
+from src.ogsapi.ogsasyncsocket import AsyncOGSSocket
+
+class TestAsyncOGSSocketGames(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.sock = AsyncOGSSocket(OGSCredentials(user_id=1))
+        self.sock.socket.emit = mock.AsyncMock()
+        self.sock.socket.disconnect = mock.AsyncMock()
+        self.base_handlers = self.sock.registered_handlers
+
+    async def test_disconnect_removes_handlers(self):
+        game = await self.sock.game_connect(123)
+        self.assertEqual(self.sock.registered_handlers, self.base_handlers + 8)
+        await self.sock.game_disconnect(123)
+        self.assertEqual(self.sock.registered_handlers, self.base_handlers)
+        self.assertFalse(game.subscribed)
+        self.assertEqual(self.sock.games, {})
+
+    async def test_events_buffered_and_drops_counted(self):
+        game = AsyncOGSGame(self.sock.socket, self.sock.credentials, 123, self.sock.callback_handler, max_queued_events=2)
+        for move_number in range(1, 4):
+            await self.sock.socket.handlers['/']['game/123/move']({'move_number': move_number, 'move': [0, 0, 0]})
+        self.assertEqual(game.dropped, 1)
+        events = game.events()
+        self.assertEqual((await anext(events))[1]['move_number'], 2)
+        self.assertEqual((await anext(events))[1]['move_number'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import random
+import unittest
+from unittest import mock
+from src.ogsapi.ogs_api_exception import OGSApiException
+from src.ogsapi.ogsboard import OGSBoard, BLACK, WHITE, EMPTY
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogspositionindex import OGSPositionIndex
+from src.ogsapi.ogssocket import OGSSocket
+
+class TestOGSBoard(unittest.TestCase):
+
+    def play(self, board, *moves):
+        for x, y in moves:
+            board.play(x, y)
+
+    def test_capture_and_undo(self):
+        board = OGSBoard(9, 9)
+        self.play(board, (1, 0), (0, 0))
+        self.assertEqual(board.play(0, 1), [(0, 0)])
+        self.assertEqual(board.get(0, 0), EMPTY)
+        self.assertEqual(board.captures[BLACK], 1)
+        self.assertTrue(board.undo())
+        self.assertEqual(board.get(0, 0), WHITE)
+        self.assertEqual(board.liberties(0, 0), 1)
+        self.assertEqual(board.captures[BLACK], 0)
+        self.assertEqual(board.to_move, BLACK)
+
+    def test_ko_and_suicide(self):
+        board = OGSBoard(9, 9)
+        self.play(board, (1, 0), (2, 0), (0, 1), (3, 1), (1, 2), (2, 2), (0, 8), (1, 1))
+        self.assertEqual(board.play(2, 1), [(1, 1)])
+        self.assertEqual(board.ko, (1, 1))
+        with self.assertRaises(OGSApiException):
+            board.play(1, 1)
+        self.assertEqual(board.get(2, 1), BLACK)
+        self.play(board, (8, 8), (8, 7))
+        self.assertIsNone(board.ko)
+        with self.assertRaises(OGSApiException):
+            board.play(0, 0, color=WHITE)
+        self.assertEqual(board.liberties(1, 0), 2)
+
+    def test_initial_state_and_handicap(self):
+        board = OGSBoard(9, 9, initial_state={'black': 'aacc', 'white': 'ba'}, handicap=2)
+        self.assertEqual(board.get(0, 0), BLACK)
+        self.assertEqual(board.get(2, 2), BLACK)
+        self.assertEqual(board.liberties(1, 0), 2)
+        self.play(board, (6, 6), (2, 6))
+        self.assertEqual(board.to_move, WHITE)
+
+    def test_sync_only_plays_new_moves(self):
+        board = OGSBoard(9, 9)
+        moves = [[2, 2, 0], [6, 6, 0], [-1, -1, 0]]
+        self.assertEqual(board.sync(moves[:2]), 2)
+        self.assertEqual(board.sync(moves), 1)
+        self.assertEqual(board.sync([[2, 2, 0], [5, 5, 0]]), 2)
+        self.assertEqual(board.get(6, 6), EMPTY)
+
+    def test_groups_match_full_rebuild(self):
+        rng = random.Random(7)
+        board = OGSBoard(7, 7)
+        for _ in range(500):
+            if rng.random() < 0.2:
+                board.undo()
+            else:
+                try:
+                    board.play(rng.randrange(7), rng.randrange(7), validate=rng.random() < 0.5)
+                except OGSApiException:
+                    pass
+            reference = OGSBoard(7, 7)
+            for color in (BLACK, WHITE):
+                for x, y in board.stones(color):
+                    reference._points[y * 7 + x] = color
+            reference._rebuild(range(49))
+            for x in range(7):
+                for y in range(7):
+                    self.assertEqual(board.liberties(x, y), reference.liberties(x, y))
+
+class TestOGSBoardHashing(unittest.TestCase):
+
+    def test_hash_follows_moves_and_undo(self):
+        board = OGSBoard(9, 9)
+        board.play(1, 0)
+        board.play(0, 0)
+        before = board.hash
+        board.play(0, 1)
+        self.assertNotEqual(board.hash, before)
+        board.undo()
+        self.assertEqual(board.hash, before)
+        self.assertEqual(board.seen(), 1)
+        self.assertEqual(OGSBoard(9, 9, initial_state={'black': 'ba', 'white': 'aa'}).hash, before)
+
+    def test_superko(self):
+        moves = [(0, 0), (2, 0), (1, 0), (2, 0)]
+        board = OGSBoard(3, 1)
+        for x, y in moves:
+            board.play(x, y)
+        board.play(0, 0)
+        self.assertEqual(board.seen(), 2)
+        board = OGSBoard(3, 1, superko=True)
+        for x, y in moves:
+            board.play(x, y)
+        with self.assertRaises(OGSApiException):
+            board.play(0, 0)
+        self.assertEqual(board.get(0, 0), EMPTY)
+        self.assertEqual(board.move_number, 4)
+
+    def test_position_index_finds_transpositions(self):
+        index = OGSPositionIndex()
+        index.index_game(1, [[2, 2], [6, 6], [2, 6], [6, 2]], 9, 9)
+        index.index_game(2, [[2, 6], [6, 2], [2, 2], [6, 6]], 9, 9)
+        board = OGSBoard(9, 9)
+        board.sync([[2, 2], [6, 6], [2, 6], [6, 2]])
+        self.assertEqual(index.lookup(board.hash), [(1, 4), (2, 4)])
+        self.assertEqual(index.lookup(board.hashes[1]), [(1, 1)])
+
+class TestOGSGameBoard(unittest.TestCase):
+
+    def test_board_follows_game_events(self):
+        sock = OGSSocket(OGSCredentials(user_id=1))
+        sock.socket.emit = mock.Mock()
+        game = sock.game_connect(123)
+        trigger = lambda event, data: sock.socket.handlers['/'][f'game/123/{event}'](data)
+        trigger('gamedata', {'game_id': 123, 'width': 9, 'height': 9, 'moves': [[2, 2, 0]], 'time_control': {}})
+        trigger('move', {'game_id': 123, 'move_number': 2, 'move': [6, 6, 0]})
+        self.assertEqual(game.board.get(6, 6), WHITE)
+        self.assertEqual(len(game.game_data.moves), 2)
+        trigger('undo_accepted', 2)
+        self.assertEqual(game.board.get(6, 6), EMPTY)
+        self.assertEqual(game.board.move_number, 1)
+
+    def test_game_positions_indexed(self):
+        index = OGSPositionIndex()
+        sock = OGSSocket(OGSCredentials(user_id=1), position_index=index)
+        sock.socket.emit = mock.Mock()
+        game = sock.game_connect(123)
+        sock.socket.handlers['/']['game/123/gamedata']({'game_id': 123, 'moves': [[3, 3, 0], [15, 15, 0]], 'time_control': {}})
+        self.assertEqual(index.lookup(game.board.hash), [(123, 2)])
+
+    def test_undo_removes_indexed_position(self):
+        index = OGSPositionIndex()
+        sock = OGSSocket(OGSCredentials(user_id=1), position_index=index)
+        sock.socket.emit = mock.Mock()
+        game = sock.game_connect(123)
+        sock.socket.handlers['/']['game/123/gamedata']({'game_id': 123, 'moves': [[3, 3, 0], [15, 15, 0]], 'time_control': {}})
+        undone = game.board.hash
+        sock.socket.handlers['/']['game/123/undo_accepted'](2)
+        self.assertEqual(index.lookup(undone), [])
+        self.assertNotIn(undone, index)
+        self.assertEqual(index.lookup(game.board.hash), [(123, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import threading
+import unittest
+from src.ogsapi.ogsbulk import bulk_fetch
+
+class TestBulkFetch(unittest.TestCase):
+
+    def test_ordered_results_with_errors(self):
+        def fetch(item_id):
+            if item_id == 3:
+                raise ValueError("bad id")
+            return item_id * 10
+        results = list(bulk_fetch(fetch, range(6), max_workers=3))
+        self.assertEqual([result.id for result in results], list(range(6)))
+        self.assertEqual(results[1].result, 10)
+        self.assertFalse(results[3].ok)
+        self.assertIsInstance(results[3].error, ValueError)
+
+    def test_as_completed_returns_every_id(self):
+        results = list(bulk_fetch(lambda item_id: item_id, range(20), max_workers=4, ordered=False))
+        self.assertEqual(sorted(result.id for result in results), list(range(20)))
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        def fetch(item_id):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.01)
+            with lock:
+                running[0] -= 1
+            return item_id
+        list(bulk_fetch(fetch, range(20), max_workers=3))
+        self.assertLessEqual(peak[0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
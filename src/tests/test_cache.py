@@ -0,0 +1,111 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import threading
+import time
+import unittest
+from unittest import mock
+import requests
+from src.ogsapi.ogscache import OGSLRUCache, OGSResponseCache
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogsrestapi import OGSRestAPI
+
+class TestOGSLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = OGSLRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_expires_entries(self):
+        cache = OGSLRUCache()
+        with mock.patch('src.ogsapi.ogscache.monotonic', return_value=100.0):
+            cache.set('a', 1, ttl=10)
+        with mock.patch('src.ogsapi.ogscache.monotonic', return_value=105.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('src.ogsapi.ogscache.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get('a'))
+
+class TestOGSResponseCache(unittest.TestCase):
+
+    def test_only_caches_endpoints_with_ttl(self):
+        cache = OGSResponseCache()
+        cache.store('/games/1/sgf', None, 'sgf')
+        cache.store('/me/games', {'page': 1}, 'games')
+        self.assertEqual(cache.lookup('/games/1/sgf/'), 'sgf')
+        self.assertIsNone(cache.lookup('/me/games', {'page': 1}))
+
+    def test_params_are_part_of_key(self):
+        cache = OGSResponseCache()
+        cache.store('/players/', {'username': 'a'}, 'player a')
+        self.assertEqual(cache.lookup('/players/', {'username': 'a'}), 'player a')
+        self.assertIsNone(cache.lookup('/players/', {'username': 'b'}))
+
+    def test_list_params(self):
+        cache = OGSResponseCache()
+        cache.store('/players/', {'id__in': [1, 2]}, 'players')
+        self.assertEqual(cache.lookup('/players/', {'id__in': [1, 2]}), 'players')
+        self.assertIsNone(cache.lookup('/players/', {'id__in': [1, 3]}))
+
+    def test_invalidate_prefix(self):
+        cache = OGSResponseCache()
+        cache.store('/games/1', None, 'details')
+        cache.store('/games/1/sgf', None, 'sgf')
+        cache.store('/games/12', None, 'other details')
+        cache.invalidate('/games/1')
+        self.assertIsNone(cache.lookup('/games/1'))
+        self.assertIsNone(cache.lookup('/games/1/sgf'))
+        self.assertEqual(cache.lookup('/games/12'), 'other details')
+
+class TestOGSRestAPICoalescing(unittest.TestCase):
+
+    def test_concurrent_gets_share_request(self):
+        api = OGSRestAPI(OGSCredentials())
+        api.session = mock.Mock()
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            release.wait(5)
+            response = requests.models.Response()
+            response.status_code = 200
+            response._content = b'{"id": 1}'
+            return response
+
+        api.session.request.side_effect = slow_request
+        responses = []
+        threads = [threading.Thread(target=lambda: responses.append(api.call_rest_endpoint('GET', '/games/1')))
+                   for _ in range(4)]
+        threads[0].start()
+        while not api._inflight:
+            time.sleep(0.01)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(api.session.request.call_count, 1)
+        self.assertEqual([response.json() for response in responses], [{'id': 1}] * 4)
+        self.assertEqual(len({id(response) for response in responses}), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
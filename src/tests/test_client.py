@@ -0,0 +1,101 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.client import OGSClient
+from src.ogsapi.ogscache import OGSResponseCache
+
+def json_response(data):
+    response = mock.Mock()
+    response.json.return_value = data
+    return response
+
+class TestOGSClientOffline(unittest.TestCase):
+
+    def setUp(self):
+        self.client = OGSClient()
+        self.client.api.call_rest_endpoint = mock.Mock()
+
+    def tearDown(self):
+        self.client = None
+
+    def test_resolve_player_id_accepts_ids(self):
+        self.assertEqual(self.client.resolve_player_id(1234), 1234)
+        self.client.api.call_rest_endpoint.assert_not_called()
+
+    def test_resolve_player_id_caches_lookups(self):
+        self.client.api.call_rest_endpoint.return_value = json_response({'results': [{'id': 42, 'username': 'test'}]})
+        self.assertEqual(self.client.resolve_player_id('test'), 42)
+        self.assertEqual(self.client.resolve_player_id('test'), 42)
+        self.assertEqual(self.client.api.call_rest_endpoint.call_count, 1)
+
+    def test_remember_players_from_gamedata(self):
+        self.client.remember_players({'players': {'black': {'id': 1, 'username': 'b'}, 'white': {'id': 2, 'username': 'w'}}})
+        self.assertEqual(self.client.resolve_player_id('b'), 1)
+        self.assertEqual(self.client.resolve_player_id('w'), 2)
+        self.client.api.call_rest_endpoint.assert_not_called()
+
+    def test_iter_player_games_follows_next_links(self):
+        pages = {
+            '1': {'next': 'https://online-go.com/api/v1/players/1/games?page=2&page_size=2', 'results': [{'id': 1}, {'id': 2}]},
+            '2': {'next': None, 'results': [{'id': 3}]},
+        }
+        self.client.api.call_rest_endpoint.side_effect = lambda method, endpoint, params: json_response(pages[params.get('page', '1')])
+        games = [game['id'] for game in self.client.iter_player_games(1, page_size=2)]
+        self.assertEqual(games, [1, 2, 3])
+
+    def test_iter_player_games_max_items(self):
+        page = {'next': 'https://online-go.com/api/v1/players/1/games?page=2', 'results': [{'id': 1}, {'id': 2}]}
+        self.client.api.call_rest_endpoint.return_value = json_response(page)
+        games = list(self.client.iter_player_games(1, page_size=2, max_items=3, prefetch=False))
+        self.assertEqual(len(games), 3)
+        self.assertEqual(self.client.api.call_rest_endpoint.call_count, 2)
+
+    def test_received_challenges_since_id(self):
+        self.client.api.is_authed = True
+        self.client.credentials.user_id = 1
+        page = {'next': None, 'results': [
+            {'id': 12, 'challenger': {'id': 2, 'username': 'a'}},
+            {'id': 11, 'challenger': {'id': 1, 'username': 'me'}},
+            {'id': 10, 'challenger': {'id': 3, 'username': 'b'}},
+            {'id': 9, 'challenger': {'id': 4, 'username': 'c'}},
+        ]}
+        self.client.api.call_rest_endpoint.return_value = json_response(page)
+        challenges = self.client.received_challenges(since_id=9)
+        self.assertEqual([challenge['id'] for challenge in challenges], [12, 10])
+        params = self.client.api.call_rest_endpoint.call_args.kwargs['params']
+        self.assertEqual(params['ordering'], '-id')
+
+    def test_sent_challenges_filters_on_server(self):
+        self.client.api.is_authed = True
+        self.client.credentials.user_id = 1
+        self.client.api.call_rest_endpoint.return_value = json_response({'next': None, 'results': []})
+        self.client.sent_challenges()
+        params = self.client.api.call_rest_endpoint.call_args.kwargs['params']
+        self.assertEqual(params['challenger'], 1)
+
+    def test_set_credentials_clears_cache(self):
+        self.client.api.cache = OGSResponseCache()
+        self.client.api.cache.store('/me/settings', None, {'id': 1})
+        self.assertIsNotNone(self.client.api.cache.lookup('/me/settings'))
+        self.client.api.authenticate = mock.Mock()
+        self.client.set_credentials('id', 'secret', 'other', 'password')
+        self.assertIsNone(self.client.api.cache.lookup('/me/settings'))
+        self.client.api.authenticate.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
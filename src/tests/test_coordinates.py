@@ -0,0 +1,74 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.ogs_api_exception import OGSApiException
+from src.ogsapi.ogscoordinates import OGSCoordinates
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogssocket import OGSSocket
+
+class TestOGSCoordinates(unittest.TestCase):
+
+    def test_converts_between_gtp_and_ogs(self):
+        coordinates = OGSCoordinates.for_board(19, 19)
+        self.assertIs(OGSCoordinates.for_board(19, 19), coordinates)
+        self.assertEqual(coordinates.parse('D4'), (3, 15))
+        self.assertEqual(coordinates.parse('d4'), (3, 15))
+        self.assertEqual(coordinates.parse('dp'), (3, 15))
+        self.assertEqual(coordinates.parse('J19'), (8, 0))
+        self.assertEqual(coordinates.parse('pass'), (-1, -1))
+        self.assertEqual(coordinates.to_ogs(3, 15), 'dp')
+        self.assertEqual(coordinates.to_gtp(8, 0), 'J19')
+
+    def test_rejects_points_off_the_board(self):
+        coordinates = OGSCoordinates.for_board(9, 9)
+        for move in ('I1', 'K1', 'A10', 'jj', 'zz1', ''):
+            with self.assertRaises(OGSApiException):
+                coordinates.parse(move)
+
+class TestOGSGameValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.sock = OGSSocket(OGSCredentials(user_id=1))
+        self.sock.socket.emit = mock.Mock()
+        self.game = self.sock.game_connect(123)
+        self.game.validate_moves = True
+        self.sock.socket.handlers['/']['game/123/gamedata']({
+            'game_id': 123, 'width': 9, 'height': 9, 'phase': 'play', 'moves': [[2, 2, 0]], 'time_control': {},
+            'players': {'black': {'id': 2}, 'white': {'id': 1}}})
+
+    def sent_moves(self):
+        return [call.kwargs['data']['move'] for call in self.sock.socket.emit.call_args_list if call.kwargs['event'] == 'game/move']
+
+    def test_sends_legal_move_in_ogs_coordinates(self):
+        self.game.move('G3')
+        self.assertEqual(self.sent_moves(), ['gg'])
+
+    def test_rejects_illegal_moves_without_sending(self):
+        for move in ('C7', 'Z9'):
+            with self.assertRaises(OGSApiException):
+                self.game.move(move)
+        self.sock.socket.handlers['/']['game/123/move']({'game_id': 123, 'move_number': 2, 'move': [6, 6, 0]})
+        with self.assertRaises(OGSApiException):
+            self.game.pass_turn()
+        self.sock.socket.handlers['/']['game/123/phase']('stone removal')
+        with self.assertRaises(OGSApiException):
+            self.game.move('A1')
+        self.assertEqual(self.sent_moves(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
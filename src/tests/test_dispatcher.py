@@ -0,0 +1,91 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import threading
+import time
+import unittest
+from src.ogsapi.ogsdispatcher import OGSEventDispatcher
+
+class TestOGSEventDispatcher(unittest.TestCase):
+
+    def test_keeps_order_per_key(self):
+        dispatcher = OGSEventDispatcher(workers=3)
+        received: dict = {}
+        handler = lambda event_name, data: received.setdefault(data[0], []).append(data[1])
+        for i in range(100):
+            for game_id in (1, 2, 3, 4):
+                dispatcher.dispatch(game_id, handler, 'move', (game_id, i))
+        dispatcher.close()
+        self.assertEqual(received, {game_id: list(range(100)) for game_id in (1, 2, 3, 4)})
+        self.assertEqual(dispatcher.metrics()['handled'], 400)
+
+    def test_slow_handler_does_not_block_other_keys(self):
+        dispatcher = OGSEventDispatcher(workers=2)
+        release = threading.Event()
+        handled = threading.Event()
+        keys = [key for key in range(10) if hash(key) % 2 != hash(0) % 2]
+        dispatcher.dispatch(0, lambda event_name, data: release.wait(5), 'move', None)
+        dispatcher.dispatch(keys[0], lambda event_name, data: handled.set(), 'move', None)
+        self.assertTrue(handled.wait(1))
+        release.set()
+        dispatcher.close()
+
+    def test_drop_oldest(self):
+        dispatcher = OGSEventDispatcher(workers=1, max_queue=2, policy='drop_oldest')
+        release = threading.Event()
+        received = []
+        dispatcher.dispatch(1, lambda event_name, data: release.wait(5), 'move', None)
+        while dispatcher.queue_depth:
+            time.sleep(0.001)
+        for i in range(5):
+            dispatcher.dispatch(1, lambda event_name, data: received.append(data), 'move', i)
+        release.set()
+        dispatcher.close()
+        self.assertEqual(received, [3, 4])
+        self.assertEqual(dispatcher.dropped, 3)
+
+    def test_control_events_are_never_dropped(self):
+        dispatcher = OGSEventDispatcher(workers=1, max_queue=2, policy='drop_oldest')
+        release = threading.Event()
+        received = []
+        dispatcher.dispatch(1, lambda event_name, data: release.wait(5), 'move', None)
+        while dispatcher.queue_depth:
+            time.sleep(0.001)
+        dispatcher.dispatch(1, lambda event_name, data: received.append(event_name), 'unsubscribe', None, control=True)
+        for i in range(5):
+            dispatcher.dispatch(1, lambda event_name, data: received.append(data), 'move', i)
+        release.set()
+        dispatcher.close()
+        self.assertEqual(received, ['unsubscribe', 4])
+
+    def test_coalesce_clock(self):
+        dispatcher = OGSEventDispatcher(workers=1, policy='coalesce_clock')
+        release = threading.Event()
+        received = []
+        handler = lambda event_name, data: received.append((event_name, data))
+        dispatcher.dispatch(1, lambda event_name, data: release.wait(5), 'move', None)
+        while dispatcher.queue_depth:
+            time.sleep(0.001)
+        dispatcher.dispatch(1, handler, 'clock', 1)
+        dispatcher.dispatch(1, handler, 'move', 'aa')
+        dispatcher.dispatch(1, handler, 'clock', 2)
+        release.set()
+        dispatcher.close()
+        self.assertEqual(received, [('move', 'aa'), ('clock', 2)])
+        self.assertEqual(dispatcher.coalesced, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
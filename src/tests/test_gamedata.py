@@ -0,0 +1,89 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogsgameclock import OGSGameClock
+from src.ogsapi.ogsgamedata import OGSGameData, OGSMoveList, Player
+from src.ogsapi.ogssocket import OGSSocket
+
+class TestOGSMoveList(unittest.TestCase):
+
+    def test_reads_like_a_list_of_moves(self):
+        moves = OGSMoveList([[3, 3, 1200], [-1, -1], [15, 15, 40 * 24 * 3600 * 1000, {'blur': 1}]])
+        self.assertEqual(len(moves), 3)
+        self.assertEqual(moves[0], [3, 3, 1200])
+        self.assertEqual(moves[1], [-1, -1, 0])
+        self.assertEqual(moves[-1][2], 40 * 24 * 3600 * 1000)
+        self.assertEqual(moves[1:], [[-1, -1, 0], [15, 15, 40 * 24 * 3600 * 1000]])
+        self.assertEqual(moves, [[3, 3, 1200], [-1, -1, 0], [15, 15, 40 * 24 * 3600 * 1000]])
+        self.assertEqual(moves.pop(), [15, 15, 40 * 24 * 3600 * 1000])
+        self.assertEqual(moves.nbytes, 20)
+
+    def test_extra_move_data_dropped(self):
+        moves = OGSMoveList([[3, 3, 1200, {'blur': 1}], [15, 15, None]])
+        self.assertEqual(moves[0], [3, 3, 1200])
+        self.assertEqual(moves[1], [15, 15, 0])
+        self.assertEqual(moves, [[3, 3, 1200, {'blur': 1}], [15, 15, None]])
+        self.assertEqual(moves.sync([[3, 3, 1200, {'blur': 2}], [15, 15, None], [-1, -1, None]]), (0, [[-1, -1, 0]]))
+
+    def test_slice_assignment(self):
+        moves = OGSMoveList([[0, 0, 1]])
+        moves[:] = [[1, 1, 2], [2, 2, 3]]
+        self.assertEqual(list(moves), [[1, 1, 2], [2, 2, 3]])
+
+    def test_gamedata_keeps_compact_moves(self):
+        data = OGSGameData(game_id=1)
+        data.update({'moves': [[3, 3, 100]], 'players': {'black': {'id': 2}, 'white': {'id': 3}}})
+        self.assertIsInstance(data.moves, OGSMoveList)
+        self.assertEqual(data.moves, [[3, 3, 100]])
+        for instance in (data, data.black_player, data.time_control, OGSGameClock(), Player()):
+            self.assertFalse(hasattr(instance, '__dict__'))
+
+class TestOGSGameDataChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.data = OGSGameData(game_id=1)
+        self.data.update({'phase': 'play', 'moves': [[3, 3, 100]], 'players': {'black': {'id': 2, 'rank': 10}, 'white': {'id': 3}}})
+
+    def test_only_changes_are_returned(self):
+        moves = self.data.moves
+        changes = self.data.update({'phase': 'play', 'moves': [[3, 3, 100], [15, 15, 200]],
+                                    'players': {'black': {'id': 2, 'rank': 11}, 'white': {'id': 3}}})
+        self.assertEqual(changes, {'moves': {'removed': 0, 'added': [[15, 15, 200]]}, 'black_player': {'rank': (10, 11)}})
+        self.assertIs(self.data.moves, moves)
+        self.assertEqual(self.data.update({'phase': 'play', 'moves': [[3, 3, 100], [15, 15, 200]]}), {})
+
+    def test_undone_and_replaced_moves(self):
+        self.data.update({'moves': [[3, 3, 100], [15, 15, 200]]})
+        self.assertEqual(self.data.update({'moves': [[3, 3, 100], [2, 2, 300]], 'phase': 'finished'}),
+                         {'moves': {'removed': 1, 'added': [[2, 2, 300]]}, 'phase': ('play', 'finished')})
+        self.assertEqual(self.data.update({'moves': []})['moves'], {'removed': 2, 'added': []})
+
+    def test_game_sends_changes(self):
+        sock = OGSSocket(OGSCredentials(user_id=1))
+        sock.socket.emit = mock.Mock()
+        game = sock.game_connect(123)
+        on_changes = mock.Mock()
+        game.on('gamedata_changes')(on_changes)
+        gamedata = {'game_id': 123, 'phase': 'play', 'moves': [], 'time_control': {'system': 'fischer'}}
+        sock.socket.handlers['/']['game/123/gamedata'](gamedata)
+        sock.socket.handlers['/']['game/123/gamedata'](gamedata)
+        on_changes.assert_called_once_with({'phase': (None, 'play'), 'time_control': {'system': (None, 'fischer')}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+import unittest
+from unittest import mock
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogslatency import OGSLatencyEstimator
+from src.ogsapi.ogssocket import OGSSocket
+
+class TestOGSLatencyEstimator(unittest.TestCase):
+
+    def test_smooths_samples(self):
+        estimator = OGSLatencyEstimator(alpha=0.5)
+        estimator.add(0.1, 1.0)
+        estimator.add(0.2, 2.0)
+        self.assertAlmostEqual(estimator.latency, 0.15)
+        self.assertAlmostEqual(estimator.drift, 1.5)
+
+    def test_rejects_outliers(self):
+        estimator = OGSLatencyEstimator()
+        for latency in (0.10, 0.11, 0.10, 0.12, 0.11, 0.10):
+            self.assertTrue(estimator.add(latency, 0.0))
+        self.assertFalse(estimator.add(2.0, 5.0))
+        self.assertEqual(estimator.rejected, 1)
+        self.assertLess(estimator.latency, 0.2)
+        self.assertAlmostEqual(estimator.drift, 0.0)
+
+    def test_lasting_change_is_accepted(self):
+        estimator = OGSLatencyEstimator(window=8)
+        for _ in range(8):
+            estimator.add(0.1, 0.0)
+        accepted = [estimator.add(0.5, 0.0) for _ in range(8)]
+        self.assertFalse(accepted[0])
+        self.assertTrue(accepted[-1])
+
+    def test_percentiles(self):
+        estimator = OGSLatencyEstimator(window=4)
+        self.assertEqual(estimator.percentile(50), 0.0)
+        for latency in (0.5, 0.1, 0.2, 0.3, 0.4):
+            estimator.add(latency, 0.0)
+        self.assertEqual(len(estimator.samples()), 4)
+        self.assertEqual(estimator.percentile(0), 0.1)
+        self.assertEqual(estimator.percentile(100), 0.4)
+
+class TestOGSSocketHeartbeat(unittest.TestCase):
+
+    def setUp(self):
+        self.sock = OGSSocket(OGSCredentials(access_token='token', user_id=1))
+        self.sock.socket.emit = mock.Mock()
+        self.sock.socket_callbacks()
+
+    def test_pong_updates_smoothed_estimates(self):
+        now = time.time() * 1000
+        self.sock.socket.handlers['/']['net/pong']({'client': now - 100, 'server': now - 50})
+        self.assertAlmostEqual(self.sock.clock_latency, self.sock.latency.latency)
+        self.assertAlmostEqual(self.sock.clock_latency, 0.1, delta=0.05)
+        self.assertEqual(self.sock.latency_stats()['accepted'], 1)
+
+    def test_heartbeat_pings_while_connected(self):
+        self.sock.socket.connected = True
+        self.sock.start_heartbeat(0.01)
+        time.sleep(0.1)
+        self.sock.stop_heartbeat()
+        pings = self.sock.socket.emit.call_count
+        self.assertGreater(pings, 1)
+        time.sleep(0.05)
+        self.assertEqual(self.sock.socket.emit.call_count, pings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.ogs_api_exception import OGSApiException
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogsrestapi import OGSRestAPI
+from src.ogsapi.ogsratelimit import OGSRateLimiter, OGSTokenBucket
+
+def status_response(status_code, headers=None):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.reason = 'Too Many Requests' if status_code == 429 else 'OK'
+    response.headers = headers or {}
+    return response
+
+class TestOGSTokenBucket(unittest.TestCase):
+
+    def test_wait_time_after_burst(self):
+        bucket = OGSTokenBucket(rate=10, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertGreater(bucket.wait_time(), 0)
+        self.assertLessEqual(bucket.wait_time(), 0.1)
+
+class TestOGSRateLimiter(unittest.TestCase):
+
+    def test_classify(self):
+        self.assertEqual(OGSRateLimiter.classify('POST', '/oauth2/token/'), 'auth')
+        self.assertEqual(OGSRateLimiter.classify('GET', '/games/1/sgf'), 'media')
+        self.assertEqual(OGSRateLimiter.classify('GET', '/games/1'), 'read')
+        self.assertEqual(OGSRateLimiter.classify('PUT', '/players/1'), 'write')
+
+    def test_parse_retry_after(self):
+        self.assertEqual(OGSRateLimiter.parse_retry_after('3'), 3.0)
+        self.assertEqual(OGSRateLimiter.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(OGSRateLimiter.parse_retry_after('soon'))
+        self.assertIsNone(OGSRateLimiter.parse_retry_after(None))
+
+    def test_throttled_pauses_class(self):
+        limiter = OGSRateLimiter()
+        limiter.throttled('read', 0, '5')
+        self.assertGreater(limiter.wait_time('read'), 4)
+        self.assertEqual(limiter.wait_time('write'), 0)
+        self.assertEqual(limiter.throttled_count, 1)
+
+    def test_global_budget(self):
+        limiter = OGSRateLimiter(max_concurrent_requests=2, requests_per_second=100)
+        with limiter.slot():
+            self.assertEqual(limiter.budget()['global']['in_flight'], 1)
+        self.assertEqual(limiter.budget()['global']['max_concurrent'], 2)
+        self.assertNotIn('global', OGSRateLimiter().budget())
+
+class TestOGSRestAPIThrottling(unittest.TestCase):
+
+    def setUp(self):
+        self.api = OGSRestAPI(OGSCredentials(), rate_limiter=OGSRateLimiter(backoff_base=0))
+        self.api.session = mock.Mock()
+
+    def test_retries_idempotent_requests(self):
+        self.api.session.request.side_effect = [status_response(429, {'Retry-After': '0'}), status_response(200)]
+        response = self.api.call_rest_endpoint('GET', '/games/1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.api.session.request.call_count, 2)
+
+    def test_raises_when_still_throttled(self):
+        self.api.session.request.return_value = status_response(429, {'Retry-After': '0'})
+        with self.assertRaises(OGSApiException):
+            self.api.call_rest_endpoint('GET', '/games/1')
+        self.assertEqual(self.api.session.request.call_count, self.api.rate_limiter.max_retries + 1)
+        self.assertEqual(self.api.rate_limiter.throttled_count, self.api.rate_limiter.max_retries + 1)
+
+    def test_session_leaves_429_to_rate_limiter(self):
+        retry = OGSRestAPI(OGSCredentials()).session.get_adapter('https://online-go.com/').max_retries
+        self.assertFalse(retry.is_retry('GET', 429, has_retry_after=True))
+
+    def test_configure_budget_uses_rate_limiter(self):
+        self.api.configure_budget(max_concurrent_requests=3)
+        self.assertEqual(self.api.rate_limiter.budget()['global']['max_concurrent'], 3)
+
+    def test_does_not_retry_post(self):
+        self.api.session.request.return_value = status_response(429, {'Retry-After': '0'})
+        self.api._send('POST', 'https://online-go.com/api/v1/challenges/', {}, None, {}, 'write')
+        self.assertEqual(self.api.session.request.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogsrouter import OGSEventRouter
+from src.ogsapi.ogssocket import OGSSocket
+
+class TestOGSEventRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.router = OGSEventRouter()
+        self.calls = []
+
+    def handler(self, name):
+        return lambda data: self.calls.append((name, data))
+
+    def test_routes_per_game_and_event(self):
+        self.router.register('move', self.handler('game 1'), game_id=1)
+        self.router.register('move', self.handler('any game'), game_id=OGSEventRouter.ANY_GAME)
+        self.router.register('clock', self.handler('socket'))
+        self.assertTrue(self.router.route(1, 'move', 'a'))
+        self.assertTrue(self.router.route(2, 'move', 'b'))
+        self.assertFalse(self.router.route(1, 'clock', 'c'))
+        self.assertEqual(self.calls, [('game 1', 'a'), ('any game', 'a'), ('any game', 'b')])
+
+    def test_catch_all_gets_event_name(self):
+        catch_all = mock.Mock()
+        self.router.register(OGSEventRouter.ALL, catch_all, game_id=1)
+        self.router.route(1, 'phase', 'play')
+        catch_all.assert_called_once_with(event_name='phase', data='play')
+        self.assertEqual(self.router.handlers(2, 'phase'), ())
+
+    def test_decorator_and_unregister(self):
+        @self.router.on('move', game_id=1)
+        def on_move(data):
+            self.calls.append(data)
+        self.router.route(1, 'move', 'a')
+        self.router.unregister('move', on_move, game_id=1)
+        self.assertFalse(self.router.route(1, 'move', 'b'))
+        self.assertEqual(self.calls, ['a'])
+
+    def test_game_changes_match_full_rebuild(self):
+        self.router.register('move', self.handler('any game'), game_id=OGSEventRouter.ANY_GAME)
+        self.router.register('clock', self.handler('game 1'), game_id=1)
+        catch_all = self.handler('game 2')
+        self.router.register(OGSEventRouter.ALL, catch_all, game_id=2)
+        self.router.register('chat', self.handler('game 3'), game_id=3)
+        self.router.unregister(OGSEventRouter.ALL, catch_all, game_id=2)
+        self.router.register(OGSEventRouter.ALL, self.handler('game 1 all'), game_id=1)
+        self.router.clear(3)
+        incremental = {(game_id, event): self.router.handlers(game_id, event) for game_id in (1, 2, 3) for event in ('move', 'clock', 'chat')}
+        self.router._rebuild()
+        for (game_id, event), handlers in incremental.items():
+            self.assertEqual(self.router.handlers(game_id, event), handlers, (game_id, event))
+        self.assertEqual(len(self.router.handlers(1, 'chat')), 1)
+
+    def test_registering_many_games_scales(self):
+        self.router.register('gamedata', self.handler('any game'), game_id=OGSEventRouter.ANY_GAME)
+        for game_id in range(5000):
+            self.router.register(OGSEventRouter.ALL, self.handler(game_id), game_id=game_id)
+        self.assertLess(len(self.router._table), 3 * 5000)
+        self.assertEqual(len(self.router.handlers(4999, 'gamedata')), 2)
+
+class TestOGSGameRouting(unittest.TestCase):
+
+    def test_game_events_reach_registered_handlers(self):
+        sock = OGSSocket(OGSCredentials(user_id=1))
+        sock.socket.emit = mock.Mock()
+        game = sock.game_connect(123)
+        on_move = mock.Mock()
+        game.on('move')(on_move)
+        sock.socket.handlers['/']['game/123/move']({'move': [3, 3]})
+        on_move.assert_called_once_with({'move': [3, 3]})
+
+
+if __name__ == '__main__':
+    unittest.main()
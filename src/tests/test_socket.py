@@ -0,0 +1,209 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import gc
+import unittest
+import weakref
+from unittest import mock
+from src.ogsapi.ogs_api_exception import OGSApiException
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogssocket import OGSSocket
+
+class TestOGSSocketReconnect(unittest.TestCase):
+
+    def setUp(self):
+        self.refresher = mock.Mock()
+        self.events = []
+        self.sock = OGSSocket(OGSCredentials(access_token='token', user_id=1), auth_refresher=self.refresher)
+        self.sock.callback_handler = lambda event_name, data: self.events.append((event_name, data))
+        self.sock.socket.emit = mock.Mock()
+        self.sock.socket_callbacks()
+
+    def trigger(self, event, *args):
+        self.sock.socket.handlers['/'][event](*args)
+
+    def emitted(self, event):
+        return [call for call in self.sock.socket.emit.call_args_list if call.kwargs['event'] == event]
+
+    def test_reconnect_resubscribes_games(self):
+        self.trigger('connect')
+        self.sock.game_connect(123)
+        self.sock.game_connect(456)
+        self.trigger('disconnect')
+        self.trigger('connect')
+
+        self.refresher.assert_called_once()
+        self.assertEqual(len(self.emitted('authenticate')), 2)
+        self.assertEqual([call.kwargs['data']['game_id'] for call in self.emitted('game/connect')], [123, 456, 123, 456])
+        self.assertEqual(self.events[-1], ('reconnect', {'games': [123, 456], 'reconnects': 1}))
+        self.assertEqual(self.sock.reconnects, 1)
+
+    def test_disconnect_updates_reconnect_token(self):
+        self.trigger('connect')
+        self.sock.credentials.access_token = 'refreshed'
+        self.trigger('disconnect')
+        self.assertEqual(self.sock.socket.connection_headers, {'Authorization': 'Bearer refreshed'})
+
+    def test_first_connect_does_not_resync(self):
+        self.trigger('connect')
+        self.refresher.assert_not_called()
+        self.assertEqual(self.sock.reconnects, 0)
+        self.assertEqual(self.events, [])
+
+class TestOGSSocketReady(unittest.TestCase):
+
+    def setUp(self):
+        self.sock = OGSSocket(OGSCredentials(access_token='token', user_id=1))
+        self.sock.socket.emit = mock.Mock()
+        self.sock.socket.connect = mock.Mock()
+        self.sock.socket_callbacks()
+
+    def test_ready_on_authenticate_ack(self):
+        ready = self.sock.connect(wait=False)
+        self.assertFalse(ready.done())
+        self.sock.socket.handlers['/']['connect']()
+        authenticate = self.sock.socket.emit.call_args_list[0]
+        authenticate.kwargs['callback']({'id': 1})
+        self.assertEqual(ready.result(0), {'id': 1})
+
+    def pong(self):
+        ping = [call for call in self.sock.socket.emit.call_args_list if call.kwargs['event'] == 'net/ping'][-1]
+        self.sock.socket.handlers['/']['net/pong']({'client': ping.kwargs['data']['client'], 'server': 0})
+
+    def test_ready_on_pong(self):
+        self.sock.socket.handlers['/']['connect']()
+        self.pong()
+        self.assertTrue(self.sock.ready.done())
+
+    def test_not_ready_on_stale_pong(self):
+        self.sock.socket.handlers['/']['net/pong']({'client': 0, 'server': 0})
+        self.sock.socket.handlers['/']['connect']()
+        self.sock.socket.handlers['/']['net/pong']({'client': 0, 'server': 0})
+        self.assertFalse(self.sock.ready.done())
+
+    def test_connect_failure_raises(self):
+        self.sock.socket.connect.side_effect = ConnectionError
+        with self.assertRaises(OGSApiException):
+            self.sock.connect(wait=False)
+
+    def test_wait_times_out(self):
+        with self.assertRaises(OGSApiException):
+            self.sock.wait_ready(timeout=0.01)
+
+    def test_disconnect_resets_ready(self):
+        self.sock.socket.handlers['/']['connect']()
+        self.pong()
+        self.sock.socket.handlers['/']['disconnect']()
+        self.assertFalse(self.sock.ready.done())
+
+class TestOGSSocketGameLifecycle(unittest.TestCase):
+
+    def setUp(self):
+        self.sock = OGSSocket(OGSCredentials(user_id=1))
+        self.sock.socket.emit = mock.Mock()
+        self.base_handlers = self.sock.registered_handlers
+
+    def test_disconnect_removes_handlers(self):
+        game = weakref.ref(self.sock.game_connect(123, callback_handler=mock.Mock()))
+        self.assertEqual(self.sock.registered_handlers, self.base_handlers + 9)
+        self.sock.game_disconnect(123)
+        self.assertEqual(self.sock.registered_handlers, self.base_handlers)
+        self.assertEqual(self.sock.live_games, 0)
+        self.assertEqual(self.sock.router.handlers(123, 'move'), ())
+        gc.collect()
+        self.assertIsNone(game())
+
+    def test_finished_phase_unsubscribes(self):
+        self.sock.game_connect(123)
+        self.sock.game_connect(456)
+        self.sock.socket.handlers['/']['game/123/phase']('finished')
+        self.assertEqual(list(self.sock.games), [456])
+        self.assertEqual(self.sock.registered_handlers, self.base_handlers + 9)
+        disconnects = [call for call in self.sock.socket.emit.call_args_list if call.kwargs['event'] == 'game/disconnect']
+        self.assertEqual(len(disconnects), 1)
+
+    def test_game_connect_many_ready(self):
+        games = self.sock.game_connect_many([1, 2])
+        connects = [call.kwargs['data']['game_id'] for call in self.sock.socket.emit.call_args_list if call.kwargs['event'] == 'game/connect']
+        self.assertEqual(connects, [1, 2])
+        self.sock.socket.handlers['/']['game/1/gamedata']({'game_id': 1, 'phase': 'play', 'time_control': {'system': 'fischer'}})
+        self.assertFalse(games[1].ready.done())
+        self.sock.socket.handlers['/']['game/1/clock']({'game_id': 1})
+        self.assertIs(games[1].ready.result(0), games[1])
+        self.assertFalse(games[2].ready.done())
+        self.sock.game_disconnect(2)
+        with self.assertRaises(OGSApiException):
+            games[2].ready.result(0)
+
+class TestOGSGameMoves(unittest.TestCase):
+
+    def setUp(self):
+        self.sock = OGSSocket(OGSCredentials(user_id=1))
+        self.sock.socket.emit = mock.Mock()
+        self.game = self.sock.game_connect(123)
+
+    def trigger(self, event, data):
+        self.sock.socket.handlers['/'][f'game/123/{event}'](data)
+
+    def test_move_resolved_by_echo(self):
+        accepted = self.game.submit_move('dd')
+        self.trigger('move', {'game_id': 123, 'move_number': 1, 'move': [15, 15, 100]})
+        self.assertFalse(accepted.done())
+        self.trigger('move', {'game_id': 123, 'move_number': 2, 'move': [3, 3, 100]})
+        self.assertEqual(accepted.result(0)['move_number'], 2)
+        self.assertEqual(self.game.move_latency.accepted, 1)
+
+    def test_move_fails_on_error_and_timeout(self):
+        rejected = self.game.submit_move('dd')
+        self.trigger('error', 'Illegal move')
+        with self.assertRaises(OGSApiException):
+            rejected.result(0)
+        with self.assertRaises(OGSApiException):
+            self.game.submit_move('..', timeout=0.01).result(1)
+
+    def test_opponent_move_on_same_point_not_matched(self):
+        self.trigger('gamedata', {'game_id': 123, 'players': {'black': {'id': 2}, 'white': {'id': 1}}, 'moves': [], 'time_control': {}})
+        self.game.validate_moves = False
+        accepted = self.game.submit_move('..')
+        self.trigger('move', {'game_id': 123, 'move_number': 1, 'move': [-1, -1, 100]})
+        self.assertFalse(accepted.done())
+        self.trigger('move', {'game_id': 123, 'move_number': 2, 'move': [-1, -1, 100]})
+        self.assertEqual(accepted.result(0)['move_number'], 2)
+
+    def test_unrelated_error_keeps_move_pending(self):
+        accepted = self.game.submit_move('dd')
+        for error in ('Chat is disabled', 'Invalid auth token', 'Nothing to return', 'Player removed',
+                      {'message': 'token expired'}, {'code': 'return_to_lobby'}, 404):
+            self.trigger('error', error)
+        self.assertFalse(accepted.done())
+
+    def test_move_errors_fail_move(self):
+        for error in ('illegal_ko_move', {'message': 'Not your turn'}, 'Move is suicidal'):
+            rejected = self.game.submit_move('dd')
+            self.trigger('error', error)
+            with self.assertRaises(OGSApiException):
+                rejected.result(0)
+
+    def test_fast_path_reuses_payload(self):
+        self.game.fast_path = True
+        self.game.move('dd')
+        self.game.pass_turn()
+        moves = [call.kwargs['data'] for call in self.sock.socket.emit.call_args_list if call.kwargs['event'] == 'game/move']
+        self.assertIs(moves[0], moves[1])
+        self.assertEqual(moves[1]['move'], '..')
+
+
+if __name__ == '__main__':
+    unittest.main()
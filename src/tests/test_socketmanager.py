@@ -0,0 +1,84 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from unittest import mock
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogssocketmanager import OGSSocketManager
+
+class TestOGSSocketManager(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = OGSSocketManager(OGSCredentials(user_id=1), shards=3)
+        for sock in self.manager.sockets:
+            sock.socket.emit = mock.Mock()
+            sock.socket_callbacks()
+            sock.socket.handlers['/']['connect']()
+
+    def tearDown(self):
+        self.manager.disconnect()
+
+    def test_spreads_games_consistently(self):
+        games = self.manager.game_connect_many(range(300))
+        self.assertEqual(len(games), 300)
+        counts = [sock.live_games for sock in self.manager.sockets]
+        self.assertEqual(sum(counts), 300)
+        self.assertTrue(all(count > 50 for count in counts), counts)
+        for game_id in range(300):
+            self.assertIs(self.manager.socket_of(game_id), self.manager.shard_for(game_id))
+
+    def test_moves_games_of_disconnected_socket(self):
+        self.manager.game_connect_many(range(100))
+        lost = self.manager.sockets[1]
+        moved = sorted(lost.games)
+        before = {game_id: self.manager.socket_of(game_id) for game_id in range(100)}
+        game = lost.games[moved[0]]
+        on_move = mock.Mock()
+        game.on('move')(on_move)
+
+        lost.socket.handlers['/']['disconnect']()
+
+        self.assertEqual(lost.live_games, 0)
+        self.assertEqual(self.manager.live_games, 100)
+        for game_id in range(100):
+            if game_id not in moved:
+                self.assertIs(self.manager.socket_of(game_id), before[game_id])
+        target = self.manager.socket_of(moved[0])
+        target.socket.handlers['/'][f'game/{moved[0]}/move']({'move': [0, 0, 100]})
+        on_move.assert_called_once_with({'move': [0, 0, 100]})
+
+    def test_socket_events_follow_connection(self):
+        first, second = self.manager.sockets[0], self.manager.sockets[1]
+        events = []
+        self.manager.callback_handler = lambda event_name, data: events.append(event_name)
+
+        first.socket.handlers['/']['disconnect']()
+        self.assertFalse(first.socket_events)
+        self.assertTrue(second.socket_events)
+        self.assertIs(second.callback_handler, self.manager.callback_handler)
+        second.socket.handlers['/']['notification']({'id': 1})
+        self.assertEqual(events.count('notification'), 1)
+
+        first.socket.handlers['/']['connect']()
+        self.assertTrue(first.socket_events)
+        self.assertFalse(second.socket_events)
+        self.assertIsNone(second.callback_handler)
+        first.socket.handlers['/']['notification']({'id': 2})
+        second.socket.handlers['/']['notification']({'id': 2})
+        self.assertEqual(events.count('notification'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
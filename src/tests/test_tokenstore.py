@@ -0,0 +1,139 @@
+# This file is part of ogs-python.
+#
+# This program is free software: you can redistribute it and/or modify  
+# it under the terms of the GNU General Public License as published by  
+# the Free Software Foundation, version 3.
+#
+# This program is distributed in the hope that it will be useful, but 
+# WITHOUT ANY WARRANTY; without even the implied warranty of 
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU 
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License 
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest import mock
+from src.ogsapi.ogscredentials import OGSCredentials
+from src.ogsapi.ogsrestapi import OGSRestAPI
+from src.ogsapi.ogstokenstore import OGSTokenStore
+
+def json_response(status_code, data=None):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.reason = 'Unauthorized' if status_code == 401 else 'OK'
+    response.headers = {}
+    response.json.return_value = data or {}
+    return response
+
+TOKENS = {'access_token': 'new', 'refresh_token': 'refresh2', 'expires_in': 36000}
+CONFIG = {'chat_auth': 'chat', 'user_jwt': 'jwt'}
+ME = {'id': 1234, 'username': 'user'}
+
+def bootstrap_response(method, url, **kwargs):
+    return json_response(200, ME if url.endswith('/me') else CONFIG)
+
+class TestOGSTokenStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'ogs', 'tokens.json')
+        self.store = OGSTokenStore(self.path)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_save_and_load(self):
+        self.store.save('key', 'access', 'refresh', 123.0)
+        self.assertEqual(OGSTokenStore(self.path).load('key'),
+                         {'access_token': 'access', 'refresh_token': 'refresh', 'expires_at': 123.0})
+        self.assertIsNone(self.store.load('other'))
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_restricts_permissions_on_load(self):
+        self.store.save('key', 'access', 'refresh', 123.0)
+        os.chmod(self.path, 0o644)
+        self.store.load('key')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_loads_when_permissions_cant_be_restricted(self):
+        self.store.save('key', 'access', 'refresh', 123.0)
+        os.chmod(self.path, 0o644)
+        with mock.patch('src.ogsapi.ogstokenstore.os.chmod', side_effect=PermissionError):
+            self.assertEqual(self.store.load('key')['access_token'], 'access')
+
+    def test_clear(self):
+        self.store.save('key', 'access', 'refresh', 123.0)
+        self.store.clear('key')
+        self.assertIsNone(self.store.load('key'))
+
+class TestOGSRestAPITokens(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = OGSTokenStore(os.path.join(self.dir.name, 'tokens.json'))
+        self.credentials = OGSCredentials(client_id='id', client_secret='secret', username='user', password='pass')
+        self.api = OGSRestAPI(OGSCredentials(), token_store=self.store)
+        self.api.credentials = self.credentials
+        self.api.session = mock.Mock()
+        self.api.session.request.side_effect = bootstrap_response
+        self.api.session.post.return_value = json_response(200, TOKENS)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_reuses_stored_token(self):
+        self.store.save(self.api._token_key(), 'stored', 'refresh', time.time() + 3600)
+        self.api.authenticate()
+        self.api.session.post.assert_not_called()
+        self.assertTrue(self.api.is_authed)
+        self.assertEqual(self.credentials.access_token, 'stored')
+
+    def test_refreshes_expired_token(self):
+        self.store.save(self.api._token_key(), 'stored', 'refresh', time.time() - 1)
+        self.api.authenticate()
+        data = self.api.session.post.call_args.kwargs['data']
+        self.assertEqual(data['grant_type'], 'refresh_token')
+        self.assertEqual(data['refresh_token'], 'refresh')
+        self.assertEqual(self.store.load(self.api._token_key())['access_token'], 'new')
+
+    def test_falls_back_to_password_grant(self):
+        self.credentials.refresh_token = 'revoked'
+        self.api.session.post.side_effect = [json_response(401), json_response(200, TOKENS)]
+        self.api.authenticate()
+        self.assertEqual(self.api.session.post.call_args.kwargs['data']['grant_type'], 'password')
+        self.assertEqual(self.credentials.access_token, 'new')
+
+    def test_retries_after_401(self):
+        self.credentials.access_token = 'old'
+        self.credentials.refresh_token = 'refresh'
+        self.api.is_authed = True
+        self.api.session.request.side_effect = [json_response(401), json_response(200, CONFIG)]
+        response = self.api.call_rest_endpoint('GET', '/ui/config')
+        self.assertEqual(response.status_code, 200)
+        headers = self.api.session.request.call_args.kwargs['headers']
+        self.assertEqual(headers['Authorization'], 'Bearer new')
+
+    def test_authenticate_fetches_auth_data_once(self):
+        self.api.authenticate()
+        urls = sorted(call.args[1] for call in self.api.session.request.call_args_list)
+        self.assertEqual(urls, ['https://online-go.com/api/v1/me', 'https://online-go.com/api/v1/ui/config'])
+        self.assertEqual(self.credentials.user_id, 1234)
+        self.assertEqual(self.credentials.chat_auth, 'chat')
+
+    def test_lazy_defers_auth_data(self):
+        self.api.lazy = True
+        self.api.authenticate()
+        self.api.session.request.assert_not_called()
+        self.api.ensure_user_id()
+        self.assertEqual(self.credentials.user_id, 1234)
+        self.assertIsNone(self.credentials.user_jwt)
+
+
+if __name__ == '__main__':
+    unittest.main()